@@ -6,7 +6,7 @@ from flask import Flask
 from flask_swagger_ui import get_swaggerui_blueprint
 
 from config import DevelopmentConfig, ProductionConfig, config_by_name
-from application.extensions import db, ma, limiter, cache, migrate
+from application.extensions import db, ma, limiter, cache, tagged_cache, token_cache, migrate
 
 # Import models so SQLAlchemy knows about them (table creation/migrations).
 import application.models  # noqa: F401
@@ -16,6 +16,8 @@ from application.blueprints.customers import customers_bp
 from application.blueprints.mechanics import mechanics_bp
 from application.blueprints.tickets import tickets_bp
 from application.blueprints.inventory import inventory_bp
+from application.blueprints.metrics import metrics_bp
+from application.blueprints.search import search_bp
 
 SWAGGER_URL = '/api/docs'
 API_URL = '/static/swagger.yaml'
@@ -51,6 +53,8 @@ def create_app(config_object=None):
     ma.init_app(app)
     limiter.init_app(app)
     cache.init_app(app)
+    tagged_cache.init_app(app)
+    token_cache.init_app(app)
     migrate.init_app(app, db)
 
     # Register blueprints.
@@ -58,5 +62,7 @@ def create_app(config_object=None):
     app.register_blueprint(mechanics_bp, url_prefix="/mechanics")
     app.register_blueprint(tickets_bp, url_prefix="/service-tickets")
     app.register_blueprint(inventory_bp, url_prefix="/inventory")
+    app.register_blueprint(metrics_bp, url_prefix="/metrics")
+    app.register_blueprint(search_bp, url_prefix="/search")
     app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
     return app
\ No newline at end of file
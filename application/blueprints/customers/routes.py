@@ -1,15 +1,43 @@
 # application/blueprints/customers/routes.py
 
-from flask import request, jsonify
+from flask import request, jsonify, g
 from marshmallow import ValidationError
 from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
 
-from application.extensions import db
+from application.extensions import db, tagged_cache, token_cache
 from application.models.customer import Customer
 from application.models.service_ticket import ServiceTicket
-from application.schemas.customer_schema import customer_schema, customers_schema, login_schema
-from application.utils.util import encode_token, token_required
+from application.schemas.customer_schema import customer_schema, customers_compiled, login_schema, refresh_schema
+from application.utils.util import (
+    encode_token, issue_refresh_token, revoke_refresh_tokens, rotate_refresh_token, token_required,
+)
+from application.utils.passwords import HashingBusy, needs_rehash
 from application.blueprints.customers import customers_bp
+from application.blueprints.mechanics import leaderboard
+from application.blueprints.tickets.routes import ticket_tags, tickets_listing
+from application.blueprints.tickets.schemas import tickets_compiled
+from application.utils.pagination import Listing, PaginationError
+from application.utils.serializer import json_response
+from application.utils.conditional import (
+    aggregate_version, conditional, conflict, etag_for, instance_version, precondition_failed, row_version,
+    table_versions,
+)
+
+# ?sort= / prefix filters for GET /customers/; name and email are indexed.
+customers_listing = Listing(
+    Customer.id,
+    sorts={"name": Customer.name, "email": Customer.email},
+    prefix_filters={"name": Customer.name, "email": Customer.email},
+)
+
+def hashing_busy(error: HashingBusy):
+    """
+    503 for requests shed because the password hashing pool is full.
+    """
+    response = jsonify({"error": str(error)})
+    response.headers["Retry-After"] = "1"
+    return response, 503
 
 @customers_bp.route("/", methods=["POST"])
 def create_customer():
@@ -32,7 +60,10 @@ def create_customer():
         password_hash="TEMP"
     )
 
-    new_customer.set_password(customer_data["password"])
+    try:
+        new_customer.set_password(customer_data["password"])
+    except HashingBusy as e:
+        return hashing_busy(e)
 
     db.session.add(new_customer)
     db.session.commit()
@@ -52,71 +83,154 @@ def login_customer():
     query = select(Customer).where(Customer.email == email)
     customer = db.session.execute(query).scalars().first()
 
-    if customer and customer.check_password(password):
+    try:
+        password_ok = customer is not None and customer.check_password(password)
+    except HashingBusy as e:
+        return hashing_busy(e)
+
+    if password_ok:
+        # Upgrade hashes made under older cost settings while we have the plain password.
+        if needs_rehash(customer.password_hash):
+            try:
+                customer.set_password(password)
+            except HashingBusy:
+                pass  # keep the old hash; try again next login
+
         auth_token = encode_token(customer.id)
+        refresh_token = issue_refresh_token(customer.id)
+        db.session.commit()
 
         return jsonify({
             "status": "success",
             "message": "Successfully Logged In",
-            "auth_token": auth_token
+            "auth_token": auth_token,
+            "refresh_token": refresh_token
         }), 200
 
     return jsonify({"message": "Invalid email or password."}), 401
 
+@customers_bp.route("/refresh", methods=["POST"])
+def refresh_customer_token():
+    """
+    Trade a refresh token for a new access token and a new refresh token.
+    No password check: one indexed lookup plus signing the JWT.
+    The old refresh token stops working; replaying it revokes the new one too.
+    """
+    try:
+        payload = refresh_schema.load(request.json)
+    except ValidationError as e:
+        return jsonify(e.messages), 400
+
+    rotated = rotate_refresh_token(payload["refresh_token"])
+    if rotated is None:
+        return jsonify({"message": "Invalid or expired refresh token."}), 401
+
+    customer_id, refresh_token = rotated
+
+    return jsonify({
+        "status": "success",
+        "auth_token": encode_token(customer_id),
+        "refresh_token": refresh_token
+    }), 200
+
+@customers_bp.route("/logout", methods=["POST"])
+@token_required
+def logout_customer(customer_id: int):
+    """
+    Protected route: revokes the bearer token used for this request.
+    The token is rejected by every protected route until it would have expired.
+
+    Optional body: {"refresh_token": str} revokes that token's family (this
+    device's session). Without it every refresh token of the customer is
+    revoked, so no client can mint new access tokens after logging out.
+    """
+    payload = request.get_json(silent=True)
+    try:
+        refresh_token = refresh_schema.load(payload)["refresh_token"] if payload else None
+    except ValidationError as e:
+        return jsonify(e.messages), 400
+
+    token_cache.revoke(g.token_claims)
+    revoke_refresh_tokens(customer_id, refresh_token)
+    db.session.commit()
+
+    return jsonify({"message": "Successfully logged out."}), 200
+
 @customers_bp.route("/my-tickets", methods=["GET"])
 @token_required
+@tagged_cache.cached(
+    tags=lambda customer_id: [f"customer:{customer_id}:tickets"],
+    vary=lambda customer_id: f"customer:{customer_id}",
+    timeout=60,
+    etag=True,
+)
 def get_my_tickets(customer_id: int):
     """
     Protected route:
     - requires Authorization: Bearer <token>
     - customer_id comes from token_required decorator
-    - returns tickets belonging only to this customer
+    - returns tickets belonging only to this customer, cursor-paginated
+
+    Query parameters:
+    - limit (int, optional): Page size. Default DEFAULT_PAGE_SIZE, max MAX_PAGE_SIZE.
+    - cursor (str, optional): next_cursor from the previous page.
+    - sort (str, optional): id, service_date, VIN or parts_total; prefix "-"
+      for descending.
+    - VIN, total, fields, expand (optional): As on GET /service-tickets/;
+      by default mechanics and parts are sent as mechanic_ids / part_ids.
+
+    Cached per customer until one of their tickets changes. Responses carry an
+    ETag; send it back as If-None-Match to get a 304 while nothing changed.
+    Returns JSON: { "tickets": [...], "limit": int, "count": int, "next_cursor": str | null }.
     """
-    query = select(ServiceTicket).where(ServiceTicket.customer_id == customer_id)
-    tickets = db.session.execute(query).scalars().all()
+    try:
+        compiled = tickets_compiled.view_from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    from application.blueprints.tickets.schemas import tickets_schema
+    query = compiled.select().where(ServiceTicket.customer_id == customer_id)
 
-    return tickets_schema.jsonify(tickets), 200
+    try:
+        page = tickets_listing.page(query, request.args, scalars=False)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    tickets = compiled.dump(page.rows)
+    for ticket in tickets:
+        tagged_cache.tag(*ticket_tags(ticket))
+
+    return json_response(page.envelope("tickets", tickets))
 
 @customers_bp.route("/", methods=["GET"])
+@conditional(lambda: (request.full_path, *table_versions(aggregate_version(Customer))))
 def get_customers():
     """
-    Paginated customer list.
+    Cursor-paginated customer list (keyset; by id unless sorted).
 
     Query parameters:
-    - limit (int, optional): Number of customers to return. Constraint: 1-100. Default 10.
-    - offset (int, optional): Number of customers to skip. Constraint: >= 0. Default 0.
-
-    Returns JSON: { "customers": [...], "limit": int, "offset": int, "count": int }.
+    - limit (int, optional): Page size. Default DEFAULT_PAGE_SIZE, max MAX_PAGE_SIZE.
+    - cursor (str, optional): next_cursor from the previous page.
+    - sort (str, optional): id, name or email; prefix "-" for descending.
+    - name / email (str, optional): Only customers whose name / email starts with this.
+    - total (bool, optional): Also return the number of matching customers.
+
+    Returns JSON: { "customers": [...], "limit": int, "count": int, "next_cursor": str | null }
+    (+ "total_count", "total_exact" with ?total=true).
+    Sends an ETag; If-None-Match with it returns 304 until a customer changes.
     """
-    limit = request.args.get("limit", default=10, type=int)
-    offset = request.args.get("offset", default=0, type=int)
-
-    if limit < 1:
-        return jsonify({"error": "Limit must be at least 1."}), 400
-
-    if limit > 100:
-        return jsonify({"error": "Limit cannot be greater than 100."}), 400
-
-    if offset < 0:
-        return jsonify({"error": "Offset cannot be negative."}), 400
-
-    query = select(Customer).limit(limit).offset(offset)
-    customers = db.session.execute(query).scalars().all()
+    try:
+        page = customers_listing.page(customers_compiled.select(), request.args, scalars=False)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
 
-    return jsonify({
-        "limit": limit,
-        "offset": offset,
-        "count": len(customers),
-        "customers": customers_schema.dump(customers)
-    }), 200
+    return json_response(page.envelope("customers", customers_compiled.dump(page.rows)))
 
 
 @customers_bp.route("/<int:customer_id>", methods=["GET"])
+@conditional(lambda customer_id: row_version(Customer, customer_id))
 def get_customer(customer_id: int):
     """
-    Get a single customer by ID.
+    Get a single customer by ID. Sends an ETag (use it as If-Match on PUT /customers/me).
 
     Path parameter:
     - customer_id (int, required): Unique customer ID.
@@ -131,11 +245,19 @@ def get_customer(customer_id: int):
 @customers_bp.route("/me", methods=["PUT"])
 @token_required
 def update_me(customer_id: int):
+    """
+    Protected route: update the logged-in customer.
+    Optional If-Match: ETag from GET /customers/<id>; 412 if the customer changed since.
+    """
     customer = db.session.get(Customer, customer_id)
 
     if not customer:
         return jsonify({"error": "Customer not found."}), 404
 
+    failed = precondition_failed(instance_version(customer))
+    if failed:
+        return failed
+
     try:
         customer_data = customer_schema.load(request.json)
     except ValidationError as e:
@@ -146,10 +268,21 @@ def update_me(customer_id: int):
     customer.phone = customer_data.get("phone")
 
     if "password" in customer_data and customer_data["password"]:
-        customer.set_password(customer_data["password"])
+        try:
+            customer.set_password(customer_data["password"])
+        except HashingBusy as e:
+            return hashing_busy(e)
+        # sessions started with the old password end with it
+        revoke_refresh_tokens(customer_id)
 
-    db.session.commit()
-    return customer_schema.jsonify(customer), 200
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
+
+    response = customer_schema.jsonify(customer)
+    response.set_etag(etag_for(*instance_version(customer)))
+    return response, 200
 
 @customers_bp.route("/me", methods=["DELETE"])
 @token_required
@@ -161,5 +294,8 @@ def delete_me(customer_id: int):
 
     db.session.delete(customer)
     db.session.commit()
+    # Their tickets went with them.
+    tagged_cache.invalidate("tickets:list", f"customer:{customer_id}", f"customer:{customer_id}:tickets")
+    leaderboard.reset()
 
     return "", 204
\ No newline at end of file
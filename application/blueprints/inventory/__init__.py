@@ -3,6 +3,6 @@
 
 from flask import Blueprint
 
-inventory_bp = Blueprint("inventory_bp", __name__)
+inventory_bp = Blueprint("inventory_bp", __name__, cli_group="inventory")
 
-from application.blueprints.inventory import routes
\ No newline at end of file
+from application.blueprints.inventory import routes, commands
\ No newline at end of file
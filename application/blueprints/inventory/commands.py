@@ -0,0 +1,41 @@
+# application/blueprints/inventory/commands.py
+# `flask inventory ...` CLI commands.
+
+import click
+from flask import current_app
+
+from application.blueprints.inventory import inventory_bp
+from application.blueprints.inventory import importer
+
+
+@inventory_bp.cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "import_format", type=click.Choice(importer.FORMATS),
+              help="Defaults to csv for *.csv files, json otherwise.")
+@click.option("--chunk-size", type=int, default=None, help="Rows per transaction (default IMPORT_CHUNK_SIZE).")
+def import_command(path, import_format, chunk_size):
+    """
+    Upsert parts from a CSV or JSON/NDJSON catalogue file, matched on name.
+    """
+    if import_format is None:
+        import_format = "csv" if path.endswith(".csv") else "json"
+
+    with open(path, newline="", encoding="utf-8") as stream:
+        try:
+            report = importer.import_parts(
+                stream, import_format, chunk_size or current_app.config["IMPORT_CHUNK_SIZE"], max_errors=20,
+            )
+        except importer.ImportAborted as e:
+            _echo_report(e.report)
+            raise click.ClickException(f"row {e.row}: {e} (rows before it were imported)")
+
+    _echo_report(report)
+
+
+def _echo_report(report: dict) -> None:
+    click.echo(
+        f"inserted: {report['inserted']}, updated: {report['updated']}, "
+        f"unchanged: {report['unchanged']}, rejected: {report['rejected']}"
+    )
+    for error in report["errors"]:
+        click.echo(f"row {error['row']}: {error['messages']}", err=True)
@@ -0,0 +1,197 @@
+# application/blueprints/inventory/importer.py
+# Streaming catalogue import behind POST /inventory/import and `flask inventory import`:
+# incremental CSV / JSON parsing and chunked upserts on the unique Inventory.name.
+
+import csv
+import json
+from itertools import islice
+
+from marshmallow import ValidationError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from application.extensions import db, tagged_cache
+from application.blueprints.search import index as search_index
+from application.models.inventory import Inventory
+from application.schemas.inventory_schema import inventories_schema
+
+FORMATS = ("csv", "json")
+
+READ_SIZE = 64 * 1024
+
+# A JSON record still undecodable after this many buffered characters is malformed.
+MAX_RECORD_SIZE = 1024 * 1024
+
+
+class ImportAborted(Exception):
+    """
+    The file could not be read past row `row` (malformed JSON, CSV or UTF-8).
+    Every row before it was imported; `report` has the counts for them.
+    """
+
+    def __init__(self, message: str, row: int, report: dict):
+        super().__init__(message)
+        self.row = row
+        self.report = report
+
+
+def csv_records(stream):
+    """
+    One dict per data line of a CSV with a header row (name, price; other columns ignored).
+    """
+    for record in csv.DictReader(stream):
+        yield {key: record.get(key) for key in ("name", "price")}
+
+
+def json_records(stream):
+    """
+    Objects from a JSON array or from NDJSON (one object per line), decoded one
+    at a time from READ_SIZE reads, so only the current object is held in memory.
+    Raises ValueError for malformed JSON.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+
+    while True:
+        # skip array brackets, commas and whitespace between objects
+        position = 0
+        while position < len(buffer) and buffer[position] in " \t\r\n[],":
+            position += 1
+        buffer = buffer[position:]
+
+        if buffer:
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof or len(buffer) > MAX_RECORD_SIZE:
+                    raise ValueError("Malformed JSON in import file.")
+                record = None
+            # a value that ends exactly at the buffer's end may be cut short (e.g. a number)
+            if record is not None and (end < len(buffer) or eof):
+                yield record
+                buffer = buffer[end:]
+                continue
+
+        if eof:
+            return
+        chunk = stream.read(READ_SIZE)
+        eof = not chunk
+        buffer += chunk
+
+
+def records(stream, import_format: str):
+    return csv_records(stream) if import_format == "csv" else json_records(stream)
+
+
+def _upsert(rows: list) -> None:
+    """
+    INSERT new names, UPDATE the price of existing ones, in one statement where
+    the dialect has an upsert. The version bump keeps ETags honest.
+    """
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        make_insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        stmt = make_insert(Inventory.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Inventory.name],
+            set_={"price": stmt.excluded.price, "version": Inventory.version + 1},
+        )
+        db.session.execute(stmt, rows)
+    elif dialect in ("mysql", "mariadb"):
+        stmt = mysql_insert(Inventory.__table__)
+        stmt = stmt.on_duplicate_key_update(price=stmt.inserted.price, version=Inventory.version + 1)
+        db.session.execute(stmt, rows)
+    else:
+        existing = set(db.session.scalars(select(Inventory.name).where(Inventory.name.in_([r["name"] for r in rows]))))
+        new = [row for row in rows if row["name"] not in existing]
+        changed = [{"b_name": row["name"], "price": row["price"]} for row in rows if row["name"] in existing]
+        if new:
+            db.session.execute(insert(Inventory.__table__), new)
+        if changed:
+            db.session.execute(
+                update(Inventory.__table__)
+                .where(Inventory.name == bindparam("b_name"))
+                .values(price=bindparam("price"), version=Inventory.version + 1),
+                changed,
+            )
+
+
+def import_chunk(items: list, first_row: int, report: dict, max_errors: int) -> None:
+    """
+    Validate one chunk in a single schema pass, upsert its valid rows and commit.
+    Names already present at the same price are left alone (no version bump,
+    cached tickets stay valid). A later row wins over an earlier one with the
+    same name.
+    """
+    try:
+        loaded, errors = inventories_schema.load(items), {}
+    except ValidationError as e:
+        loaded, errors = e.valid_data, e.messages
+
+    for index, messages in errors.items():
+        report["rejected"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"row": first_row + index, "messages": messages})
+
+    by_name = {data["name"]: data for index, data in enumerate(loaded) if index not in errors}
+    if not by_name:
+        return
+
+    current = dict(db.session.execute(
+        select(Inventory.name, Inventory.price).where(Inventory.name.in_(list(by_name)))
+    ).all())
+
+    rows, updated = [], []
+    for name, data in by_name.items():
+        if name not in current:
+            report["inserted"] += 1
+        elif current[name] != data["price"]:
+            report["updated"] += 1
+            updated.append(name)
+        else:
+            report["unchanged"] += 1
+            continue
+        rows.append({"name": name, "price": data["price"]})
+
+    if not rows:
+        return
+
+    _upsert(rows)
+    updated_ids = list(db.session.scalars(select(Inventory.id).where(Inventory.name.in_(updated)))) if updated else []
+    db.session.commit()
+    search_index.mark_stale("parts")  # Core upserts bypass the ORM write hooks
+    if updated_ids:
+        # tickets cached with these parts nested in them
+        tagged_cache.invalidate(*[f"part:{part_id}" for part_id in updated_ids])
+
+
+def import_parts(stream, import_format: str, chunk_size: int, max_errors: int = 100) -> dict:
+    """
+    Upsert every part in the stream, chunk_size records per batch/transaction.
+    Returns {"inserted", "updated", "unchanged", "rejected", "errors"}; errors
+    lists at most max_errors rejected rows (row numbers start at 1).
+    A file that turns unreadable part-way raises ImportAborted once the rows
+    read before the bad one are imported; their chunks stay committed.
+    """
+    report = {"inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0, "errors": []}
+    source = records(stream, import_format)
+    first_row = 1
+
+    while True:
+        items, error = [], None
+        try:
+            items.extend(islice(source, chunk_size))
+        except (ValueError, csv.Error) as e:  # includes UnicodeDecodeError
+            error = e
+
+        if items:
+            import_chunk(items, first_row, report, max_errors)
+            first_row += len(items)
+        if error is not None:
+            raise ImportAborted(str(error), first_row, report)
+        if len(items) < chunk_size:
+            return report
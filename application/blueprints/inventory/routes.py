@@ -1,14 +1,39 @@
 # application/blueprints/inventory/routes.py
 # CRUD enpoints for inventory parts.
 
-from flask import request, jsonify
+import codecs
+
+from flask import current_app, request, jsonify
 from marshmallow import ValidationError
 from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
 
-from application.extensions import db
-from application.models.inventory import Inventory
-from application.schemas.inventory_schema import inventory_schema, inventories_schema
+from application.extensions import db, tagged_cache
+from application.models.inventory import Inventory, service_ticket_inventory
+from application.models.service_ticket import ServiceTicket
+from application.models.snapshots import parts_snapshot
+from application.schemas.inventory_schema import inventory_schema, inventories_compiled
 from application.blueprints.inventory import inventory_bp
+from application.blueprints.inventory import importer
+from application.blueprints.tickets import billing
+from application.utils.pagination import Listing, PaginationError
+from application.utils.serializer import json_response
+from application.utils.conditional import (
+    aggregate_version, conditional, conflict, etag_for, instance_version, precondition_failed, row_version,
+    table_versions,
+)
+
+# ?sort= / prefix filter for GET /inventory/; name is unique (indexed).
+parts_listing = Listing(Inventory.id, sorts={"name": Inventory.name}, prefix_filters={"name": Inventory.name})
+
+
+def parts_version():
+    """
+    ETag components for a parts list page, from the in-process snapshot
+    (same values as aggregate_version(Inventory), without the table scan).
+    """
+    fingerprint = parts_snapshot.fingerprint() or table_versions(aggregate_version(Inventory))
+    return (request.full_path, *fingerprint)
 
 @inventory_bp.route("/", methods=["POST"])
 def create_part():
@@ -36,19 +61,82 @@ def create_part():
 
     return inventory_schema.jsonify(new_part), 201
 
+@inventory_bp.route("/import", methods=["POST"])
+def import_parts():
+    """
+    Bulk upsert parts from a supplier catalogue, matched on name.
+    POST /inventory/import?format=csv|json
+
+    Body: the file itself (Content-Type text/csv, application/json or
+    application/x-ndjson), or a multipart upload in the "file" field.
+    CSV needs a header row with name and price; JSON may be an array of
+    {"name", "price"} objects or one object per line.
+
+    The upload is parsed incrementally and written IMPORT_CHUNK_SIZE rows per
+    transaction, so memory stays bounded whatever the file size.
+    Returns JSON: {"inserted", "updated", "unchanged", "rejected": int, "errors": [{"row", "messages"}]}.
+    If the file turns unreadable part-way: 400 with the same counts for the rows
+    before it, plus "error" and "failed_at_row".
+    """
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    mimetype = upload.mimetype if upload else request.mimetype
+    filename = upload.filename if upload else ""
+
+    import_format = request.args.get("format")
+    if import_format is None:
+        import_format = "csv" if mimetype == "text/csv" or filename.endswith(".csv") else "json"
+    if import_format not in importer.FORMATS:
+        return jsonify({"error": "format must be 'csv' or 'json'."}), 400
+
+    text = codecs.getreader("utf-8")(stream)
+    try:
+        report = importer.import_parts(text, import_format, current_app.config["IMPORT_CHUNK_SIZE"])
+    except importer.ImportAborted as e:
+        # rows before failed_at_row were imported; report them with the error
+        db.session.rollback()
+        return jsonify({"error": str(e), "failed_at_row": e.row, **e.report}), 400
+
+    return jsonify(report), 200
+
 @inventory_bp.route("/", methods=["GET"])
+@conditional(parts_version)
 def list_parts():
     """
-    List all inventory parts.
+    Cursor-paginated inventory parts (keyset; by id unless sorted).
     GET /inventory
+
+    Query parameters:
+    - limit (int, optional): Page size. Default DEFAULT_PAGE_SIZE, max MAX_PAGE_SIZE.
+    - cursor (str, optional): next_cursor from the previous page.
+    - sort (str, optional): id or name; prefix "-" for descending.
+    - name (str, optional): Only parts whose name starts with this.
+    - total (bool, optional): Also return the number of matching parts.
+
+    Returns JSON: { "parts": [...], "limit": int, "count": int, "next_cursor": str | null }
+    (+ "total_count", "total_exact" with ?total=true).
+    Sends an ETag; If-None-Match with it returns 304 until a part changes.
+    Pages come from the in-process snapshot (no query) unless the table is
+    over SNAPSHOT_MAX_ROWS.
     """
-    parts = db.session.execute(select(Inventory)).scalars().all()
-    return inventories_schema.jsonify(parts), 200
+    records = parts_snapshot.records()
+    try:
+        if records is None:
+            page = parts_listing.page(inventories_compiled.select(), request.args, scalars=False)
+            parts = inventories_compiled.dump(page.rows)
+        else:
+            page = parts_listing.page_records(records, request.args)
+            parts = inventories_compiled.dump_objects(page.rows)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return json_response(page.envelope("parts", parts))
 
 @inventory_bp.route("/<int:part_id>", methods=["GET"])
+@conditional(lambda part_id: row_version(Inventory, part_id))
 def get_part(part_id: int):
     """
-    Get a specific inventory part by ID.
+    Get a specific inventory part by ID. Sends an ETag (use it as If-Match on PUT).
 
     Path parameter:
     - part_id (int, required): Unique inventory part ID.
@@ -66,11 +154,16 @@ def update_part(part_id: int):
     Path parameter:
     - part_id (int, required): Unique inventory part ID.
     Body: {"name": str, "price": float}.
+    Optional If-Match: ETag from GET; 412 if the part changed since.
     """
     part = db.session.get(Inventory, part_id)
     if not part:
         return jsonify({"error": "Part not found."}), 404
 
+    failed = precondition_failed(instance_version(part))
+    if failed:
+        return failed
+
     try:
         part_data = inventory_schema.load(request.json)
     except ValidationError as e:
@@ -79,8 +172,15 @@ def update_part(part_id: int):
     part.name = part_data["name"]
     part.price = part_data["price"]
 
-    db.session.commit()
-    return inventory_schema.jsonify(part), 200
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
+
+    tagged_cache.invalidate(f"part:{part_id}")
+    response = inventory_schema.jsonify(part)
+    response.set_etag(etag_for(*instance_version(part)))
+    return response, 200
 
 @inventory_bp.route("/<int:part_id>", methods=["DELETE"])
 def delete_part(part_id: int):
@@ -94,7 +194,24 @@ def delete_part(part_id: int):
     if not part:
         return jsonify({"error": "Part not found."}), 404
 
+    # Tickets billing this part lose the line item (ON DELETE CASCADE); their
+    # parts_total is recomputed in the same transaction.
+    tickets = db.session.execute(
+        select(ServiceTicket.id, ServiceTicket.customer_id)
+        .join(service_ticket_inventory, service_ticket_inventory.c.ticket_id == ServiceTicket.id)
+        .where(service_ticket_inventory.c.inventory_id == part_id)
+    ).all()
+
     db.session.delete(part)
+    db.session.flush()
+    billing.refresh_parts_totals([ticket_id for ticket_id, _ in tickets])
     db.session.commit()
+    tagged_cache.invalidate(f"part:{part_id}")
+    if tickets:
+        tagged_cache.invalidate(
+            "tickets:list",
+            *[f"ticket:{ticket_id}" for ticket_id, _ in tickets],
+            *{f"customer:{customer_id}:tickets" for _, customer_id in tickets},
+        )
 
     return jsonify({"message": "Part deleted successfully."}), 200
\ No newline at end of file
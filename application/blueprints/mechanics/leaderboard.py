@@ -0,0 +1,65 @@
+# application/blueprints/mechanics/leaderboard.py
+# Cached per-mechanic ticket counts behind GET /mechanics/most-tickets.
+
+import uuid
+
+from sqlalchemy import and_, select, func
+
+from application.extensions import db, cache
+from application.models.mechanic import Mechanic
+from application.models.service_ticket import ServiceTicket, service_mechanics
+
+LEADERBOARD_KEY = "leaderboard:mechanic_ticket_counts"
+
+# Replaced on every change to assignments, so all cached windows are dropped
+# at once (each worker and Redis alike) without read-modify-write races.
+GENERATION_KEY = "leaderboard:generation"
+
+# Upper bound on how long writes made outside the app go unseen.
+LEADERBOARD_TIMEOUT = 300
+
+
+def _generation() -> str:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        cache.set(GENERATION_KEY, generation, timeout=0)
+    return generation
+
+
+def top_mechanics(limit: int, date_from=None, date_to=None) -> list:
+    """
+    [(mechanic_id, tickets), ...] for the limit mechanics with the most tickets
+    (ties by id; mechanics without tickets included), only counting tickets
+    with service_date in the optional window. Ranked in SQL (ORDER BY count
+    DESC, id LIMIT limit) on a cache miss, cached per window and limit.
+    """
+    key = f"{LEADERBOARD_KEY}:{_generation()}:{date_from or ''}:{date_to or ''}:{limit}"
+    ranked = cache.get(key)
+    if ranked is None:
+        window = [ServiceTicket.id == service_mechanics.c.ticket_id]
+        if date_from:
+            window.append(ServiceTicket.service_date >= date_from)
+        if date_to:
+            window.append(ServiceTicket.service_date <= date_to)
+
+        tickets = func.count(ServiceTicket.id)
+        query = (
+            select(Mechanic.id, tickets)
+            .outerjoin(service_mechanics, service_mechanics.c.mechanic_id == Mechanic.id)
+            .outerjoin(ServiceTicket, and_(*window))
+            .group_by(Mechanic.id)
+            .order_by(tickets.desc(), Mechanic.id)
+            .limit(limit)
+        )
+        ranked = [tuple(row) for row in db.session.execute(query)]
+        cache.set(key, ranked, timeout=LEADERBOARD_TIMEOUT)
+    return ranked
+
+
+def reset() -> None:
+    """
+    Forget all cached counts. Call after committing any change to mechanics,
+    assignments or ticket dates; the next read rebuilds them.
+    """
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, timeout=0)
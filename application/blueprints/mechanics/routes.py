@@ -1,11 +1,37 @@
 from flask import request, jsonify
 from marshmallow import ValidationError
 from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
 
-from application.extensions import db
+from application.extensions import db, tagged_cache
 from application.models.mechanic import Mechanic
-from application.blueprints.mechanics.schemas import mechanic_schema, mechanics_schema
-from application.blueprints.mechanics import mechanics_bp
+from application.models.service_ticket import ServiceTicket, service_mechanics
+from application.models.snapshots import mechanics_snapshot
+from application.utils.dates import date_range
+from application.utils.pagination import Listing, PaginationError, page_limit
+from application.utils.serializer import json_response
+from application.utils.conditional import (
+    aggregate_version, conditional, conflict, etag_for, instance_version, precondition_failed, row_version,
+    table_versions,
+)
+from application.blueprints.mechanics.schemas import mechanic_schema, mechanics_compiled
+from application.blueprints.mechanics import mechanics_bp, leaderboard
+
+# ?sort= / prefix filters for GET /mechanics/; name and email are indexed.
+mechanics_listing = Listing(
+    Mechanic.id,
+    sorts={"name": Mechanic.name, "email": Mechanic.email},
+    prefix_filters={"name": Mechanic.name, "email": Mechanic.email},
+)
+
+
+def mechanics_version():
+    """
+    ETag components for a mechanics list page, from the in-process snapshot
+    (same values as aggregate_version(Mechanic), without the table scan).
+    """
+    fingerprint = mechanics_snapshot.fingerprint() or table_versions(aggregate_version(Mechanic))
+    return (request.full_path, *fingerprint)
 
 @mechanics_bp.route("/", methods=["POST"])
 def create_mechanic():
@@ -22,17 +48,45 @@ def create_mechanic():
     new_mechanic = Mechanic(**mechanic_data)
     db.session.add(new_mechanic)
     db.session.commit()
+    leaderboard.reset()
     return mechanic_schema.jsonify(new_mechanic), 201
 
 @mechanics_bp.route("/", methods=["GET"])
+@conditional(mechanics_version)
 def list_mechanics():
-    mechanics = db.session.execute(select(Mechanic)).scalars().all()
-    return mechanics_schema.jsonify(mechanics), 200
+    """
+    Cursor-paginated mechanic list (keyset; by id unless sorted).
+
+    Query parameters:
+    - limit (int, optional): Page size. Default DEFAULT_PAGE_SIZE, max MAX_PAGE_SIZE.
+    - cursor (str, optional): next_cursor from the previous page.
+    - sort (str, optional): id, name or email; prefix "-" for descending.
+    - name / email (str, optional): Only mechanics whose name / email starts with this.
+    - total (bool, optional): Also return the number of matching mechanics.
+
+    Pages come from the in-process snapshot (no query) unless the table is
+    over SNAPSHOT_MAX_ROWS.
+    Returns JSON: { "mechanics": [...], "limit": int, "count": int, "next_cursor": str | null }
+    (+ "total_count", "total_exact" with ?total=true).
+    """
+    records = mechanics_snapshot.records()
+    try:
+        if records is None:
+            page = mechanics_listing.page(mechanics_compiled.select(), request.args, scalars=False)
+            mechanics = mechanics_compiled.dump(page.rows)
+        else:
+            page = mechanics_listing.page_records(records, request.args)
+            mechanics = mechanics_compiled.dump_objects(page.rows)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return json_response(page.envelope("mechanics", mechanics))
 
 @mechanics_bp.route("/<int:mechanic_id>", methods=["GET"])
+@conditional(lambda mechanic_id: row_version(Mechanic, mechanic_id))
 def get_mechanic(mechanic_id: int):
     """
-    Get a single mechanic by ID.
+    Get a single mechanic by ID. Sends an ETag (use it as If-Match on PUT).
 
     Path parameter:
     - mechanic_id (int, required): Unique mechanic ID.
@@ -45,25 +99,35 @@ def get_mechanic(mechanic_id: int):
 @mechanics_bp.route("/most-tickets", methods=["GET"])
 def mechanics_by_most_tickets():
     """
-    Returns mechanics sorted by how many tickets they have worked on (descending).
+    Returns mechanics sorted by how many tickets they have worked on (descending, ties by id).
+
+    Query parameters:
+    - limit (int, optional): How many mechanics to return. Default DEFAULT_PAGE_SIZE, max MAX_PAGE_SIZE.
+    - from / to (YYYY-MM-DD, optional): Only count tickets with service_date in this window.
 
-    Why this works:
-    - mechanic.service_tickets is a relationship list
-    - len(mechanic.service_tickets) tells us how many tickets they are attached to
+    Counting and ranking happen in the database (GROUP BY over service_mechanics,
+    ORDER BY count, LIMIT), never by loading ticket rows. Rankings are cached per
+    window and limit and dropped whenever assignments change.
     """
-    mechanics = db.session.execute(select(Mechanic)).scalars().all()
+    try:
+        limit = page_limit(request.args)
+        date_from, date_to = date_range(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    mechanics.sort(key=lambda m: len(m.service_tickets), reverse=True)
+    top = leaderboard.top_mechanics(limit, date_from, date_to)
+    found = mechanics_snapshot.get_many(mechanic_id for mechanic_id, _ in top)
+    ranked = [(found[mechanic_id], count) for mechanic_id, count in top if mechanic_id in found]
 
     results = []
-    for m in mechanics:
+    for m, count in ranked:
         results.append({
             "id":m.id,
             "name":m.name,
             "email":m.email,
             "phone":m.phone,
             "salary":m.salary,
-            "tickets_count":len(m.service_tickets),
+            "tickets_count":count,
         })
     
     return jsonify(results), 200
@@ -75,11 +139,16 @@ def update_mechanic(mechanic_id: int):
 
     Path parameter:
     - mechanic_id (int, required): Unique mechanic ID.
+    Optional If-Match: ETag from GET; 412 if the mechanic changed since.
     """
     mechanic = db.session.get(Mechanic, mechanic_id)
     if not mechanic:
         return jsonify({"error": "Mechanic not found."}), 404
 
+    failed = precondition_failed(instance_version(mechanic))
+    if failed:
+        return failed
+
     try:
         mechanic_data = mechanic_schema.load(request.json)
     except ValidationError as e:
@@ -88,8 +157,15 @@ def update_mechanic(mechanic_id: int):
     for key, value in mechanic_data.items():
         setattr(mechanic, key, value)
 
-    db.session.commit()
-    return mechanic_schema.jsonify(mechanic), 200
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
+
+    tagged_cache.invalidate(f"mechanic:{mechanic_id}")
+    response = mechanic_schema.jsonify(mechanic)
+    response.set_etag(etag_for(*instance_version(mechanic)))
+    return response, 200
 
 @mechanics_bp.route("/<int:mechanic_id>", methods=["DELETE"])
 def delete_mechanic(mechanic_id: int):
@@ -103,7 +179,23 @@ def delete_mechanic(mechanic_id: int):
     if not mechanic:
         return jsonify({"error": "Mechanic not found."}), 404
 
+    # Assignments go with the mechanic (ON DELETE CASCADE); cached ticket
+    # pages listing only mechanic_ids carry no mechanic tag, so drop them too.
+    tickets = db.session.execute(
+        select(ServiceTicket.id, ServiceTicket.customer_id)
+        .join(service_mechanics, service_mechanics.c.ticket_id == ServiceTicket.id)
+        .where(service_mechanics.c.mechanic_id == mechanic_id)
+    ).all()
+
     db.session.delete(mechanic)
     db.session.commit()
+    tagged_cache.invalidate(f"mechanic:{mechanic_id}")
+    if tickets:
+        tagged_cache.invalidate(
+            "tickets:list",
+            *[f"ticket:{ticket_id}" for ticket_id, _ in tickets],
+            *{f"customer:{customer_id}:tickets" for _, customer_id in tickets},
+        )
+    leaderboard.reset()
     return "", 204
     
\ No newline at end of file
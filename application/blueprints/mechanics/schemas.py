@@ -2,12 +2,14 @@
 from marshmallow import fields
 from application.extensions import ma
 from application.models.mechanic import Mechanic
+from application.utils.serializer import CompiledSchema
 
 
 class MechanicSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Mechanic
         load_instance = False
+        exclude = ("version",)  # exposed as the ETag header instead
 
     name = fields.Str(required=True)
     email = fields.Email(required=True)
@@ -17,3 +19,4 @@ class MechanicSchema(ma.SQLAlchemyAutoSchema):
 
 mechanic_schema = MechanicSchema()
 mechanics_schema = MechanicSchema(many=True)
+mechanics_compiled = CompiledSchema(mechanic_schema)
@@ -0,0 +1,7 @@
+# application/blueprints/metrics/__init__.py
+
+from flask import Blueprint
+
+metrics_bp = Blueprint("metrics", __name__)
+
+from application.blueprints.metrics import routes
@@ -0,0 +1,25 @@
+# application/blueprints/metrics/routes.py
+# Read-only operational counters (per worker process).
+
+from flask import jsonify
+
+from application.extensions import tagged_cache
+from application.utils.passwords import hasher
+from application.blueprints.metrics import metrics_bp
+
+@metrics_bp.route("/cache", methods=["GET"])
+def cache_metrics():
+    """
+    Tagged response cache counters for this worker process.
+    Returns JSON: { "hits": int, "misses": int, "invalidations": int, "hit_rate": float }.
+    """
+    return jsonify(tagged_cache.stats()), 200
+
+@metrics_bp.route("/hashing", methods=["GET"])
+def hashing_metrics():
+    """
+    Password hashing pool latency and saturation for this worker process.
+    Returns JSON: { "workers", "max_pending", "pending", "peak_pending",
+    "completed", "rejected", "avg_ms", "max_ms" }.
+    """
+    return jsonify(hasher.stats()), 200
@@ -0,0 +1,8 @@
+# application/blueprints/search/__init__.py
+# Blueprint initialization for the typeahead search route.
+
+from flask import Blueprint
+
+search_bp = Blueprint("search", __name__)
+
+from application.blueprints.search import routes
@@ -0,0 +1,289 @@
+# application/blueprints/search/index.py
+# Ranked substring / fuzzy lookups behind GET /search/, per database:
+# pg_trgm similarity on PostgreSQL, FTS5 trigram tables on SQLite, and an
+# in-process n-gram index everywhere else.
+
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import current_app, has_app_context
+from sqlalchemy import case, event, func, or_, select, text
+from sqlalchemy.orm import Session, object_session
+
+from application.extensions import db
+from application.models.search import SEARCH_SOURCES, fts_table
+
+# Shortest query the trigram backends can match on; shorter ones are prefix lookups.
+MIN_TRIGRAM_QUERY = 3
+
+# Share of the query's trigrams a value must contain to count as a fuzzy match
+# (pg_trgm's default similarity threshold).
+SIMILARITY_THRESHOLD = 0.3
+
+
+def backend() -> str:
+    """
+    "postgresql", "sqlite" (FTS5 tables present) or "ngram". SEARCH_BACKEND
+    = "ngram" forces the in-process index.
+    """
+    if current_app.config["SEARCH_BACKEND"] == "ngram":
+        return "ngram"
+
+    bind = db.session.get_bind()
+    if bind.dialect.name == "postgresql":
+        return "postgresql"
+    if bind.dialect.name == "sqlite":
+        query = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name")
+        if db.session.execute(query, {"name": fts_table("customers")}).first():
+            return "sqlite"
+    return "ngram"
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix_ids(kind: str, q: str, limit: int) -> list:
+    """
+    Short queries: case-insensitive prefix match on any searchable column.
+    """
+    model, columns = SEARCH_SOURCES[kind]
+    pattern = _escape_like(q) + "%"
+    match = or_(*[getattr(model, c).ilike(pattern, escape="\\") for c in columns])
+    return list(db.session.scalars(select(model.id).where(match).order_by(model.id).limit(limit)))
+
+
+def _postgresql_ids(kind: str, q: str, limit: int) -> list:
+    model, names = SEARCH_SOURCES[kind]
+    columns = [func.coalesce(getattr(model, c), "") for c in names]
+    pattern = _escape_like(q)
+
+    match = or_(*[
+        or_(column.ilike(f"%{pattern}%", escape="\\"), column.op("%")(q)) for column in columns
+    ])
+    prefix = or_(*[column.ilike(f"{pattern}%", escape="\\") for column in columns])
+    score = func.greatest(*[func.similarity(column, q) for column in columns]) if len(columns) > 1 \
+        else func.similarity(columns[0], q)
+
+    query = (
+        select(model.id)
+        .where(match)
+        .order_by(case((prefix, 0), else_=1), score.desc(), model.id)
+        .limit(limit)
+    )
+    return list(db.session.scalars(query))
+
+
+def _sqlite_ids(kind: str, q: str, limit: int) -> list:
+    model, columns = SEARCH_SOURCES[kind]
+    fts = fts_table(model.__tablename__)
+    prefix = " OR ".join(f'"{c}" LIKE :prefix ESCAPE \'\\\'' for c in columns)
+    query = text(
+        f"SELECT rowid FROM {fts} WHERE {fts} MATCH :phrase "
+        f"ORDER BY CASE WHEN {prefix} THEN 0 ELSE 1 END, rank, rowid LIMIT :limit"
+    )
+    phrase = '"' + q.replace('"', '""') + '"'
+    return list(db.session.scalars(query, {"phrase": phrase, "prefix": _escape_like(q) + "%", "limit": limit}))
+
+
+def grams(value: str) -> set:
+    """
+    Trigrams of a lower-cased value, padded like pg_trgm ("  bob " -> "  b", " bo", ...).
+    """
+    padded = f"  {value.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NgramIndex:
+    """
+    Trigram -> ids postings for one search kind, held in this process.
+
+    Rows written through the ORM are applied after each commit (see the session
+    hooks below); anything else (other workers, bulk Core writes) is picked up
+    by a rebuild once the index is older than SEARCH_INDEX_TTL, or right away
+    after mark_stale(). A rebuild fills a new index and swaps it in, so searches
+    on other threads never see a half-built one.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.values = {}
+        self.built_at = None
+        self._lock = threading.Lock()
+
+    def build(self, rows) -> None:
+        """
+        Fill a new, not yet shared index.
+        """
+        for row_id, *values in rows:
+            self._add(row_id, values)
+        self.built_at = time.monotonic()
+
+    def apply(self, row_id: int, values) -> None:
+        """
+        Index a row's new values; None removes the row.
+        """
+        with self._lock:
+            if values is None:
+                self._remove(row_id)
+            else:
+                self._add(row_id, values)
+
+    def _add(self, row_id: int, values) -> None:
+        self._remove(row_id)
+        values = tuple(value.lower() for value in values if value)
+        self.values[row_id] = values
+        for value in values:
+            for gram in grams(value):
+                self.postings[gram].add(row_id)
+
+    def _remove(self, row_id: int) -> None:
+        for value in self.values.pop(row_id, ()):
+            for gram in grams(value):
+                self.postings[gram].discard(row_id)
+
+    def search(self, q: str, limit: int) -> list:
+        """
+        Ids ranked by: prefix match, substring match, share of q's trigrams present.
+        """
+        q = q.lower()
+        wanted = grams(q)
+        shared = Counter()
+        ranked = []
+        with self._lock:
+            for gram in wanted:
+                shared.update(self.postings.get(gram, ()))
+
+            for row_id, count in shared.items():
+                values = self.values[row_id]
+                score = count / len(wanted)
+                contains = any(q in value for value in values)
+                if not contains and score < SIMILARITY_THRESHOLD:
+                    continue
+                starts = any(value.startswith(q) for value in values)
+                ranked.append((not starts, not contains, -score, row_id))
+
+        ranked.sort()
+        return [row_id for *_, row_id in ranked[:limit]]
+
+
+# One rebuild at a time; _changes_lock orders committed changes against the swap.
+_build_lock = threading.Lock()
+_changes_lock = threading.Lock()
+
+
+def _indexes() -> dict:
+    return current_app.extensions.setdefault("search_indexes", {})
+
+
+def _building() -> dict:
+    # kind -> changes committed while that kind's table is being read
+    return current_app.extensions.setdefault("search_indexes_building", {})
+
+
+def _is_fresh(index) -> bool:
+    return (
+        index is not None
+        and index.built_at is not None
+        and time.monotonic() - index.built_at <= current_app.config["SEARCH_INDEX_TTL"]
+    )
+
+
+def ngram_index(kind: str) -> NgramIndex:
+    """
+    This process's index for kind, rebuilt from the table when missing or stale.
+    """
+    index = _indexes().get(kind)
+    if _is_fresh(index):
+        return index
+
+    with _build_lock:
+        index = _indexes().get(kind)
+        if _is_fresh(index):
+            return index
+
+        model, columns = SEARCH_SOURCES[kind]
+        changes = _building()[kind] = []
+        fresh = NgramIndex()
+        try:
+            fresh.build(db.session.execute(select(model.id, *[getattr(model, c) for c in columns])))
+        finally:
+            with _changes_lock:
+                _building().pop(kind, None)
+                # replay commits the read may have missed, then publish
+                for row_id, values in changes:
+                    fresh.apply(row_id, values)
+                if fresh.built_at is not None:
+                    _indexes()[kind] = fresh
+    return fresh
+
+
+def mark_stale(*kinds) -> None:
+    """
+    Rebuild these in-process indexes on their next use (after writes the
+    session hooks cannot see, e.g. bulk INSERTs).
+    """
+    if not has_app_context():
+        return
+    for kind in kinds:
+        index = _indexes().get(kind)
+        if index is not None:
+            index.built_at = None
+
+
+def search_ids(kind: str, q: str, limit: int, using: str) -> list:
+    """
+    Up to limit ids of kind matching q, best first.
+    """
+    if len(q) < MIN_TRIGRAM_QUERY and using != "ngram":
+        return _prefix_ids(kind, q, limit)
+    if using == "postgresql":
+        return _postgresql_ids(kind, q, limit)
+    if using == "sqlite":
+        return _sqlite_ids(kind, q, limit)
+    return ngram_index(kind).search(q, limit)
+
+
+# ---- keep built n-gram indexes current with this process's ORM writes ----
+
+KIND_BY_MODEL = {model: kind for kind, (model, _) in SEARCH_SOURCES.items()}
+
+
+def _record(mapper, connection, target, deleted=False):
+    session = object_session(target)
+    if session is None:
+        return
+    kind = KIND_BY_MODEL[mapper.class_]
+    values = None if deleted else [getattr(target, c) for c in SEARCH_SOURCES[kind][1]]
+    session.info.setdefault("search_changes", []).append((kind, target.id, values))
+
+
+def _record_delete(mapper, connection, target):
+    _record(mapper, connection, target, deleted=True)
+
+
+for _model in KIND_BY_MODEL:
+    event.listen(_model, "after_insert", _record)
+    event.listen(_model, "after_update", _record)
+    event.listen(_model, "after_delete", _record_delete)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    changes = session.info.pop("search_changes", None)
+    if not changes or not has_app_context():
+        return
+    indexes, building = _indexes(), _building()
+    with _changes_lock:
+        for kind, row_id, values in changes:
+            if kind in building:
+                building[kind].append((row_id, values))
+            index = indexes.get(kind)
+            if index is not None:
+                index.apply(row_id, values)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("search_changes", None)
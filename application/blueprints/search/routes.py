@@ -0,0 +1,76 @@
+# application/blueprints/search/routes.py
+# GET /search/: typeahead over customers (name, phone), parts (name) and tickets (VIN).
+
+from flask import current_app, request, jsonify
+
+from application.extensions import db, limiter
+from application.blueprints.search import search_bp
+from application.blueprints.search import index
+from application.blueprints.tickets.schemas import tickets_compiled
+from application.models.search import SEARCH_SOURCES
+from application.schemas.customer_schema import customers_compiled
+from application.schemas.inventory_schema import inventories_compiled
+from application.utils.pagination import PaginationError, page_limit
+from application.utils.serializer import json_response
+
+MAX_QUERY_LENGTH = 100
+
+# What each kind returns (the same fields as its list endpoint).
+RESULT_SCHEMAS = {
+    "customers": customers_compiled,
+    "parts": inventories_compiled,
+    "tickets": tickets_compiled.view(fields=["VIN", "service_date", "customer_id"]),
+}
+
+
+def load_ranked(kind: str, ids: list) -> list:
+    """
+    Dump the rows for ids (one IN query), in the given rank order. Ids whose
+    row is gone (e.g. removed by a cascade) are skipped.
+    """
+    if not ids:
+        return []
+    model, _ = SEARCH_SOURCES[kind]
+    compiled = RESULT_SCHEMAS[kind]
+    items = compiled.dump(db.session.execute(compiled.select().where(model.id.in_(ids))).all())
+    by_id = {item["id"]: item for item in items}
+    return [by_id[row_id] for row_id in ids if row_id in by_id]
+
+
+@search_bp.route("/", methods=["GET"])
+@limiter.limit(lambda: current_app.config["SEARCH_RATE_LIMIT"])
+def search():
+    """
+    Ranked substring / fuzzy search for typeahead.
+
+    Query parameters:
+    - q (str, required): Search text (partial name, phone or VIN), at most 100 characters.
+    - types (str, optional): Comma-separated subset of customers, parts, tickets. Default: all.
+    - limit (int, optional): Results per type. Default DEFAULT_PAGE_SIZE, max MAX_PAGE_SIZE.
+
+    Prefix matches rank first, then substring matches, then fuzzy (trigram)
+    matches; queries under 3 characters are prefix-only on the database backends.
+    Returns JSON: { "query": str, "backend": str, "<type>": [...] for each type }.
+    """
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"error": "q is required."}), 400
+    if len(q) > MAX_QUERY_LENGTH:
+        return jsonify({"error": f"q cannot be longer than {MAX_QUERY_LENGTH} characters."}), 400
+
+    types = request.args.get("types")
+    kinds = list(SEARCH_SOURCES) if types is None else [kind for kind in types.split(",") if kind]
+    unknown = [kind for kind in kinds if kind not in SEARCH_SOURCES]
+    if unknown or not kinds:
+        return jsonify({"error": f"types must be a subset of: {', '.join(SEARCH_SOURCES)}."}), 400
+
+    try:
+        limit = page_limit(request.args)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    using = index.backend()
+    payload = {"query": q, "backend": using}
+    for kind in kinds:
+        payload[kind] = load_ranked(kind, index.search_ids(kind, q, limit, using))
+    return json_response(payload)
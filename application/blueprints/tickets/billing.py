@@ -0,0 +1,132 @@
+# application/blueprints/tickets/billing.py
+# Ticket line items (service_ticket_inventory rows with quantity and unit
+# price), the denormalized ServiceTicket.parts_total, and the invoice /
+# revenue queries built on them.
+
+from collections import defaultdict
+
+from sqlalchemy import Numeric, cast, func, select, update
+
+from application.extensions import db
+from application.models.inventory import Inventory, service_ticket_inventory as lines
+from application.models.service_ticket import ServiceTicket
+
+GROUPS = ("day", "month", "customer")
+
+
+def parts_total_of(ticket_id):
+    """
+    Correlated scalar subquery: the sum of quantity * unit_price over one
+    ticket's lines, rounded to cents (ticket_id may be a value or a column).
+    The cast is for PostgreSQL, whose round(x, 2) only takes numeric.
+    """
+    total = func.coalesce(func.sum(lines.c.quantity * lines.c.unit_price), 0)
+    return (
+        select(func.round(cast(total, Numeric(14, 4)), 2))
+        .where(lines.c.ticket_id == ticket_id)
+        .scalar_subquery()
+    )
+
+
+def refresh_parts_total(ticket) -> None:
+    """
+    Recompute a loaded ticket's parts_total from its lines in the UPDATE the
+    next flush issues (together with the version bump from touch()).
+    """
+    ticket.parts_total = parts_total_of(ticket.id)
+
+
+def refresh_parts_totals(ticket_ids) -> None:
+    """
+    Recompute parts_total (and bump the version) for many tickets in one
+    UPDATE, e.g. after deleting a part cascaded away their lines.
+    """
+    if not ticket_ids:
+        return
+    db.session.execute(
+        update(ServiceTicket)
+        .where(ServiceTicket.id.in_(ticket_ids))
+        .values(parts_total=parts_total_of(ServiceTicket.id), version=ServiceTicket.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def line_items(ticket_id: int) -> list:
+    """
+    [{"part_id", "name", "quantity", "unit_price", "line_total"}] in part id order.
+    """
+    query = (
+        select(Inventory.id, Inventory.name, lines.c.quantity, lines.c.unit_price)
+        .join(lines, lines.c.inventory_id == Inventory.id)
+        .where(lines.c.ticket_id == ticket_id)
+        .order_by(Inventory.id)
+    )
+    return [
+        {
+            "part_id": part_id,
+            "name": name,
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "line_total": round(quantity * unit_price, 2),
+        }
+        for part_id, name, quantity, unit_price in db.session.execute(query)
+    ]
+
+
+def invoice(ticket) -> dict:
+    """
+    The ticket's bill: its line items and parts_total.
+    """
+    return {
+        "ticket_id": ticket.id,
+        "VIN": ticket.VIN,
+        "service_date": ticket.service_date.isoformat(),
+        "customer_id": ticket.customer_id,
+        "lines": line_items(ticket.id),
+        "parts_total": ticket.parts_total,
+    }
+
+
+def revenue(date_from=None, date_to=None, group=None) -> dict:
+    """
+    Ticket count and summed parts_total for tickets with service_date in the
+    window, optionally broken down by day, month or customer. Only the
+    (service_date, parts_total) / (customer_id, parts_total) columns are read;
+    no line items are joined.
+    """
+    criteria = []
+    if date_from:
+        criteria.append(ServiceTicket.service_date >= date_from)
+    if date_to:
+        criteria.append(ServiceTicket.service_date <= date_to)
+
+    count, total = db.session.execute(
+        select(func.count(), func.coalesce(func.sum(ServiceTicket.parts_total), 0)).where(*criteria)
+    ).one()
+    report = {"tickets": count, "revenue": round(total, 2)}
+    if group is None:
+        return report
+
+    key = ServiceTicket.customer_id if group == "customer" else ServiceTicket.service_date
+    rows = db.session.execute(
+        select(key, func.count(), func.sum(ServiceTicket.parts_total))
+        .where(*criteria)
+        .group_by(key)
+        .order_by(key)
+    ).all()
+
+    if group == "customer":
+        groups = [{"customer_id": customer_id, "tickets": n, "revenue": round(s, 2)} for customer_id, n, s in rows]
+        groups.sort(key=lambda item: (-item["revenue"], item["customer_id"]))
+    else:
+        # months are folded from the per-day groups in Python: date truncation
+        # is spelled differently on every database
+        buckets = defaultdict(lambda: [0, 0.0])
+        for day, n, s in rows:
+            bucket = buckets[day.isoformat() if group == "day" else day.strftime("%Y-%m")]
+            bucket[0] += n
+            bucket[1] += s
+        groups = [{group: name, "tickets": n, "revenue": round(s, 2)} for name, (n, s) in buckets.items()]
+
+    report["groups"] = groups
+    return report
@@ -0,0 +1,104 @@
+# application/blueprints/tickets/export.py
+# Row generators behind GET /service-tickets/export (NDJSON / CSV streaming).
+
+import csv
+import io
+import json
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from application.extensions import db
+from application.models.inventory import service_ticket_inventory
+from application.models.service_ticket import ServiceTicket, service_mechanics
+
+COLUMNS = ["id", "VIN", "service_date", "service_desc", "customer_id"]
+
+# include= name -> (association table column holding the id, ticket_id column)
+INCLUDES = {
+    "mechanic_ids": (service_mechanics.c.mechanic_id, service_mechanics.c.ticket_id),
+    "part_ids": (service_ticket_inventory.c.inventory_id, service_ticket_inventory.c.ticket_id),
+}
+
+
+def export_query(date_from=None, date_to=None, since_id=None):
+    """
+    Ticket columns only (no ORM objects), in id order so since_id resumes cleanly.
+    """
+    query = select(*[getattr(ServiceTicket, name) for name in COLUMNS]).order_by(ServiceTicket.id)
+    if date_from:
+        query = query.where(ServiceTicket.service_date >= date_from)
+    if date_to:
+        query = query.where(ServiceTicket.service_date <= date_to)
+    if since_id is not None:
+        query = query.where(ServiceTicket.id > since_id)
+    return query
+
+
+def export_chunks(query, includes, chunk_size: int):
+    """
+    Yield lists of at most chunk_size ticket dicts; only one chunk is held at a time.
+
+    Tickets stream from their own connection through a server-side cursor
+    (yield_per implies stream_results). Each chunk's mechanic/part ids come from
+    one IN query on the session's connection, so the open cursor is never
+    interleaved with other statements (MySQL unbuffered cursors forbid that).
+    """
+    with db.engine.connect() as connection:
+        result = connection.execution_options(yield_per=chunk_size).execute(query)
+
+        for chunk in result.partitions():
+            ids = [row.id for row in chunk]
+            linked = {}
+            for name in includes:
+                id_column, ticket_column = INCLUDES[name]
+                by_ticket = defaultdict(list)
+                pairs = db.session.execute(
+                    select(ticket_column, id_column).where(ticket_column.in_(ids)).order_by(ticket_column, id_column)
+                )
+                for ticket_id, linked_id in pairs:
+                    by_ticket[ticket_id].append(linked_id)
+                linked[name] = by_ticket
+
+            items = []
+            for row in chunk:
+                item = row._asdict()
+                item["service_date"] = item["service_date"].isoformat()
+                for name in includes:
+                    item[name] = linked[name].get(row.id, [])
+                items.append(item)
+            yield items
+
+
+def ndjson_lines(chunks):
+    """
+    One JSON object per line; one write per chunk.
+    """
+    for items in chunks:
+        yield "".join(json.dumps(item, separators=(",", ":"), sort_keys=True) + "\n" for item in items)
+
+
+def csv_lines(chunks, includes):
+    """
+    Header line, then one line per ticket (one write per chunk); id lists are
+    flattened to "1 4 7".
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(COLUMNS + list(includes))
+    yield flush()
+
+    for items in chunks:
+        for item in items:
+            writer.writerow(
+                [item[name] for name in COLUMNS]
+                + [" ".join(str(linked_id) for linked_id in item[name]) for name in includes]
+            )
+        yield flush()
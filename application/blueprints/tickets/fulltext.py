@@ -0,0 +1,124 @@
+# application/blueprints/tickets/fulltext.py
+# Ranked full-text matching over service_desc behind GET /service-tickets/search:
+# the tsvector GIN index on PostgreSQL, the FTS5 table on SQLite, and an
+# unindexed all-words LIKE everywhere else.
+
+import re
+
+from sqlalchemy import Float, Integer, String, and_, literal, literal_column, text, tuple_
+
+from application.extensions import db
+from application.models.search import DESC_FTS_TABLE, TEXT_SEARCH_CONFIG
+from application.models.service_ticket import ServiceTicket
+from application.utils.pagination import Page, PaginationError, decode_cursor, encode_cursor, page_limit
+
+# Matched words are wrapped in these in snippets (plain text, not HTML).
+MARK_START = "**"
+MARK_END = "**"
+SNIPPET_WORDS = 12
+
+MAX_QUERY_LENGTH = 200
+
+HEADLINE_OPTIONS = f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={SNIPPET_WORDS}, MinWords=5, MaxFragments=1"
+
+WORD = re.compile(r"\w+")
+
+
+def terms(q: str) -> list:
+    """
+    The words of q, lower-cased; every one of them must match.
+    """
+    return WORD.findall(q.lower())
+
+
+def backend() -> str:
+    """
+    "postgresql", "sqlite" (FTS5 table present) or "like".
+    """
+    bind = db.session.get_bind()
+    if bind.dialect.name == "postgresql":
+        return "postgresql"
+    if bind.dialect.name == "sqlite":
+        query = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name")
+        if db.session.execute(query, {"name": DESC_FTS_TABLE}).first():
+            return "sqlite"
+    return "like"
+
+
+def match(query, q: str, using: str):
+    """
+    Restrict a ticket select to rows whose service_desc matches every word of
+    q and add two columns: "score" (lower ranks first) and "snippet".
+    Returns (query, score expression usable in WHERE/ORDER BY).
+    """
+    words = terms(q)
+
+    if using == "postgresql":
+        # a literal (not a bound parameter) so the planner matches the index expression
+        config = literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+        document = db.func.to_tsvector(config, ServiceTicket.service_desc)
+        tsquery = db.func.plainto_tsquery(config, " ".join(words))
+        score = -db.func.ts_rank(document, tsquery)
+        snippet = db.func.ts_headline(config, ServiceTicket.service_desc, tsquery, HEADLINE_OPTIONS)
+        query = query.where(document.op("@@")(tsquery))
+        return query.add_columns(score.label("score"), snippet.label("snippet")), score
+
+    if using == "sqlite":
+        # snippet() and bm25() only work in the statement that runs the MATCH
+        hits = text(
+            f"SELECT rowid AS id, bm25({DESC_FTS_TABLE}) AS score, "
+            f"snippet({DESC_FTS_TABLE}, 0, :start, :end, '…', :words) AS snippet "
+            f"FROM {DESC_FTS_TABLE} WHERE {DESC_FTS_TABLE} MATCH :match"
+        ).bindparams(
+            start=MARK_START, end=MARK_END, words=SNIPPET_WORDS,
+            match=" ".join(f'"{word}"' for word in words),
+        ).columns(id=Integer, score=Float, snippet=String).subquery("hits")
+        query = query.join(hits, hits.c.id == ServiceTicket.id)
+        return query.add_columns(hits.c.score, hits.c.snippet), hits.c.score
+
+    # no index: every word as a case-insensitive substring, oldest first
+    score = literal(0.0, Float)
+    query = query.where(and_(*[ServiceTicket.service_desc.icontains(word, autoescape=True) for word in words]))
+    return query.add_columns(score.label("score"), ServiceTicket.service_desc.label("snippet")), score
+
+
+def make_snippet(value: str, words: list, width: int = SNIPPET_WORDS) -> str:
+    """
+    Up to width words of value around the first matched word, matches marked
+    like the database snippets (used where the database cannot build them).
+    """
+    tokens = value.split()
+    lowered = [token.lower() for token in tokens]
+    first = next((i for i, token in enumerate(lowered) if any(word in token for word in words)), 0)
+    start = max(0, min(first - width // 3, len(tokens) - width))
+    window = [
+        f"{MARK_START}{token}{MARK_END}" if any(word in token.lower() for word in words) else token
+        for token in tokens[start:start + width]
+    ]
+    return ("…" if start else "") + " ".join(window) + ("…" if start + width < len(tokens) else "")
+
+
+def search_page(query, q: str, args, using: str) -> Page:
+    """
+    Best matches first (ties by id), keyset-paginated on (score, id) so page N
+    costs the same as page 1. Rows keep their trailing score and snippet
+    columns. Raises PaginationError for a bad limit or cursor.
+    """
+    limit = page_limit(args)
+    query, score = match(query, q, using)
+
+    cursor = args.get("cursor")
+    if cursor:
+        position = decode_cursor(cursor)
+        if position.get("sort") != "rank" or not isinstance(position.get("value"), (int, float)):
+            raise PaginationError("Cursor does not match sort.")
+        query = query.where(tuple_(score, ServiceTicket.id) > tuple_(position["value"], position["id"]))
+
+    rows = db.session.execute(query.order_by(score, ServiceTicket.id).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"id": rows[-1].id, "sort": "rank", "value": rows[-1].score})
+
+    return Page(rows, limit, next_cursor)
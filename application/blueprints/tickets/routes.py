@@ -1,15 +1,99 @@
-from flask import request, jsonify
+from flask import Response, current_app, request, jsonify, stream_with_context
 from marshmallow import ValidationError
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete, update
+from sqlalchemy.orm.exc import StaleDataError
 
-from application.extensions import db, limiter, cache
-from application.models.service_ticket import ServiceTicket
+from application.extensions import db, limiter, tagged_cache
+from application.models.service_ticket import ServiceTicket, service_mechanics
 from application.models.customer import Customer
 from application.models.mechanic import Mechanic
+from application.models.snapshots import mechanics_snapshot, parts_snapshot
 from application.utils.util import token_required
-from application.blueprints.tickets.schemas import ticket_schema, tickets_schema
+from application.utils.pagination import Listing, PaginationError
+from application.utils.dates import date_range
+from application.utils.serializer import json_response
+from application.utils.conditional import (
+    aggregate_version, conditional, conflict, etag_for, precondition_failed, row_version, table_versions, touch,
+)
+from application.blueprints.tickets.schemas import ticket_schema, tickets_schema, tickets_compiled, line_item_schema
 from application.blueprints.tickets import tickets_bp
-from application.models.inventory import Inventory
+from application.blueprints.tickets import billing
+from application.blueprints.tickets import export
+from application.blueprints.tickets import fulltext
+from application.blueprints.mechanics import leaderboard
+from application.blueprints.search import index as search_index
+from application.models.inventory import Inventory, service_ticket_inventory
+from application.models.associations import link, link_all, unlink
+
+
+# ?sort= / prefix filters for ticket lists (also GET /customers/my-tickets); all indexed.
+tickets_listing = Listing(
+    ServiceTicket.id,
+    sorts={
+        "service_date": ServiceTicket.service_date,
+        "VIN": ServiceTicket.VIN,
+        "parts_total": ServiceTicket.parts_total,
+    },
+    prefix_filters={"VIN": ServiceTicket.VIN},
+)
+
+
+def ticket_tags(ticket: dict) -> list:
+    """
+    Cache tags for a response that embeds this (serialized, possibly sparse)
+    ticket: its owner (deleting the customer deletes the ticket) plus every
+    mechanic and part nested in the payload. Id lists need no tags: renaming
+    a mechanic does not change them, and deleting a mechanic or part
+    invalidates every ticket it was on.
+    """
+    tags = [f"customer:{ticket['customer_id']}"] if "customer_id" in ticket else []
+    return (
+        tags
+        + [f"mechanic:{m['id']}" for m in ticket.get("mechanics", ())]
+        + [f"part:{p['id']}" for p in ticket.get("parts", ())]
+    )
+
+
+def invalidate_ticket(ticket_id: int, customer_id: int, *extra_tags) -> None:
+    """
+    Drop cached responses that include this ticket (list pages, the ticket
+    itself, the owner's ticket list) plus any extra tags the write touched.
+    """
+    tagged_cache.invalidate(
+        "tickets:list",
+        f"ticket:{ticket_id}",
+        f"customer:{customer_id}:tickets",
+        *extra_tags,
+    )
+
+
+def ticket_view(ticket_id: int) -> dict:
+    """
+    One ticket as GET /service-tickets/<id> returns it by default (mechanics
+    and parts expanded), read through the compiled view, not ORM collections.
+    """
+    compiled = tickets_compiled.view(expand=("mechanics", "parts"))
+    rows = db.session.execute(compiled.select().where(ServiceTicket.id == ticket_id)).all()
+    data, = compiled.dump(rows)
+    return data
+
+
+def ticket_version(ticket_id: int):
+    """
+    ETag components for one ticket: its row version plus the aggregate version
+    of the mechanics and parts nested in its payload. None if it does not exist.
+    """
+    ticket = row_version(ServiceTicket, ticket_id)
+    if ticket is None:
+        return None
+
+    assigned = select(service_mechanics.c.mechanic_id).where(service_mechanics.c.ticket_id == ticket_id)
+    used = select(service_ticket_inventory.c.inventory_id).where(service_ticket_inventory.c.ticket_id == ticket_id)
+    return ticket + table_versions(
+        aggregate_version(Mechanic, Mechanic.id.in_(assigned)),
+        aggregate_version(Inventory, Inventory.id.in_(used)),
+    )
+
 
 @tickets_bp.route("/", methods=["POST"])
 @limiter.limit("5 per minute")
@@ -30,35 +114,313 @@ def create_ticket():
     new_ticket = ServiceTicket(**ticket_data)
     db.session.add(new_ticket)
     db.session.commit()
-    cache.clear()
+    invalidate_ticket(new_ticket.id, new_ticket.customer_id)
     return ticket_schema.jsonify(new_ticket), 201
 
+def insert_tickets(rows: list) -> list:
+    """
+    Insert ticket rows (dicts of column values) in one executemany and return
+    their new ids, in order. Uses INSERT ... RETURNING batched by SQLAlchemy's
+    insertmanyvalues where the dialect can match ids to rows (PostgreSQL,
+    SQLite); otherwise the ORM flushes them as one batch.
+    """
+    if db.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+        stmt = insert(ServiceTicket).returning(ServiceTicket.id, sort_by_parameter_order=True)
+        return list(db.session.scalars(stmt, rows))
+
+    tickets = [ServiceTicket(**row) for row in rows]
+    db.session.add_all(tickets)
+    db.session.flush()
+    return [ticket.id for ticket in tickets]
+
+@tickets_bp.route("/bulk", methods=["POST"])
+@limiter.limit(lambda: current_app.config["BULK_TICKETS_RATE_LIMIT"])
+def create_tickets_bulk():
+    """
+    Create many tickets in one request (e.g. a dealer feed import). No auth.
+    Body: {"tickets": [<same body as POST /service-tickets/>, ...]}, at most
+    BULK_TICKETS_MAX items.
+
+    Items are validated in one schema pass and their customers checked with one
+    IN query; the valid ones are inserted in a single transaction and the rest
+    reported by position. Rate limited separately from single creates.
+    Returns JSON: { "created": [{"index": int, "id": int}, ...], "errors": {index: messages} }
+    with 201 if everything was created, 207 if only some items were, 400 if none.
+    """
+    body = request.get_json(silent=True)
+    items = body.get("tickets") if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Body must be {\"tickets\": [...]} with at least one ticket."}), 400
+
+    ceiling = current_app.config["BULK_TICKETS_MAX"]
+    if len(items) > ceiling:
+        return jsonify({"error": f"At most {ceiling} tickets per request."}), 400
+
+    try:
+        loaded = tickets_schema.load(items)
+        errors = {}
+    except ValidationError as e:
+        # keyed by item index; valid_data stays aligned with the input list
+        loaded, errors = e.valid_data, e.messages
+
+    customer_ids = {data["customer_id"] for index, data in enumerate(loaded) if index not in errors}
+    known = set(db.session.scalars(select(Customer.id).where(Customer.id.in_(customer_ids)))) if customer_ids else set()
+
+    valid = []
+    for index, data in enumerate(loaded):
+        if index in errors:
+            continue
+        if data["customer_id"] not in known:
+            errors[index] = {"customer_id": ["Customer not found."]}
+            continue
+        valid.append((index, data))
+
+    created = []
+    if valid:
+        ids = insert_tickets([data for _, data in valid])
+        db.session.commit()
+        search_index.mark_stale("tickets")  # bulk INSERT bypasses the ORM write hooks
+        created = [{"index": index, "id": ticket_id} for (index, _), ticket_id in zip(valid, ids)]
+        tagged_cache.invalidate(
+            "tickets:list",
+            *{f"customer:{data['customer_id']}:tickets" for _, data in valid},
+        )
+
+    status = 201 if not errors else 207 if created else 400
+    return jsonify({"created": created, "errors": errors}), status
+
 @tickets_bp.route("/", methods=["GET"])
-@cache.cached(timeout=60)
+@tagged_cache.cached(tags=["tickets:list"], timeout=60, stale_ttl=30, etag=True)
 def list_tickets():
-    tickets = db.session.execute(select(ServiceTicket)).scalars().all()
-    return tickets_schema.jsonify(tickets), 200
+    """
+    Cursor-paginated ticket list (keyset; by id unless sorted).
+
+    Query parameters:
+    - limit (int, optional): Page size. Default DEFAULT_PAGE_SIZE, max MAX_PAGE_SIZE.
+    - cursor (str, optional): next_cursor from the previous page.
+    - sort (str, optional): id, service_date, VIN or parts_total; prefix "-" for descending.
+    - VIN (str, optional): Only tickets whose VIN starts with this.
+    - total (bool, optional): Also return the number of matching tickets.
+    - from / to (YYYY-MM-DD, optional): Only tickets with service_date in this window
+      (inclusive; served by the service_date index).
+    - fields (str, optional): Comma-separated ticket keys, e.g. "id,VIN,mechanic_ids".
+      Default: every column plus mechanic_ids and part_ids. "id" is always sent.
+    - expand (str, optional): "mechanics" and/or "parts" as full nested objects.
+
+    Only the requested columns are selected; rows are fetched as tuples and
+    serialized by a tickets_compiled view. Id lists and expanded objects come
+    from one batched query each per page.
+    Sends an ETag (hash of the cached body); If-None-Match with it returns 304
+    straight from the cache entry, without querying any table.
+    Returns JSON: { "tickets": [...], "limit": int, "count": int, "next_cursor": str | null }
+    (+ "total_count", "total_exact" with ?total=true).
+    """
+    try:
+        date_from, date_to = date_range(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        compiled = tickets_compiled.view_from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    query = compiled.select()
+    if date_from:
+        query = query.where(ServiceTicket.service_date >= date_from)
+    if date_to:
+        query = query.where(ServiceTicket.service_date <= date_to)
+
+    try:
+        page = tickets_listing.page(query, request.args, scalars=False)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    tickets = compiled.dump(page.rows)
+    for ticket in tickets:
+        tagged_cache.tag(*ticket_tags(ticket))
+
+    return json_response(page.envelope("tickets", tickets))
+
+@tickets_bp.route("/export", methods=["GET"])
+def export_tickets():
+    """
+    Stream every ticket (for reconciliation jobs), oldest id first.
+
+    Query parameters:
+    - format (str, optional): "ndjson" (default) or "csv".
+    - include (str, optional): Comma-separated "mechanic_ids", "part_ids" to add
+      each ticket's linked ids (CSV: space-separated in one column).
+    - from / to (YYYY-MM-DD, optional): service_date window (inclusive).
+    - since_id (int, optional): Only tickets with id > since_id (resume/incremental).
+
+    Rows are read through a server-side cursor in EXPORT_CHUNK_SIZE batches and
+    written as they arrive, so memory stays flat however large the table is.
+    """
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in ("ndjson", "csv"):
+        return jsonify({"error": "format must be 'ndjson' or 'csv'."}), 400
+
+    includes = [name for name in request.args.get("include", "").split(",") if name]
+    unknown = [name for name in includes if name not in export.INCLUDES]
+    if unknown:
+        return jsonify({"error": f"Unknown include: {', '.join(unknown)}."}), 400
+
+    since_id = request.args.get("since_id")
+    if since_id is not None:
+        if not (since_id.isascii() and since_id.isdigit()):
+            return jsonify({"error": "since_id must be a non-negative integer."}), 400
+        since_id = int(since_id)
+
+    try:
+        date_from, date_to = date_range(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    query = export.export_query(date_from, date_to, since_id)
+    chunks = export.export_chunks(query, includes, current_app.config["EXPORT_CHUNK_SIZE"])
+
+    if export_format == "csv":
+        response = Response(stream_with_context(export.csv_lines(chunks, includes)), mimetype="text/csv")
+        response.headers["Content-Disposition"] = "attachment; filename=service-tickets.csv"
+        return response
+
+    return Response(stream_with_context(export.ndjson_lines(chunks)), mimetype="application/x-ndjson")
+
+@tickets_bp.route("/search", methods=["GET"])
+@limiter.limit(lambda: current_app.config["SEARCH_RATE_LIMIT"])
+def search_tickets():
+    """
+    Full-text search over service_desc, best match first.
+
+    Query parameters:
+    - q (str, required): Words that must all appear (stemmed: "brakes" finds "brake"),
+      at most 200 characters.
+    - VIN (str, optional): Only tickets whose VIN starts with this.
+    - from / to (YYYY-MM-DD, optional): service_date window (inclusive).
+    - limit (int, optional): Page size. Default DEFAULT_PAGE_SIZE, max MAX_PAGE_SIZE.
+    - cursor (str, optional): next_cursor from the previous page.
+    - fields / expand: as on GET /service-tickets/ (default: every column, id lists).
+
+    Uses the tsvector GIN index on PostgreSQL and the FTS5 table on SQLite
+    (both kept current as tickets are written); other databases fall back to
+    an unranked substring scan.
+    Returns JSON: { "query": str, "backend": str, "tickets": [{..., "snippet": str}],
+    "limit": int, "count": int, "next_cursor": str | null }. Matched words are
+    wrapped in ** in the snippet.
+    """
+    q = request.args.get("q", "").strip()
+    words = fulltext.terms(q)
+    if not words:
+        return jsonify({"error": "q must contain at least one word."}), 400
+    if len(q) > fulltext.MAX_QUERY_LENGTH:
+        return jsonify({"error": f"q cannot be longer than {fulltext.MAX_QUERY_LENGTH} characters."}), 400
+
+    try:
+        date_from, date_to = date_range(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        compiled = tickets_compiled.view_from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    query = tickets_listing.filter(compiled.select(), request.args)
+    if date_from:
+        query = query.where(ServiceTicket.service_date >= date_from)
+    if date_to:
+        query = query.where(ServiceTicket.service_date <= date_to)
+
+    using = fulltext.backend()
+    try:
+        page = fulltext.search_page(query, q, request.args, using)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    tickets = compiled.dump(page.rows)
+    for ticket, row in zip(tickets, page.rows):
+        ticket["snippet"] = row.snippet if using != "like" else fulltext.make_snippet(row.snippet, words)
+
+    return json_response({"query": q, "backend": using, **page.envelope("tickets", tickets)})
+
+@tickets_bp.route("/revenue", methods=["GET"])
+def ticket_revenue():
+    """
+    Parts revenue: number of tickets and the sum of their parts_total.
+
+    Query parameters:
+    - from / to (YYYY-MM-DD, optional): service_date window (inclusive).
+    - group_by (str, optional): "day", "month" or "customer" to add a "groups"
+      breakdown (customers by revenue, highest first; days/months in order).
+
+    Aggregates the indexed parts_total column; line items are not read.
+    Returns JSON: { "tickets": int, "revenue": float, "groups": [...] (with group_by) }.
+    """
+    try:
+        date_from, date_to = date_range(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    group = request.args.get("group_by")
+    if group is not None and group not in billing.GROUPS:
+        return jsonify({"error": f"group_by must be one of: {', '.join(billing.GROUPS)}."}), 400
+
+    return jsonify(billing.revenue(date_from, date_to, group)), 200
+
+@tickets_bp.route("/<int:ticket_id>/invoice", methods=["GET"])
+@conditional(ticket_version)
+def get_ticket_invoice(ticket_id: int):
+    """
+    A ticket's invoice: one line per part (quantity, unit price, line total)
+    and the parts_total. Sends an ETag.
+    """
+    ticket = db.session.get(ServiceTicket, ticket_id)
+    if not ticket:
+        return jsonify({"error": "Ticket not found."}), 404
+    return jsonify(billing.invoice(ticket)), 200
 
 @tickets_bp.route("/<int:ticket_id>", methods=["GET"])
+@conditional(ticket_version)
+@tagged_cache.cached(tags=lambda ticket_id: [f"ticket:{ticket_id}"], timeout=60, stale_ttl=30)
 def get_ticket(ticket_id: int):
     """
     Get a single ticket by ID. No auth; shop can view any ticket.
+    Sends an ETag (use it as If-Match on the ticket's PUT routes).
+
+    Takes the same fields / expand parameters as the list, but expands
+    mechanics and parts by default.
     """
-    ticket = db.session.get(ServiceTicket, ticket_id)
-    if not ticket:
+    try:
+        compiled = tickets_compiled.view_from_args(request.args, default_expand=("mechanics", "parts"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # customer_id rides along for the cache tag even when fields= leaves it out
+    query = compiled.select().add_columns(ServiceTicket.customer_id).where(ServiceTicket.id == ticket_id)
+    rows = db.session.execute(query).all()
+    if not rows:
         return jsonify({"error": "Ticket not found."}), 404
-    return ticket_schema.jsonify(ticket), 200
+
+    data, = compiled.dump(rows)
+    tagged_cache.tag(f"customer:{rows[0][-1]}", *ticket_tags(data))
+    return json_response(data)
 
 @tickets_bp.route("/<int:ticket_id>", methods=["PUT"])
 def update_ticket(ticket_id: int):
     """
     Update a ticket by ID. No auth; shop can update any ticket.
     Body: {"VIN": str, "service_date": str, "service_desc": str, "customer_id": int (optional)}.
+    Optional If-Match: ETag from GET; 412 if the ticket changed since.
     """
     ticket = db.session.get(ServiceTicket, ticket_id)
     if not ticket:
         return jsonify({"error": "Ticket not found."}), 404
 
+    failed = precondition_failed(ticket_version(ticket_id))
+    if failed:
+        return failed
+
     try:
         ticket_data = ticket_schema.load(request.json, partial=True)
     except ValidationError as e:
@@ -69,12 +431,22 @@ def update_ticket(ticket_id: int):
         if not customer:
             return jsonify({"error": "Customer not found."}), 404
 
+    previous_customer_id = ticket.customer_id
+
     for key, value in ticket_data.items():
         setattr(ticket, key, value)
 
-    db.session.commit()
-    cache.clear()
-    return ticket_schema.jsonify(ticket), 200
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
+
+    invalidate_ticket(ticket.id, ticket.customer_id, f"customer:{previous_customer_id}:tickets")
+    if "service_date" in ticket_data:
+        leaderboard.reset()
+    response = ticket_schema.jsonify(ticket)
+    response.set_etag(etag_for(*ticket_version(ticket_id)))
+    return response, 200
 
 @tickets_bp.route("/<int:ticket_id>", methods=["DELETE"])
 def delete_ticket(ticket_id: int):
@@ -85,9 +457,15 @@ def delete_ticket(ticket_id: int):
     if not ticket:
         return jsonify({"error": "Ticket not found."}), 404
 
+    customer_id = ticket.customer_id
+
+    mechanic_ids = [m.id for m in ticket.mechanics]
+
     db.session.delete(ticket)
     db.session.commit()
-    cache.clear()
+    invalidate_ticket(ticket_id, customer_id)
+    if mechanic_ids:
+        leaderboard.reset()
     return jsonify({"message": f"Ticket: {ticket_id} deleted successfully."}), 200
 
 # ---- Many-to-Many: Assign / remove mechanics ----
@@ -105,17 +483,26 @@ def assign_mechanic_to_ticket(ticket_id: int, mechanic_id: int):
     if not ticket:
         return jsonify({"error": "Ticket not found."}), 404
 
-    mechanic = db.session.get(Mechanic, mechanic_id)
-    if not mechanic:
+    if mechanics_snapshot.get(mechanic_id) is None:
         return jsonify({"error": "Mechanic not found."}), 404
 
-    if mechanic in ticket.mechanics:
+    failed = precondition_failed(ticket_version(ticket_id))
+    if failed:
+        return failed
+
+    # Idempotent upsert on the association row; the ticket's mechanics are never loaded.
+    if not link(service_mechanics, ticket_id=ticket_id, mechanic_id=mechanic_id):
         return jsonify({"message": "Mechanic already assigned.", "ticket_id": ticket.id}), 200
 
-    ticket.mechanics.append(mechanic)
-    db.session.commit()
-    cache.clear()
-    return ticket_schema.jsonify(ticket), 200
+    touch(ticket)
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
+
+    invalidate_ticket(ticket.id, ticket.customer_id, f"mechanic:{mechanic_id}")
+    leaderboard.reset()
+    return json_response(ticket_view(ticket_id))
 
 
 @tickets_bp.route("/<int:ticket_id>/remove-mechanic/<int:mechanic_id>", methods=["PUT"])
@@ -131,20 +518,34 @@ def remove_mechanic_from_ticket(ticket_id: int, mechanic_id: int):
     if not ticket:
         return jsonify({"error": "Ticket not found."}), 404
 
-    mechanic = db.session.get(Mechanic, mechanic_id)
-    if not mechanic:
+    if mechanics_snapshot.get(mechanic_id) is None:
         return jsonify({"error": "Mechanic not found."}), 404
 
-    if mechanic not in ticket.mechanics:
+    failed = precondition_failed(ticket_version(ticket_id))
+    if failed:
+        return failed
+
+    if not unlink(service_mechanics, ticket_id=ticket_id, mechanic_id=mechanic_id):
         return jsonify({"error": "Mechanic not assigned to this ticket."}), 400
 
-    ticket.mechanics.remove(mechanic)
-    db.session.commit()
-    cache.clear()
+    remaining_mechanic_ids = db.session.execute(
+        select(service_mechanics.c.mechanic_id)
+        .where(service_mechanics.c.ticket_id == ticket_id)
+        .order_by(service_mechanics.c.mechanic_id)
+    ).scalars().all()
+
+    touch(ticket)
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
+
+    invalidate_ticket(ticket.id, ticket.customer_id, f"mechanic:{mechanic_id}")
+    leaderboard.reset()
     return jsonify({
         "message": "Mechanic removed from ticket.",
         "ticket_id": ticket.id,
-        "remaining_mechanic_ids": [m.id for m in ticket.mechanics],
+        "remaining_mechanic_ids": remaining_mechanic_ids,
     }), 200
 
 @tickets_bp.route("/<int:ticket_id>/edit", methods=["PUT"])
@@ -152,12 +553,17 @@ def edit_ticket_mechanics(ticket_id: int):
     """
     Bulk add/remove mechanics on a ticket. No auth; shop can edit any ticket.
     Body: {"add_ids": [int, ...], "remove_ids": [int, ...]}.
+    Optional If-Match: ETag from GET; 412 if the ticket changed since.
     """
 
     ticket = db.session.get(ServiceTicket, ticket_id)
     if not ticket:
         return jsonify({"error": "Ticket not found."}), 404
 
+    failed = precondition_failed(ticket_version(ticket_id))
+    if failed:
+        return failed
+
     payload = request.get_json(silent=True) or {}
 
     add_ids = payload.get("add_ids", [])
@@ -170,51 +576,168 @@ def edit_ticket_mechanics(ticket_id: int):
         return jsonify({"error": "All ids in add_ids/remove_ids must be integers."}), 404
 
 
-    for mechanic_id in add_ids:
-        mechanic = db.session.get(Mechanic, mechanic_id)
-        if not mechanic:
+    # Every referenced mechanic is resolved from the in-process snapshot at once.
+    found = mechanics_snapshot.get_many(add_ids + remove_ids)
+    for mechanic_id in add_ids + remove_ids:
+        if mechanic_id not in found:
             return jsonify({"error": f"Mechanic {mechanic_id} not found."}), 404
 
-        if mechanic not in ticket.mechanics:
-            ticket.mechanics.append(mechanic)
+    assigned = set(db.session.execute(
+        select(service_mechanics.c.mechanic_id).where(service_mechanics.c.ticket_id == ticket_id)
+    ).scalars())
 
+    # Adds apply before removes, so an id in both lists ends up removed.
+    after_adds = assigned | set(add_ids)
     for mechanic_id in remove_ids:
-        mechanic = db.session.get(Mechanic, mechanic_id)
-        if not mechanic:
-            return jsonify({"error": f"Mechanic {mechanic_id} not found."}), 404
-
-        if mechanic not in ticket.mechanics:
+        if mechanic_id not in after_adds:
             return jsonify({"error": f"Mechanic {mechanic_id} is not assigned to this ticket."}), 400
-        
-        ticket.mechanics.remove(mechanic)
-
-    db.session.commit()
 
-    cache.clear()
+    final = after_adds - set(remove_ids)
+    added = sorted(final - assigned)
+    removed = sorted(assigned - final)
+
+    # Association rows are written directly; link_all() skips rows a concurrent
+    # assign already inserted instead of failing on the primary key.
+    link_all(service_mechanics, [{"ticket_id": ticket_id, "mechanic_id": mechanic_id} for mechanic_id in added])
+    if removed:
+        db.session.execute(
+            delete(service_mechanics).where(
+                service_mechanics.c.ticket_id == ticket_id,
+                service_mechanics.c.mechanic_id.in_(removed),
+            )
+        )
+
+    customer_id = ticket.customer_id
+    if added or removed:
+        touch(ticket)
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
+
+    invalidate_ticket(
+        ticket_id,
+        customer_id,
+        *[f"mechanic:{mechanic_id}" for mechanic_id in added + removed],
+    )
+    if added or removed:
+        leaderboard.reset()
 
     return jsonify({
         "message": "Ticket mechanics updated successfully.",
-        "ticket_id": ticket.id,
-        "mechanic_ids": [m.id for m in ticket.mechanics]
+        "ticket_id": ticket_id,
+        "mechanic_ids": sorted(final)
     }), 200
 
 @tickets_bp.route("/<int:ticket_id>/add-part/<int:part_id>", methods=["PUT"])
 def add_part_to_ticket(ticket_id: int, part_id: int):
     """
-    Add an inventory part to a ticket. No auth; shop can add parts to any ticket.
+    Add an inventory part to a ticket as a line item. No auth; shop can add parts to any ticket.
+    Optional body: {"quantity": int (default 1), "unit_price": float (default the part's
+    current price)}. The price is stored on the line, so later catalogue changes do
+    not alter the ticket. Updates the ticket's parts_total.
     """
     ticket = db.session.get(ServiceTicket, ticket_id)
     if not ticket:
         return jsonify({"error": "Ticket not found."}), 404
 
-    part = db.session.get(Inventory, part_id)
-    if not part:
+    part = parts_snapshot.get(part_id)
+    if part is None:
         return jsonify({"error": "Part not found."}), 404
 
-    if part in ticket.parts:
+    failed = precondition_failed(ticket_version(ticket_id))
+    if failed:
+        return failed
+
+    try:
+        line = line_item_schema.load(request.get_json(silent=True) or {})
+    except ValidationError as e:
+        return jsonify(e.messages), 400
+
+    values = {"quantity": line.get("quantity", 1), "unit_price": line.get("unit_price", part.price)}
+    if not link(service_ticket_inventory, values, ticket_id=ticket_id, inventory_id=part_id):
         return jsonify({"message": "Part already added to ticket."}), 200
 
-    ticket.parts.append(part)
-    db.session.commit()
+    touch(ticket)
+    billing.refresh_parts_total(ticket)
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
+
+    invalidate_ticket(ticket.id, ticket.customer_id, f"part:{part_id}")
+
+    return json_response(ticket_view(ticket_id))
+
+@tickets_bp.route("/<int:ticket_id>/parts/<int:part_id>", methods=["PUT"])
+def update_ticket_part(ticket_id: int, part_id: int):
+    """
+    Change the quantity and/or unit price of a part already on a ticket.
+    Body: {"quantity": int, "unit_price": float} (either or both).
+    Optional If-Match: ETag from GET; 412 if the ticket changed since.
+    Returns the ticket's invoice with the recomputed parts_total.
+    """
+    ticket = db.session.get(ServiceTicket, ticket_id)
+    if not ticket:
+        return jsonify({"error": "Ticket not found."}), 404
+
+    failed = precondition_failed(ticket_version(ticket_id))
+    if failed:
+        return failed
+
+    try:
+        line = line_item_schema.load(request.get_json(silent=True) or {})
+    except ValidationError as e:
+        return jsonify(e.messages), 400
+    if not line:
+        return jsonify({"error": "Provide quantity and/or unit_price."}), 400
+
+    updated = db.session.execute(
+        update(service_ticket_inventory)
+        .where(
+            service_ticket_inventory.c.ticket_id == ticket_id,
+            service_ticket_inventory.c.inventory_id == part_id,
+        )
+        .values(**line)
+    ).rowcount
+    if not updated:
+        db.session.rollback()
+        return jsonify({"error": "Part not on this ticket."}), 404
+
+    touch(ticket)
+    billing.refresh_parts_total(ticket)
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
+
+    invalidate_ticket(ticket.id, ticket.customer_id, f"part:{part_id}")
+    return jsonify(billing.invoice(ticket)), 200
+
+@tickets_bp.route("/<int:ticket_id>/remove-part/<int:part_id>", methods=["PUT"])
+def remove_part_from_ticket(ticket_id: int, part_id: int):
+    """
+    Remove a part (its whole line item) from a ticket and update parts_total.
+    Optional If-Match: ETag from GET; 412 if the ticket changed since.
+    Returns the ticket's invoice.
+    """
+    ticket = db.session.get(ServiceTicket, ticket_id)
+    if not ticket:
+        return jsonify({"error": "Ticket not found."}), 404
+
+    failed = precondition_failed(ticket_version(ticket_id))
+    if failed:
+        return failed
+
+    if not unlink(service_ticket_inventory, ticket_id=ticket_id, inventory_id=part_id):
+        return jsonify({"error": "Part not on this ticket."}), 400
+
+    touch(ticket)
+    billing.refresh_parts_total(ticket)
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return conflict()
 
-    return ticket_schema.jsonify(ticket), 200
\ No newline at end of file
+    invalidate_ticket(ticket.id, ticket.customer_id, f"part:{part_id}")
+    return jsonify(billing.invoice(ticket)), 200
@@ -1,23 +1,42 @@
 """Marshmallow schemas for the Service Ticket resource."""
-from marshmallow import fields
+from marshmallow import fields, validate
 from application.extensions import ma
 from application.models.service_ticket import ServiceTicket
 from application.blueprints.mechanics.schemas import MechanicSchema
 from application.schemas.inventory_schema import InventorySchema
+from application.utils.serializer import CompiledSchema
 
 
 class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = ServiceTicket
         load_instance = False
+        exclude = ("version",)  # exposed as the ETag header instead
 
+    id = fields.Int(dump_only=True)  # assigned by the database
     VIN = fields.Str(required=True)
-    service_date = fields.Str(required=True)
+    service_date = fields.Date(required=True)
     service_desc = fields.Str(required=True)
     customer_id = fields.Int(required=True)
+    parts_total = fields.Float(dump_only=True)  # maintained from the line items
     mechanics = fields.Nested(MechanicSchema, many=True, dump_only=True)
     parts = fields.Nested(InventorySchema, many=True, dump_only=True)
 
 
+class LineItemSchema(ma.Schema):
+    """
+    Body of add-part / PUT .../parts/<part_id>: how many, and at what unit price
+    (add-part defaults to 1 at the part's current price).
+    """
+    quantity = fields.Int(validate=validate.Range(min=1))
+    unit_price = fields.Float(validate=validate.Range(min=0))
+
+
 ticket_schema = ServiceTicketSchema()
 tickets_schema = ServiceTicketSchema(many=True)
+line_item_schema = LineItemSchema()
+
+# Fast path for list endpoints: tuple rows in, the same dicts as tickets_schema.dump() out.
+# Its views back ?fields= / ?expand=: "mechanic_ids" / "part_ids" stand in for
+# the nested objects unless they are expanded.
+tickets_compiled = CompiledSchema(ticket_schema, id_lists={"mechanic_ids": "mechanics", "part_ids": "parts"})
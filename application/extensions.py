@@ -1,23 +1,34 @@
 # application/extensions.py
 # Declare extensions once. Do NOT bind them to an app here.
 
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_caching import Cache
 from flask_migrate import Migrate
 
+from application.utils.tagged_cache import TaggedCache
+from application.utils.token_cache import TokenCache
+
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["100 per day", "10 per hour"]
 )
 
-cache = Cache(config={
-    "CACHE_TYPE": "SimpleCache",
-    "CACHE_DEFAULT_TIMEOUT": 60
-})
+# Backend (SimpleCache / RedisCache) comes from app config; see BaseConfig.CACHE_TYPE.
+cache = Cache()
+
+# Tag-aware view cache; writes invalidate resource tags instead of cache.clear().
+tagged_cache = TaggedCache(cache)
+
+# Verified JWTs and revoked jtis, so token_required skips re-verifying signatures.
+token_cache = TokenCache(cache)
 
 class Base(DeclarativeBase):
     """Base class for all models"""
@@ -25,6 +36,14 @@ class Base(DeclarativeBase):
 
 db = SQLAlchemy(model_class=Base)
 
+@event.listens_for(Engine, "connect")
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite ignores ON DELETE CASCADE unless foreign keys are switched on per connection."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 ma = Marshmallow()
 
 migrate = Migrate()
\ No newline at end of file
@@ -4,4 +4,7 @@
 from application.models.customer import Customer 
 from application.models.service_ticket import ServiceTicket
 from application.models.mechanic import Mechanic
-from application.models.inventory import Inventory
\ No newline at end of file
+from application.models.inventory import Inventory
+from application.models.refresh_token import RefreshToken
+from application.models.search import SEARCH_SOURCES  # search indexes (DDL hooks)
+from application.models.snapshots import mechanics_snapshot, parts_snapshot  # write hooks
@@ -0,0 +1,76 @@
+# application/models/associations.py
+# Direct reads/writes on the many-to-many association tables
+# (service_mechanics, service_ticket_inventory) without loading ORM collections.
+
+from sqlalchemy import select, insert, delete, literal
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from application.extensions import db
+
+
+def _where(table, key: dict):
+    return [table.c[column] == value for column, value in key.items()]
+
+
+def is_linked(table, **key) -> bool:
+    """
+    Primary-key existence check, e.g. is_linked(service_mechanics, ticket_id=1, mechanic_id=2).
+    """
+    query = select(literal(1)).select_from(table).where(*_where(table, key)).limit(1)
+    return db.session.execute(query).first() is not None
+
+
+def _insert_ignore(table, dialect: str):
+    """
+    INSERT that skips rows whose key already exists, or None if the dialect
+    has no such form.
+    """
+    if dialect == "postgresql":
+        return postgresql_insert(table).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing()
+    if dialect in ("mysql", "mariadb"):
+        return insert(table).prefix_with("IGNORE")
+    return None
+
+
+def link(table, values=None, **key) -> bool:
+    """
+    Insert an association row unless it already exists (idempotent).
+    values: extra (non-key) columns for the new row, e.g. a line item's quantity.
+    Returns True if a row was inserted, False if it was already there.
+
+    Uses INSERT ... ON CONFLICT DO NOTHING on PostgreSQL/SQLite and INSERT IGNORE
+    on MySQL, so concurrent calls never raise a duplicate-key error.
+    """
+    row = {**key, **(values or {})}
+    stmt = _insert_ignore(table, db.session.get_bind().dialect.name)
+    if stmt is None:
+        if is_linked(table, **key):
+            return False
+        stmt = insert(table)
+
+    return db.session.execute(stmt.values(**row)).rowcount == 1
+
+
+def link_all(table, rows: list) -> None:
+    """
+    link() for many rows in one executemany, e.g.
+    link_all(service_mechanics, [{"ticket_id": 1, "mechanic_id": 2}, ...]).
+    """
+    if not rows:
+        return
+    stmt = _insert_ignore(table, db.session.get_bind().dialect.name)
+    if stmt is None:
+        for row in rows:
+            link(table, **row)
+        return
+    db.session.execute(stmt, rows)
+
+
+def unlink(table, **key) -> bool:
+    """
+    Delete an association row. Returns True if a row was deleted.
+    """
+    return db.session.execute(delete(table).where(*_where(table, key))).rowcount == 1
@@ -4,33 +4,49 @@ from typing import List, Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from application.extensions import db, Base
 
-from werkzeug.security import generate_password_hash, check_password_hash
+from application.utils.passwords import hash_password, verify_password
 
 class Customer(Base):
     __tablename__ = "customers"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    name: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    name: Mapped[str] = mapped_column(db.String(255), nullable=False, index=True)
     email: Mapped[str] = mapped_column(db.String(255), nullable=False, unique=True)
     phone: Mapped[Optional[str]] = mapped_column(db.String(50))
 
     password_hash: Mapped[str] = mapped_column(db.String(255), nullable=False)
 
-    # 1-to-Many: Customer -> ServiceTicket (cascade delete so tickets are removed when customer is deleted)
+    # Row version: bumped on every UPDATE, which is also guarded by it
+    # (optimistic concurrency). Feeds the resource's ETag.
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+
+    # 1-to-Many: Customer -> ServiceTicket (cascade delete so tickets are removed when customer is deleted).
+    # passive_deletes: the database's ON DELETE CASCADE removes the tickets in the same
+    # DELETE statement instead of the ORM loading and deleting them one by one.
     service_tickets: Mapped[List["ServiceTicket"]] = relationship(
         back_populates="customer",
         cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    refresh_tokens: Mapped[List["RefreshToken"]] = relationship(
+        back_populates="customer",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def set_password(self, plain_password: str) -> None:
         """
         Convert a plain password into a secure hash and store it.
+        Runs on the hashing pool; raises HashingBusy when it is saturated.
         """
-        self.password_hash = generate_password_hash(plain_password)
+        self.password_hash = hash_password(plain_password)
 
     def check_password(self, plain_password: str) -> bool:
         """
         Check a plain password against the stored hash.
         Returns True if correct, False otherwise.
+        Runs on the hashing pool; raises HashingBusy when it is saturated.
         """
-        return check_password_hash(self.password_hash, plain_password)
\ No newline at end of file
+        return verify_password(self.password_hash, plain_password)
\ No newline at end of file
@@ -5,11 +5,18 @@ from typing import List
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from application.extensions import db, Base
 
+# A ticket's line items: which parts, how many, and at what price. unit_price
+# is copied from Inventory.price when the part is added, so later catalogue
+# price changes do not rewrite old tickets.
 service_ticket_inventory = db.Table(
     "service_ticket_inventory",
     Base.metadata,
-    db.Column("ticket_id", db.ForeignKey("service_tickets.id"), primary_key=True),
-    db.Column("inventory_id", db.ForeignKey("inventory.id"), primary_key=True),
+    db.Column("ticket_id", db.ForeignKey("service_tickets.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("inventory_id", db.ForeignKey("inventory.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("quantity", db.Integer, nullable=False, default=1, server_default="1"),
+    db.Column("unit_price", db.Float, nullable=False, default=0.0, server_default="0"),
+    # The PK (ticket_id, inventory_id) serves ticket -> parts; this serves part -> tickets.
+    db.Index("ix_service_ticket_inventory_inventory_id", "inventory_id"),
 )
 
 class Inventory(Base):
@@ -24,7 +31,13 @@ class Inventory(Base):
 
     price: Mapped[float] = mapped_column(db.Float, nullable=False, default=0.0)
 
+    # Row version: bumped on every UPDATE, which is also guarded by it
+    # (optimistic concurrency). Feeds the resource's ETag.
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+
     service_tickets: Mapped[List["ServiceTicket"]] = relationship(
         secondary=service_ticket_inventory,
-        back_populates="parts"
+        back_populates="parts",
+        passive_deletes=True,
     )
\ No newline at end of file
@@ -7,12 +7,18 @@ class Mechanic(Base):
     __tablename__ = "mechanics"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    name: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    name: Mapped[str] = mapped_column(db.String(255), nullable=False, index=True)
     email: Mapped[str] = mapped_column(db.String(255), nullable=False, unique=True)
     phone: Mapped[Optional[str]] = mapped_column(db.String(50))
     salary: Mapped[float] = mapped_column(db.Float, nullable=False, default=0.0)
 
+    # Row version: bumped on every UPDATE, which is also guarded by it
+    # (optimistic concurrency). Feeds the resource's ETag.
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+
     service_tickets: Mapped[List["ServiceTicket"]] = relationship(
         secondary=service_mechanics,
         back_populates="mechanics",
+        passive_deletes=True,
     )
\ No newline at end of file
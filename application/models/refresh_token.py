@@ -0,0 +1,29 @@
+# application/models/refresh_token.py
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from application.extensions import db, Base
+
+class RefreshToken(Base):
+    """
+    Server-side record of an issued refresh token. Only the sha256 of the token
+    is stored, so a leaked table cannot be replayed.
+
+    Tokens rotate: each use revokes the row and issues a new one in the same
+    family. Presenting an already-rotated token means it was copied, so the
+    whole family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    customer_id: Mapped[int] = mapped_column(
+        ForeignKey("customers.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    token_hash: Mapped[str] = mapped_column(db.String(64), nullable=False, unique=True)
+    family_id: Mapped[str] = mapped_column(db.String(32), nullable=False, index=True)
+    expires_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False)
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
+
+    customer: Mapped["Customer"] = relationship(back_populates="refresh_tokens")
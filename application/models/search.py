@@ -0,0 +1,109 @@
+# application/models/search.py
+# Database-side search indexes, kept current by the database itself:
+# - GET /search/: pg_trgm GIN indexes on PostgreSQL, FTS5 trigram tables on
+#   SQLite. Other databases use the in-process n-gram index in
+#   application/blueprints/search/index.py.
+# - GET /service-tickets/search: a tsvector GIN index on PostgreSQL, an FTS5
+#   (porter-stemmed words) table on SQLite.
+
+from sqlalchemy import DDL, event, func
+
+from application.extensions import db, Base
+from application.models.customer import Customer
+from application.models.inventory import Inventory
+from application.models.service_ticket import ServiceTicket
+
+# search kind -> (model, searchable columns)
+SEARCH_SOURCES = {
+    "customers": (Customer, ("name", "phone")),
+    "parts": (Inventory, ("name",)),
+    "tickets": (ServiceTicket, ("VIN",)),
+}
+
+# Trigram GIN indexes serve ILIKE '%q%' and the similarity operator (%).
+for _model, _columns in SEARCH_SOURCES.values():
+    for _column in _columns:
+        db.Index(
+            f"ix_{_model.__tablename__}_{_column}_trgm",
+            getattr(_model, _column),
+            postgresql_using="gin",
+            postgresql_ops={_column: "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql")
+
+
+# Full-text search over ticket descriptions. The query must use the same
+# configuration as the index expression for PostgreSQL to use the index.
+TEXT_SEARCH_CONFIG = "english"
+DESC_FTS_TABLE = "service_desc_search"
+
+db.Index(
+    "ix_service_tickets_service_desc_fts",
+    func.to_tsvector(TEXT_SEARCH_CONFIG, ServiceTicket.service_desc),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+
+def fts_table(table: str) -> str:
+    return f"{table}_search"
+
+
+# FTS5 virtual tables and their shadow tables (<name>_data, <name>_idx, ...).
+FTS_TABLES = [fts_table(model.__tablename__) for model, _ in SEARCH_SOURCES.values()] + [DESC_FTS_TABLE]
+
+
+def sqlite_fts_ddl(table: str, columns, fts=None, tokenize="trigram") -> list:
+    """
+    External-content FTS5 table over table(columns), plus the triggers that
+    keep it in sync on every insert/update/delete. The text itself is not
+    stored twice. The default trigram tokenizer gives case-insensitive
+    substring matching; "porter unicode61" gives stemmed word matching.
+    """
+    fts = fts or fts_table(table)
+    cols = ", ".join(f'"{c}"' for c in columns)
+    new = ", ".join(f'new."{c}"' for c in columns)
+    old = ", ".join(f'old."{c}"' for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', content_rowid='id', tokenize='{tokenize}')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def sqlite_has_trigram(connection) -> bool:
+    """
+    The FTS5 trigram tokenizer needs SQLite 3.34+.
+    """
+    return connection.dialect.dbapi.sqlite_version_info >= (3, 34, 0)
+
+
+event.listen(
+    Base.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_sqlite_fts(target, connection, **kw):
+    if connection.dialect.name != "sqlite" or not sqlite_has_trigram(connection):
+        return
+    statements = [
+        statement
+        for model, columns in SEARCH_SOURCES.values()
+        for statement in sqlite_fts_ddl(model.__tablename__, columns)
+    ]
+    statements += sqlite_fts_ddl("service_tickets", ["service_desc"], DESC_FTS_TABLE, "porter unicode61")
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_sqlite_fts(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    for fts in FTS_TABLES:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {fts}")
@@ -1,6 +1,7 @@
 # application/models/service_ticket.py
 # Service Ticket model + the many-to-many table lives here.
 
+from datetime import date
 from typing import List
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from application.extensions import db, Base
@@ -9,23 +10,41 @@ from application.models.inventory import service_ticket_inventory
 service_mechanics = db.Table(
     "service_mechanics",
     Base.metadata,
-    db.Column("ticket_id", db.ForeignKey("service_tickets.id"), primary_key=True),
-    db.Column("mechanic_id", db.ForeignKey("mechanics.id"), primary_key=True)
+    db.Column("ticket_id", db.ForeignKey("service_tickets.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("mechanic_id", db.ForeignKey("mechanics.id", ondelete="CASCADE"), primary_key=True),
+    # The PK (ticket_id, mechanic_id) serves ticket -> mechanics; this serves mechanic -> tickets.
+    db.Index("ix_service_mechanics_mechanic_id", "mechanic_id"),
 )
 
 class ServiceTicket(Base):
     __tablename__ = "service_tickets"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    VIN: Mapped[str] = mapped_column(db.String(50), nullable=False)
-    service_date: Mapped[str] = mapped_column(db.String(50), nullable=False)
+    VIN: Mapped[str] = mapped_column(db.String(50), nullable=False, index=True)
+    service_date: Mapped[date] = mapped_column(db.Date, nullable=False, index=True)
     service_desc: Mapped[str] = mapped_column(db.String(255), nullable=False)
 
-    customer_id: Mapped[int] = mapped_column(db.ForeignKey("customers.id"), nullable=False)
+    customer_id: Mapped[int] = mapped_column(
+        db.ForeignKey("customers.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+    # Sum of quantity * unit_price over the ticket's line items, rounded to
+    # cents. Recomputed whenever a line item is written (see
+    # application/blueprints/tickets/billing.py); indexed for sorting and revenue.
+    parts_total: Mapped[float] = mapped_column(
+        db.Float, nullable=False, default=0.0, server_default="0", index=True
+    )
 
+    # Row version: bumped on every UPDATE (and by touch() when mechanics/parts
+    # change), and guards the UPDATE (optimistic concurrency). Feeds the ETag.
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+
+    # Association rows are removed by ON DELETE CASCADE, so deleting a ticket never loads them.
     parts: Mapped[List["Inventory"]] = relationship(
         secondary=service_ticket_inventory,
         back_populates="service_tickets",
+        passive_deletes=True,
     )
 
     # "Customer" is declared in customer.py, but we can still refer to it by string.
@@ -34,6 +53,5 @@ class ServiceTicket(Base):
     mechanics: Mapped[List["Mechanic"]] = relationship(
         secondary=service_mechanics,
         back_populates="service_tickets",
-
-    
+        passive_deletes=True,
     )
\ No newline at end of file
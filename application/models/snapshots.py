@@ -0,0 +1,21 @@
+# application/models/snapshots.py
+# In-process snapshots of the mechanics and inventory tables (see
+# application/utils/snapshot.py): existence checks on ticket routes and the
+# mechanic / part list pages are answered from memory.
+
+from application.extensions import cache
+from application.models.inventory import Inventory
+from application.models.mechanic import Mechanic
+from application.utils.snapshot import Record, TableSnapshot
+
+
+class MechanicRecord(Record):
+    __slots__ = ("id", "name", "email", "phone", "salary", "version")
+
+
+class PartRecord(Record):
+    __slots__ = ("id", "name", "price", "version")
+
+
+mechanics_snapshot = TableSnapshot(cache, Mechanic, MechanicRecord, unique=("email",))
+parts_snapshot = TableSnapshot(cache, Inventory, PartRecord, unique=("name",))
@@ -3,12 +3,13 @@
 from marshmallow import fields
 from application.extensions import ma
 from application.models.customer import Customer
+from application.utils.serializer import CompiledSchema
 
 class CustomerSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Customer
         load_instance = False
-        exclude = ("password_hash",)  # Never accept or expose; use password + set_password()
+        exclude = ("password_hash", "version")  # Never accept or expose; use password + set_password()
 
     name = fields.Str(required=True)
     email = fields.Email(required=True)
@@ -18,6 +19,7 @@ class CustomerSchema(ma.SQLAlchemyAutoSchema):
 
 customer_schema = CustomerSchema()
 customers_schema = CustomerSchema(many=True)
+customers_compiled = CompiledSchema(customer_schema)
 
 class CustomerLoginSchema(ma.Schema):
     """
@@ -26,4 +28,12 @@ class CustomerLoginSchema(ma.Schema):
     email = fields.Email(required=True)
     password = fields.Str(required=True, load_only=True)
 
-login_schema = CustomerLoginSchema()
\ No newline at end of file
+login_schema = CustomerLoginSchema()
+
+class RefreshTokenSchema(ma.Schema):
+    """
+    Schema used only for refresh payload validation.
+    """
+    refresh_token = fields.Str(required=True, load_only=True)
+
+refresh_schema = RefreshTokenSchema()
\ No newline at end of file
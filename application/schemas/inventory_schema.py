@@ -4,14 +4,17 @@
 from marshmallow import fields
 from application.extensions import ma
 from application.models.inventory import Inventory
+from application.utils.serializer import CompiledSchema
 
 class InventorySchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Inventory
         load_instance = False
+        exclude = ("version",)  # exposed as the ETag header instead
 
     name = fields.Str(required=True)
     price = fields.Float(required=True)
 
 inventory_schema = InventorySchema()
-inventories_schema = InventorySchema(many=True)
\ No newline at end of file
+inventories_schema = InventorySchema(many=True)
+inventories_compiled = CompiledSchema(inventory_schema)
\ No newline at end of file
@@ -8,7 +8,7 @@ class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
         load_instance = False
 
     VIN = fields.Str(required=True)
-    service_date = fields.Str(required=True)
+    service_date = fields.Date(required=True)
     service_desc = fields.Str(required=True)
     customer_id = fields.Int(required=True)
 
@@ -0,0 +1,122 @@
+# application/utils/conditional.py
+# Version-based ETags: conditional GET (If-None-Match) and optimistic
+# concurrency on PUT (If-Match).
+
+import hashlib
+from functools import wraps
+
+from flask import Response, jsonify, make_response, request
+from sqlalchemy import func, select
+
+from application.extensions import db
+
+
+def etag_for(*parts) -> str:
+    """
+    Opaque ETag for a tuple of version components.
+    """
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def aggregate_version(model, *criteria) -> list:
+    """
+    Scalar subqueries that change whenever any matching row is inserted,
+    updated or deleted: (count, max id, sum of row versions).
+    Pass several of these to table_versions() to read them in one round trip.
+    """
+    def scalar(expression):
+        query = select(expression).select_from(model)
+        if criteria:
+            query = query.where(*criteria)
+        return query.scalar_subquery()
+
+    return [
+        scalar(func.count()),
+        scalar(func.max(model.id)),
+        scalar(func.coalesce(func.sum(model.version), 0)),
+    ]
+
+
+def table_versions(*aggregates) -> tuple:
+    """
+    Run the aggregate_version() subqueries in one SELECT and return the values.
+    Collection views add request.full_path, since each page is its own resource.
+    """
+    columns = [column for aggregate in aggregates for column in aggregate]
+    return tuple(db.session.execute(select(*columns)).one())
+
+
+def row_version(model, row_id: int):
+    """
+    (table, id, version) of one row, or None if it does not exist.
+    """
+    version = db.session.execute(select(model.version).where(model.id == row_id)).scalar()
+    if version is None:
+        return None
+    return (model.__tablename__, row_id, version)
+
+
+def instance_version(instance) -> tuple:
+    """
+    Same tuple as row_version() for a row that is already loaded.
+    """
+    return (instance.__tablename__, instance.id, instance.version)
+
+
+def touch(instance) -> None:
+    """
+    Bump a row's version for a change the ORM cannot see on the row itself
+    (e.g. association rows written with core insert/delete).
+    """
+    instance.version = instance.version + 1
+
+
+def conditional(version_func):
+    """
+    Attach a version-based ETag to a GET view's 200 responses.
+
+    version_func receives the view's arguments and returns a cheap version
+    tuple (see row_version / table_versions), or None when the resource does
+    not exist. If the client's If-None-Match matches, answer 304 before the
+    view runs, so nothing is loaded or serialized.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = version_func(*args, **kwargs)
+            if version is None:
+                return view(*args, **kwargs)
+
+            etag = etag_for(*version)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def precondition_failed(version):
+    """
+    412 response if the request carries an If-Match that does not match the
+    resource's current version; None if the write may go ahead.
+    """
+    if request.if_match and not request.if_match.contains(etag_for(*version)):
+        return jsonify({"error": "Resource has changed; fetch it again and retry."}), 412
+    return None
+
+
+def conflict():
+    """
+    412 for a write that lost a race: the row's version changed between our
+    read and our UPDATE (SQLAlchemy raised StaleDataError).
+    """
+    db.session.rollback()
+    return jsonify({"error": "Resource has changed; fetch it again and retry."}), 412
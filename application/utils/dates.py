@@ -0,0 +1,26 @@
+# application/utils/dates.py
+# Query-string date window helpers (?from=YYYY-MM-DD&to=YYYY-MM-DD).
+
+from datetime import date
+
+
+def date_range(args) -> tuple:
+    """
+    Read ?from= and ?to= (inclusive, ISO YYYY-MM-DD) from the query string.
+    Either may be omitted (None). Raises ValueError with a client-safe message.
+    """
+    bounds = []
+    for name in ("from", "to"):
+        value = args.get(name)
+        if value:
+            try:
+                value = date.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"Invalid '{name}' date. Use YYYY-MM-DD.")
+        bounds.append(value or None)
+
+    date_from, date_to = bounds
+    if date_from and date_to and date_from > date_to:
+        raise ValueError("'from' must not be after 'to'.")
+
+    return date_from, date_to
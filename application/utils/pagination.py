@@ -0,0 +1,331 @@
+# application/utils/pagination.py
+# Shared list toolkit for collection endpoints: keyset (cursor) pagination,
+# whitelisted sorts, prefix filters and an optional (approximate) total.
+
+import base64
+import json
+from datetime import date
+
+from flask import current_app
+from sqlalchemy import func, select, text, tuple_
+
+from application.extensions import db
+
+
+class PaginationError(ValueError):
+    """
+    Raised when the limit or cursor query parameters are invalid.
+    The message is safe to return to the client.
+    """
+
+
+def encode_cursor(position: dict) -> str:
+    """
+    Turn the sort position of the last row on a page into an opaque cursor
+    string. Clients pass it back unchanged as ?cursor=... to get the next page.
+    """
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Reverse of encode_cursor(). Raises PaginationError for anything we did not issue.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        data["id"] = int(data["id"])
+        return data
+    except (ValueError, KeyError, TypeError):
+        raise PaginationError("Invalid cursor.")
+
+
+def page_limit(args) -> int:
+    """
+    Read ?limit= from the query string.
+    Defaults to DEFAULT_PAGE_SIZE and may not exceed MAX_PAGE_SIZE (both from config).
+    """
+    default = current_app.config["DEFAULT_PAGE_SIZE"]
+    ceiling = current_app.config["MAX_PAGE_SIZE"]
+
+    limit = args.get("limit", default=default, type=int)
+
+    if limit < 1:
+        raise PaginationError("Limit must be at least 1.")
+
+    if limit > ceiling:
+        raise PaginationError(f"Limit cannot be greater than {ceiling}.")
+
+    return limit
+
+
+def estimated_rows(table_name: str):
+    """
+    Planner statistics row count for a whole table (PostgreSQL, MySQL), or None
+    where the dialect keeps none or the table was never analyzed.
+    """
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        query = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+    elif dialect in ("mysql", "mariadb"):
+        query = text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+        )
+    else:
+        return None
+
+    estimate = db.session.execute(query, {"table": table_name}).scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _same(value):
+    return value
+
+
+def _fold(value):
+    return value.casefold() if isinstance(value, str) else value
+
+
+def _ascii_lower(value):
+    return value.translate(_ASCII_LOWER) if isinstance(value, str) else value
+
+
+# How each database compares text under its default collations, as
+# (prefix filter key, sort key), so page_records() matches page() on it:
+# - sqlite: LIKE ignores ASCII case only; ORDER BY is binary (code points)
+# - mysql/mariadb: the default *_ci collations ignore case for both
+# - postgresql and others: LIKE is case-sensitive; ORDER BY is taken as the C
+#   collation (code points)
+TEXT_KEYS = {
+    "sqlite": (_ascii_lower, _same),
+    "mysql": (_fold, _fold),
+    "mariadb": (_fold, _fold),
+}
+
+
+def text_keys() -> tuple:
+    """
+    (filter key, sort key) functions for the current database; see TEXT_KEYS.
+    """
+    return TEXT_KEYS.get(db.session.get_bind().dialect.name, (_same, _same))
+
+
+class Page:
+    """
+    One page of a Listing: the rows plus what goes into the response envelope.
+    """
+
+    def __init__(self, rows, limit: int, next_cursor, total=None, total_exact=None):
+        self.rows = rows
+        self.limit = limit
+        self.next_cursor = next_cursor
+        self.total = total
+        self.total_exact = total_exact
+
+    def envelope(self, key: str, items: list) -> dict:
+        """
+        { key: items, "limit", "count", "next_cursor" } plus "total_count" and
+        "total_exact" when ?total= was requested.
+        """
+        payload = {"limit": self.limit, "count": len(items), "next_cursor": self.next_cursor, key: items}
+        if self.total is not None:
+            payload["total_count"] = self.total
+            payload["total_exact"] = self.total_exact
+        return payload
+
+
+class Listing:
+    """
+    What one collection endpoint lets clients page, sort and filter by.
+
+    - ?limit= / ?cursor=  keyset pagination: the cursor carries the last row's
+      sort value and id, so page N costs the same as page 1.
+    - ?sort=key / ?sort=-key  a whitelisted (indexed, non-null) column; ties
+      and the default order are by id.
+    - ?<key>=value  prefix filters (LIKE 'value%', served by the column's index).
+    - ?total=true  total matching rows: planner estimate for a query with no
+      WHERE clause where the database keeps one, else COUNT(*) capped at
+      TOTAL_COUNT_LIMIT (total_exact is false when it is not exact).
+    """
+
+    def __init__(self, id_column, sorts=None, prefix_filters=None):
+        self.id_column = id_column
+        self.sorts = {"id": id_column, **(sorts or {})}
+        self.prefix_filters = prefix_filters or {}
+
+    def _sort(self, args):
+        sort = args.get("sort", "id")
+        key = sort[1:] if sort.startswith("-") else sort
+        if key not in self.sorts:
+            raise PaginationError(f"Cannot sort by {key!r}; use one of: {', '.join(self.sorts)}.")
+        return sort, self.sorts[key], sort.startswith("-")
+
+    def filter(self, query, args):
+        """
+        Apply the prefix filters present in args.
+        """
+        for param, column in self.prefix_filters.items():
+            value = args.get(param)
+            if value:
+                query = query.where(column.startswith(value, autoescape=True))
+        return query
+
+    def _total(self, query) -> tuple:
+        # The estimate is for the whole table: only usable when nothing (our
+        # prefix filters or the caller's own where()s) narrows the query.
+        if query.whereclause is None:
+            estimate = estimated_rows(self.id_column.class_.__tablename__)
+            if estimate is not None:
+                return estimate, False
+
+        cap = current_app.config["TOTAL_COUNT_LIMIT"]
+        counted = select(func.count()).select_from(query.order_by(None).limit(cap + 1).subquery())
+        total = db.session.execute(counted).scalar()
+        return min(total, cap), total <= cap
+
+    def page(self, query, args, scalars=True) -> Page:
+        """
+        Filter, sort and paginate query (filters already applied by the caller
+        are kept). scalars=False returns tuple rows (for column selects) instead
+        of ORM objects; they must include a column labelled "id". If the sort
+        column is not selected it is appended to each row.
+
+        Fetches one extra row to know whether another page exists, so no
+        COUNT(*) runs unless ?total= asks for one. Raises PaginationError for
+        a bad limit, sort or cursor.
+        """
+        limit = page_limit(args)
+        sort, column, descending = self._sort(args)
+        query = self.filter(query, args)
+
+        total = total_exact = None
+        if args.get("total", "").lower() in ("1", "true"):
+            total, total_exact = self._total(query)
+
+        if not scalars and column.key not in query.selected_columns:
+            query = query.add_columns(column)
+
+        cursor = args.get("cursor")
+        if cursor:
+            position = decode_cursor(cursor)
+            if position.get("sort", "id") != sort:
+                raise PaginationError("Cursor does not match sort.")
+            query = query.where(self._after(column, position, descending))
+
+        if column is self.id_column:
+            order = [column.desc() if descending else column]
+        else:
+            order = [column.desc(), self.id_column.desc()] if descending else [column, self.id_column]
+        rows = self._fetch(query.order_by(*order).limit(limit + 1), scalars)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(self._position(rows[-1], sort, column))
+
+        return Page(rows, limit, next_cursor, total, total_exact)
+
+    def page_records(self, records, args) -> Page:
+        """
+        page() over an in-memory sequence of records in id order (objects with
+        the listed columns as attributes, e.g. TableSnapshot.records()). Same
+        parameters, cursors and envelope, and the same results: prefix filters
+        and sorts compare text the way the database does (text_keys()).
+        ?total= is exact.
+        """
+        limit = page_limit(args)
+        sort, column, descending = self._sort(args)
+        filter_key, sort_key = text_keys()
+
+        for param, filtered in self.prefix_filters.items():
+            value = args.get(param)
+            if value:
+                prefix = filter_key(value)
+                records = [r for r in records if filter_key(getattr(r, filtered.key) or "").startswith(prefix)]
+
+        total = total_exact = None
+        if args.get("total", "").lower() in ("1", "true"):
+            total, total_exact = len(records), True
+
+        if column is self.id_column:
+            key = lambda record: record.id
+        else:
+            key = lambda record: (sort_key(getattr(record, column.key)), record.id)
+            records = sorted(records, key=key)
+        if descending:
+            records = list(reversed(records))
+
+        cursor = args.get("cursor")
+        if cursor:
+            position = decode_cursor(cursor)
+            if position.get("sort", "id") != sort:
+                raise PaginationError("Cursor does not match sort.")
+            if column is self.id_column:
+                after = position["id"]
+            else:
+                after = (sort_key(self._cursor_value(column, position)), position["id"])
+            try:
+                records = [r for r in records if (key(r) < after if descending else key(r) > after)]
+            except TypeError:
+                raise PaginationError("Invalid cursor.")
+
+        rows = records[:limit + 1]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(self._position(rows[-1], sort, column))
+
+        return Page(rows, limit, next_cursor, total, total_exact)
+
+    @staticmethod
+    def _fetch(query, scalars):
+        result = db.session.execute(query)
+        return (result.scalars() if scalars else result).all()
+
+    def _position(self, row, sort: str, column) -> dict:
+        position = {"id": row.id}
+        if sort != "id":
+            position["sort"] = sort
+        if column is not self.id_column:
+            value = getattr(row, column.key)
+            position["value"] = value.isoformat() if isinstance(value, date) else value
+        return position
+
+    @staticmethod
+    def _cursor_value(column, position: dict):
+        """
+        The cursor's sort value as the column's Python type (dates travel as
+        ISO strings). Raises PaginationError for anything else.
+        """
+        value = position.get("value")
+        python_type = column.type.python_type
+        try:
+            if python_type is date:
+                value = date.fromisoformat(value)
+            elif python_type is float and type(value) is int:
+                value = float(value)
+        except (TypeError, ValueError):
+            raise PaginationError("Invalid cursor.")
+        if type(value) is not python_type:
+            raise PaginationError("Invalid cursor.")
+        return value
+
+    def _after(self, column, position: dict, descending: bool):
+        """
+        WHERE clause for rows after the cursor position in the current order.
+        """
+        if column is self.id_column:
+            return column < position["id"] if descending else column > position["id"]
+
+        value = self._cursor_value(column, position)
+
+        # row-value comparison: one range scan on the (column, id) order
+        key = tuple_(column, self.id_column)
+        after = tuple_(value, position["id"])
+        return key < after if descending else key > after
@@ -0,0 +1,143 @@
+# application/utils/passwords.py
+# Password hashing/verification on a bounded process pool, so a burst of logins
+# cannot pin every worker's CPU while cheap requests queue behind it.
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingBusy(Exception):
+    """
+    Raised when PASSWORD_HASH_MAX_PENDING hash jobs are already queued or running,
+    or a job outlives PASSWORD_HASH_TIMEOUT. Routes answer 503 instead of
+    queueing more CPU work.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs werkzeug's hash functions on a per-worker ProcessPoolExecutor.
+
+    - PASSWORD_HASH_WORKERS: pool size (0 = hash inline on the request thread)
+    - PASSWORD_HASH_MAX_PENDING: queue-depth limit before shedding load
+    - PASSWORD_HASH_TIMEOUT: seconds to wait for a result
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            "completed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "peak_pending": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+        }
+
+    def _pool(self, workers: int) -> ProcessPoolExecutor:
+        # A pool inherited across gunicorn's fork is unusable; build one per process.
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def run(self, func, *args):
+        config = current_app.config
+        workers = config["PASSWORD_HASH_WORKERS"]
+
+        with self._lock:
+            if self._pending >= config["PASSWORD_HASH_MAX_PENDING"]:
+                self._stats["rejected"] += 1
+                raise HashingBusy("Password hashing is saturated; retry shortly.")
+            self._pending += 1
+            self._stats["peak_pending"] = max(self._stats["peak_pending"], self._pending)
+
+        started = time.perf_counter()
+        if not workers:
+            try:
+                return func(*args)
+            finally:
+                self._release(started)
+
+        try:
+            future = self._pool(workers).submit(func, *args)
+        except BaseException:
+            self._release(started)
+            raise
+        # The slot is held until the job actually leaves the pool, not until this
+        # request stops waiting, so the pending bound tracks real pool load.
+        future.add_done_callback(lambda _: self._release(started))
+
+        try:
+            return future.result(timeout=config["PASSWORD_HASH_TIMEOUT"])
+        except FutureTimeout:
+            future.cancel()
+            with self._lock:
+                self._stats["timed_out"] += 1
+            raise HashingBusy("Password hashing timed out; retry shortly.")
+
+    def _release(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._pending -= 1
+            self._stats["completed"] += 1
+            self._stats["total_seconds"] += elapsed
+            self._stats["max_seconds"] = max(self._stats["max_seconds"], elapsed)
+
+    def stats(self) -> dict:
+        """
+        Latency and saturation counters for this worker process.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            pending = self._pending
+
+        completed = stats["completed"]
+        return {
+            "workers": current_app.config["PASSWORD_HASH_WORKERS"],
+            "max_pending": current_app.config["PASSWORD_HASH_MAX_PENDING"],
+            "pending": pending,
+            "peak_pending": stats["peak_pending"],
+            "completed": completed,
+            "rejected": stats["rejected"],
+            "timed_out": stats["timed_out"],
+            "avg_ms": round(stats["total_seconds"] * 1000 / completed, 2) if completed else 0.0,
+            "max_ms": round(stats["max_seconds"] * 1000, 2),
+        }
+
+
+hasher = PasswordHasher()
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method: str) -> str:
+    # werkzeug expands "scrypt" to "scrypt:32768:8:1" etc.; hash once to learn the full form.
+    return generate_password_hash("", method=method).split("$", 1)[0]
+
+
+def hash_password(plain_password: str) -> str:
+    method = current_app.config["PASSWORD_HASH_METHOD"]
+    return hasher.run(generate_password_hash, plain_password, method)
+
+
+def verify_password(password_hash: str, plain_password: str) -> bool:
+    return hasher.run(check_password_hash, password_hash, plain_password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    True if the stored hash was made with different cost parameters than
+    PASSWORD_HASH_METHOD asks for now.
+    """
+    method = current_app.config["PASSWORD_HASH_METHOD"]
+    return password_hash.split("$", 1)[0] != _method_prefix(method)
@@ -0,0 +1,249 @@
+# application/utils/serializer.py
+# Compiled dump path for SQLAlchemyAutoSchema list endpoints + a jsonify()
+# twin that encodes with orjson when that gives the exact same bytes.
+
+from collections import defaultdict
+
+from flask import current_app
+from marshmallow import fields
+from sqlalchemy import inspect as sa_inspect, select
+
+from application.extensions import db
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+
+class _ReprFloat(float):
+    """
+    A float that json.dumps and orjson would spell differently (exponent
+    form, NaN, infinity). orjson refuses float subclasses, so one of these
+    anywhere in a payload sends it down Flask's own encoder.
+    """
+
+
+def _float(value):
+    value = float(value)
+    # Inside this range both encoders print the shortest repr without an exponent.
+    if value == 0 or 1e-4 <= abs(value) < 1e16:
+        return value
+    return _ReprFloat(value)
+
+
+def _converter(field, attribute):
+    """
+    Plain function doing what field.serialize() does for a non-None value.
+    Unusual field options fall back to the field's own _serialize().
+    """
+    if isinstance(field, fields.Float) and not field.as_string:
+        return _float
+    if isinstance(field, fields.Integer) and not field.as_string:
+        return int
+    if isinstance(field, fields.Date) and field.format in (None, "iso"):
+        return lambda value: value.isoformat()
+    if type(field) in (fields.String, fields.Email):
+        return str
+    return lambda value: field._serialize(value, attribute, None)
+
+
+class CompiledSchema:
+    """
+    Serializes rows exactly like schema.dump(), without marshmallow's
+    per-field, per-row dispatch.
+
+    - Field keys and converters are resolved once, on first use.
+    - Rows are plain tuples from select() (no ORM objects, no identity map).
+    - Nested many=True fields over a many-to-many relationship are filled from
+      one batched query per field, ordered by the nested row's id.
+    - view() narrows the columns and can swap nested objects for id lists.
+    """
+
+    def __init__(self, schema, id_lists=None):
+        self.schema = schema
+        # key -> relationship, for compact views: {"mechanic_ids": "mechanics"}
+        self.id_lists = id_lists or {}
+        self._plan = None
+        self._views = {}
+
+    def _compile(self):
+        if self._plan is not None:
+            return self._plan
+
+        model = self.schema.opts.model
+        mapper = sa_inspect(model)
+        flat, nested = [], []
+
+        for name, field in self.schema.dump_fields.items():
+            key = field.data_key or name
+            attribute = field.attribute or name
+
+            if isinstance(field, fields.Nested):
+                relationship = mapper.relationships[attribute]
+                if not field.many or relationship.secondary is None:
+                    raise TypeError(f"{name}: only many=True fields over a secondary table are compiled.")
+                nested.append((key, relationship, CompiledSchema(field.schema)))
+            else:
+                flat.append((key, getattr(model, attribute), _converter(field, attribute)))
+
+        self._plan = self._finish(flat, nested, [])
+        return self._plan
+
+    @staticmethod
+    def _finish(flat, nested, id_lists):
+        id_index = next((i for i, (key, _, _) in enumerate(flat) if key == "id"), None)
+        if (nested or id_lists) and id_index is None:
+            raise TypeError("Nested fields need 'id' among the dumped fields.")
+        return (flat, nested, id_lists, id_index)
+
+    def view(self, fields=None, expand=()):
+        """
+        Sparse variant of this schema (same select()/dump() interface).
+
+        - fields: flat keys and id_lists keys to dump. Default: every flat key,
+          plus every id list whose relationship is not expanded.
+        - expand: nested fields dumped as full objects.
+        "id" is always dumped. Raises ValueError naming unknown fields.
+        """
+        key = (None if fields is None else tuple(fields), tuple(expand))
+        if key in self._views:
+            return self._views[key]
+
+        flat, nested, _, _ = self._compile()
+        flat_keys = [name for name, _, _ in flat]
+        nested_keys = [name for name, _, _ in nested]
+
+        if fields is None:
+            fields = flat_keys + [name for name, attribute in self.id_lists.items() if attribute not in expand]
+
+        unknown = [name for name in fields if name not in flat_keys and name not in self.id_lists]
+        unknown += [name for name in expand if name not in nested_keys]
+        if unknown:
+            raise ValueError(f"Unknown field: {', '.join(unknown)}.")
+
+        wanted = {"id", *fields}
+        mapper = sa_inspect(self.schema.opts.model)
+
+        compiled = CompiledSchema(self.schema, self.id_lists)
+        compiled._plan = self._finish(
+            [entry for entry in flat if entry[0] in wanted],
+            [entry for entry in nested if entry[0] in expand],
+            [(name, mapper.relationships[attribute]) for name, attribute in self.id_lists.items() if name in wanted],
+        )
+        self._views[key] = compiled
+        return compiled
+
+    def view_from_args(self, args, default_expand=()):
+        """
+        view() for the ?fields= and ?expand= query parameters (comma-separated).
+        """
+        fields = args.get("fields")
+        expand = args.get("expand")
+        return self.view(
+            fields=None if fields is None else [name for name in fields.split(",") if name],
+            expand=default_expand if expand is None else [name for name in expand.split(",") if name],
+        )
+
+    def select(self):
+        """
+        SELECT of just the dumped columns, in dump order; add where/order/limit as usual.
+        """
+        flat, _, _, _ = self._compile()
+        return select(*[column for _, column, _ in flat])
+
+    def dump_objects(self, objects) -> list:
+        """
+        dump() for objects carrying the dumped columns as attributes (e.g.
+        snapshot records) instead of select() rows.
+        """
+        flat, _, _, _ = self._compile()
+        names = [column.key for _, column, _ in flat]
+        return self.dump([tuple(getattr(obj, name) for name in names) for obj in objects])
+
+    def _dump_flat(self, rows) -> list:
+        flat, _, _, _ = self._compile()
+        keys = [key for key, _, _ in flat]
+        converters = [convert for _, _, convert in flat]
+        return [
+            {key: None if value is None else convert(value) for key, convert, value in zip(keys, converters, row)}
+            for row in rows
+        ]
+
+    def dump(self, rows) -> list:
+        """
+        List of dicts for rows returned by self.select() (or any query with
+        the same leading columns; extra trailing columns are ignored).
+        """
+        _, nested, id_lists, id_index = self._compile()
+        items = self._dump_flat(rows)
+        if not (nested or id_lists) or not items:
+            return items
+
+        ids = [row[id_index] for row in rows]
+        for key, relationship in id_lists:
+            (_, parent_fk), = relationship.synchronize_pairs
+            (_, child_fk), = relationship.secondary_synchronize_pairs
+
+            # ids straight from the association table; the child table is not read
+            by_parent = defaultdict(list)
+            for parent_id, child_id in db.session.execute(
+                select(parent_fk, child_fk).where(parent_fk.in_(ids)).order_by(parent_fk, child_fk)
+            ):
+                by_parent[parent_id].append(child_id)
+
+            for parent_id, item in zip(ids, items):
+                item[key] = by_parent.get(parent_id, [])
+
+        for key, relationship, child in nested:
+            (_, parent_fk), = relationship.synchronize_pairs
+            (child_pk, child_fk), = relationship.secondary_synchronize_pairs
+
+            query = (
+                child.select()
+                .add_columns(parent_fk)
+                .join_from(relationship.secondary, relationship.mapper.class_, child_fk == child_pk)
+                .where(parent_fk.in_(ids))
+                .order_by(parent_fk, child_pk)
+            )
+            result = db.session.execute(query).all()
+
+            by_parent = defaultdict(list)
+            for item, row in zip(child.dump([row[:-1] for row in result]), result):
+                by_parent[row[-1]].append(item)
+
+            for parent_id, item in zip(ids, items):
+                item[key] = by_parent.get(parent_id, [])
+
+        return items
+
+
+def json_response(payload, status: int = 200):
+    """
+    Same response as flask.jsonify(payload) (same bytes, headers and mimetype),
+    encoded with orjson when installed and byte-identical: compact output,
+    sorted keys, printable ASCII only (orjson leaves DEL raw, the stdlib
+    writes \\u007f). Anything else goes through app.json.
+    """
+    app = current_app
+    provider = app.json
+    compact = getattr(provider, "compact", None)
+    compact = compact is True or (compact is None and not app.debug)
+
+    if (
+        orjson is not None
+        and compact
+        and getattr(provider, "sort_keys", False)
+        and getattr(provider, "ensure_ascii", False)
+    ):
+        try:
+            body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        except TypeError:  # _ReprFloat, ints beyond 64 bits, unknown types
+            body = None
+
+        if body is not None and body.isascii() and b"\x7f" not in body:
+            return app.response_class(body + b"\n", status=status, mimetype=provider.mimetype)
+
+    response = provider.response(payload)
+    response.status_code = status
+    return response
@@ -0,0 +1,226 @@
+# application/utils/snapshot.py
+# Versioned, process-local snapshots of small, rarely written tables
+# (mechanics, parts), so hot lookups and list pages skip the database.
+
+import threading
+import time
+import uuid
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from application.extensions import db
+
+# table name -> TableSnapshot, for the session hooks below
+SNAPSHOTS = {}
+
+
+class Record:
+    """
+    Read-only row: one attribute per name in the subclass's __slots__.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+
+class _State:
+    """
+    One loaded copy of a table. records is None when the table had more than
+    SNAPSHOT_MAX_ROWS rows (lookups then go to the database).
+    """
+
+    __slots__ = ("token", "loaded_at", "records", "by_id", "indexes", "fingerprint")
+
+    def __init__(self, token, records, unique):
+        self.token = token
+        self.loaded_at = time.monotonic()
+        self.records = records
+        if records is None:
+            self.by_id, self.indexes, self.fingerprint = None, None, None
+            return
+        self.by_id = {record.id: record for record in records}
+        self.indexes = {key: {getattr(record, key): record for record in records} for key in unique}
+        # same components as conditional.aggregate_version(): count, max id, sum of versions
+        self.fingerprint = (
+            len(records),
+            records[-1].id if records else None,
+            sum(record.version for record in records),
+        )
+
+
+class TableSnapshot:
+    """
+    All rows of one small table as immutable records, indexed by id and by
+    each unique column in `unique`.
+
+    The snapshot is tied to a version token kept in the shared cache (so every
+    worker sees it with Redis). Committed ORM writes and session.execute() DML
+    on the table replace the token (see the hooks below); a lookup that finds
+    a different token than the one it loaded under reloads the table first.
+    SNAPSHOT_MAX_AGE bounds how long writes made outside the app (psql, other
+    services) can go unseen.
+    """
+
+    KEY_PREFIX = "snapshot:"
+
+    def __init__(self, cache, model, record_type, unique=()):
+        self.cache = cache
+        self.model = model
+        self.record_type = record_type
+        self.unique = tuple(unique)
+        self.table = model.__tablename__
+        self._lock = threading.Lock()
+        SNAPSHOTS[self.table] = self
+
+        for event_name in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, event_name, _record_write)
+
+    def _token(self) -> str:
+        key = self.KEY_PREFIX + self.table
+        token = self.cache.get(key)
+        if token is None:
+            token = uuid.uuid4().hex
+            self.cache.set(key, token, timeout=0)
+        return token
+
+    def bump(self) -> None:
+        """
+        Make every process reload this table on its next lookup.
+        """
+        self.cache.set(self.KEY_PREFIX + self.table, uuid.uuid4().hex, timeout=0)
+
+    @staticmethod
+    def _fresh(state, token: str) -> bool:
+        return (
+            state is not None
+            and state.token == token
+            and time.monotonic() - state.loaded_at <= current_app.config["SNAPSHOT_MAX_AGE"]
+        )
+
+    def current(self) -> _State:
+        """
+        This process's copy of the table, reloaded first if stale. The token is
+        read before loading, so a write committed mid-load forces another reload.
+        """
+        token = self._token()
+        states = current_app.extensions.setdefault("snapshots", {})
+        state = states.get(self.table)
+        if self._fresh(state, token):
+            return state
+
+        with self._lock:
+            state = states.get(self.table)
+            if not self._fresh(state, token):
+                state = _State(token, self._load(), self.unique)
+                states[self.table] = state
+        return state
+
+    def _load(self):
+        ceiling = current_app.config["SNAPSHOT_MAX_ROWS"]
+        columns = [getattr(self.model, name) for name in self.record_type.__slots__]
+        rows = db.session.execute(select(*columns).order_by(self.model.id).limit(ceiling + 1)).all()
+        if len(rows) > ceiling:
+            return None
+        return tuple(self.record_type(*row) for row in rows)
+
+    def _query_one(self, column, value):
+        columns = [getattr(self.model, name) for name in self.record_type.__slots__]
+        row = db.session.execute(select(*columns).where(column == value)).first()
+        return None if row is None else self.record_type(*row)
+
+    def get(self, row_id: int):
+        """
+        Record for row_id, or None if there is no such row.
+        """
+        state = self.current()
+        if state.records is None:
+            return self._query_one(self.model.id, row_id)
+        return state.by_id.get(row_id)
+
+    def get_many(self, ids) -> dict:
+        """
+        {id: record} for those of ids that exist; one snapshot check, or a
+        single IN query when the table is too large to hold.
+        """
+        ids = set(ids)
+        state = self.current()
+        if state.records is None:
+            if not ids:
+                return {}
+            columns = [getattr(self.model, name) for name in self.record_type.__slots__]
+            rows = db.session.execute(select(*columns).where(self.model.id.in_(ids))).all()
+            return {record.id: record for record in (self.record_type(*row) for row in rows)}
+        return {row_id: state.by_id[row_id] for row_id in ids if row_id in state.by_id}
+
+    def find(self, key: str, value):
+        """
+        Record whose unique column key equals value, or None.
+        """
+        state = self.current()
+        if state.records is None:
+            return self._query_one(getattr(self.model, key), value)
+        return state.indexes[key].get(value)
+
+    def records(self):
+        """
+        Every record in id order, or None if the table is too large to hold.
+        """
+        return self.current().records
+
+    def fingerprint(self):
+        """
+        (count, max id, sum of versions), the same values as
+        table_versions(aggregate_version(model)); None if the table is too large.
+        """
+        return self.current().fingerprint
+
+
+# ---- replace a table's token once writes to it are committed ----
+
+def _mark(session, table_name: str) -> None:
+    session.info.setdefault("snapshot_writes", set()).add(table_name)
+
+
+def _record_write(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        _mark(session, mapper.local_table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_dml(orm_execute_state):
+    # INSERT/UPDATE/DELETE statements (incl. Core tables) bypass the mapper events
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        name = getattr(table, "name", None)
+        if name in SNAPSHOTS:
+            _mark(orm_execute_state.session, name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_written(session):
+    written = session.info.pop("snapshot_writes", None)
+    if not written or not has_app_context():
+        return
+    for name in written:
+        SNAPSHOTS[name].bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written(session):
+    session.info.pop("snapshot_writes", None)
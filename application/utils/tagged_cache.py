@@ -0,0 +1,347 @@
+# application/utils/tagged_cache.py
+# Tag-based response caching on top of the Flask-Caching `cache`.
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, current_app, g, make_response, request
+
+
+class LocalLRU:
+    """
+    Small per-process LRU of cache entries, used as a first tier in front of a
+    shared cache backend (e.g. Redis) so hot entries skip the network fetch.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class TaggedCache:
+    """
+    Response cache where every entry is registered under resource tags
+    (e.g. "tickets:list", "ticket:7", "customer:3:tickets", "mechanic:2").
+
+    Writes call invalidate(*tags) and only entries carrying one of those tags go
+    stale; everything else stays cached.
+
+    How it works:
+    - each tag has a version token stored in the cache
+    - an entry remembers the tag versions it was built under
+    - a read only counts as a hit if all of those versions are still current
+    So invalidating a tag is one cache write, however many entries carry it.
+
+    Two-tier mode (CACHE_LOCAL_MAX_ENTRIES > 0): entries are also kept in a
+    per-worker LocalLRU. Tag versions always come from the shared backend, so a
+    write in one gunicorn worker makes the other workers' local copies stale on
+    their next read without any messaging between them.
+    """
+
+    TAG_PREFIX = "tag:"
+    ENTRY_PREFIX = "view:"
+    LOCK_PREFIX = "lock:"
+
+    # Single-flight: lease lifetime, how long followers wait, and how often they look.
+    lock_timeout = 10
+    wait_timeout = 5
+    poll_interval = 0.05
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._stats = {
+            "hits": 0,
+            "local_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stale_served": 0,
+            "invalidations": 0,
+        }
+
+    def init_app(self, app) -> None:
+        """
+        Give this app its own local tier if CACHE_LOCAL_MAX_ENTRIES is set.
+        """
+        max_entries = app.config.get("CACHE_LOCAL_MAX_ENTRIES", 0)
+        app.extensions["tagged_cache"] = LocalLRU(max_entries) if max_entries else None
+
+    def _local(self):
+        return current_app.extensions.get("tagged_cache")
+
+    # ---- counters ----
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def stats(self) -> dict:
+        """
+        Hit/miss/invalidation counters for this process, plus the hit rate.
+        - local_hits: hits served from the per-worker tier
+        - coalesced: misses that reused another request's fresh result
+        - stale_served: misses answered with the previous value during a rebuild
+        """
+        with self._lock:
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    # ---- tags ----
+
+    def tag_versions(self, tags) -> dict:
+        """
+        Current version token of each tag. Unknown tags get a fresh token.
+        """
+        tags = list(dict.fromkeys(tags))
+        keys = [self.TAG_PREFIX + tag for tag in tags]
+        values = self.cache.get_many(*keys) if keys else []
+
+        versions = {}
+        for tag, key, version in zip(tags, keys, values):
+            if version is None:
+                version = uuid.uuid4().hex
+                # add() so two workers minting the same tag agree on one token.
+                if not self.cache.add(key, version, timeout=0):
+                    version = self.cache.get(key)
+            versions[tag] = version
+        return versions
+
+    def invalidate(self, *tags) -> None:
+        """
+        Mark every entry registered under any of these tags as stale.
+        """
+        tags = [tag for tag in dict.fromkeys(tags) if tag]
+        if not tags:
+            return
+
+        self.cache.set_many(
+            {self.TAG_PREFIX + tag: uuid.uuid4().hex for tag in tags},
+            timeout=0,
+        )
+        self._count("invalidations", len(tags))
+
+    def tag(self, *tags) -> None:
+        """
+        Register extra tags for the entry currently being built.
+        Call from inside a cached view once you know what the response contains
+        (e.g. the mechanics on a ticket). No-op outside a cached view.
+        """
+        versions = g.get("cache_tag_versions")
+        if versions is not None:
+            versions.update(self.tag_versions(t for t in tags if t not in versions))
+
+    def _is_current(self, versions: dict) -> bool:
+        return self.tag_versions(versions) == versions
+
+    # ---- entries ----
+
+    def _lookup(self, key: str, local):
+        """
+        Fetch an entry from the local tier, then the shared backend.
+        Returns (entry, from_local).
+        """
+        entry = local.get(key) if local is not None else None
+        if entry is not None:
+            return entry, True
+        return self.cache.get(key), False
+
+    def _fresh_entry(self, key: str, local):
+        """
+        The entry for key if it is unexpired and none of its tags were invalidated.
+        """
+        entry, _ = self._lookup(key, local)
+        if entry is not None and entry["expires"] > time.time() and self._is_current(entry["tags"]):
+            return entry
+        return None
+
+    @staticmethod
+    def _conditional(response: Response, etag: str) -> Response:
+        """
+        Attach the entry's ETag and turn a matching If-None-Match into a 304.
+        """
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+    def _respond(self, entry, etag: bool = False) -> Response:
+        response = Response(entry["body"], status=entry["status"], mimetype=entry["mimetype"])
+        if not etag:
+            return response
+        return self._conditional(response, entry["etag"])
+
+    # ---- single flight ----
+
+    def _acquire(self, key: str):
+        """
+        Try to become the one request (across threads and workers) that rebuilds key.
+        Returns (is_leader, event); event is set when this process's leader finishes.
+        """
+        with self._lock:
+            event = self._inflight.get(key)
+            if event is not None:
+                return False, event
+            event = threading.Event()
+            self._inflight[key] = event
+
+        # Lease in the shared backend; add() is atomic (SET NX on Redis).
+        if self.cache.add(self.LOCK_PREFIX + key, os.getpid(), timeout=self.lock_timeout):
+            return True, event
+
+        with self._lock:
+            self._inflight.pop(key, None)
+        event.set()
+        return False, None
+
+    def _release(self, key: str) -> None:
+        self.cache.delete(self.LOCK_PREFIX + key)
+        with self._lock:
+            event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def _wait_for(self, key: str, event, local):
+        """
+        Wait for the leader to publish a fresh entry. Returns None if the leader
+        finished without one (e.g. a 404) or took longer than wait_timeout.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            if event is not None:
+                leader_done = event.wait(self.poll_interval)
+            else:
+                time.sleep(self.poll_interval)
+                leader_done = not self.cache.has(self.LOCK_PREFIX + key)
+
+            entry = self._fresh_entry(key, local)
+            if entry is not None or leader_done:
+                return entry
+        return None
+
+    # ---- view decorator ----
+
+    def cached(self, tags, timeout=None, stale_ttl=0, vary=None, etag=False):
+        """
+        Cache a view's 200 responses per full path (query string included).
+
+        tags: list of tags, or a callable receiving the view's arguments and
+        returning the list (e.g. lambda ticket_id: [f"ticket:{ticket_id}"]).
+
+        vary: optional callable receiving the view's arguments and returning a
+        string added to the key, for responses that differ by more than the URL
+        (e.g. per customer behind token_required).
+
+        etag: send an ETag (sha1 of the body) and answer a matching
+        If-None-Match with 304 Not Modified, from the cache or a fresh render.
+
+        On a miss only one request per key (across threads and workers) runs the
+        view; concurrent requests for the same key wait for its result instead of
+        all hitting the database at once.
+
+        stale_ttl: seconds an expired entry may still be served while another
+        request rebuilds it (stale-while-revalidate). Only entries that aged out
+        qualify; an entry whose tags were invalidated by a write is never served.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                key = self.ENTRY_PREFIX + request.full_path
+                if vary is not None:
+                    key += "#" + str(vary(*args, **kwargs))
+                local = self._local()
+
+                entry, from_local = self._lookup(key, local)
+                current = entry is not None and self._is_current(entry["tags"])
+                now = time.time()
+
+                if current and entry["expires"] > now:
+                    self._count("hits")
+                    if from_local:
+                        self._count("local_hits")
+                    elif local is not None:
+                        local.set(key, entry)
+                    return self._respond(entry, etag)
+
+                if from_local and not current:
+                    local.delete(key)
+
+                stale = entry if current and entry["expires"] + stale_ttl > now else None
+
+                is_leader, event = self._acquire(key)
+                if not is_leader:
+                    if stale is not None:
+                        self._count("stale_served")
+                        return self._respond(stale, etag)
+
+                    entry = self._wait_for(key, event, local)
+                    if entry is not None:
+                        self._count("coalesced")
+                        return self._respond(entry, etag)
+                    # Leader produced nothing cacheable or is too slow; render ourselves.
+
+                self._count("misses")
+                try:
+                    return self._render(key, local, view, args, kwargs, tags, timeout, stale_ttl, etag)
+                finally:
+                    if is_leader:
+                        self._release(key)
+
+            return wrapper
+
+        return decorator
+
+    def _render(self, key, local, view, args, kwargs, tags, timeout, stale_ttl, etag) -> Response:
+        entry_tags = tags(*args, **kwargs) if callable(tags) else tags
+        # Take versions before running the view so a write that lands
+        # mid-render leaves this entry stale rather than masking it.
+        g.cache_tag_versions = self.tag_versions(entry_tags)
+
+        response = make_response(view(*args, **kwargs))
+        versions = g.pop("cache_tag_versions")
+
+        if response.status_code == 200:
+            ttl = timeout if timeout is not None else current_app.config.get("CACHE_DEFAULT_TIMEOUT", 300)
+            body = response.get_data()
+            entry = {
+                "body": body,
+                "status": response.status_code,
+                "mimetype": response.mimetype,
+                "tags": versions,
+                "expires": time.time() + ttl,
+                "etag": hashlib.sha1(body).hexdigest(),
+            }
+            # Keep the entry past its expiry for the stale-while-revalidate window.
+            self.cache.set(key, entry, timeout=ttl + stale_ttl)
+            if local is not None:
+                local.set(key, entry)
+
+            if etag:
+                response = self._conditional(response, entry["etag"])
+
+        return response
@@ -0,0 +1,144 @@
+# application/utils/token_cache.py
+# Verified-token LRU and JWT revocation lists used by token_required.
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class MemoryRevocations:
+    """
+    Revoked jtis held in this process only: {jti: exp}.
+    Entries are dropped once the token would have expired anyway, so the set
+    never grows past the tokens issued within one token lifetime.
+    """
+
+    def __init__(self):
+        self._revoked = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, exp: int) -> None:
+        with self._lock:
+            self._revoked[jti] = exp
+            self._purge()
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def _purge(self) -> None:
+        now = time.time()
+        for jti in [jti for jti, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[jti]
+
+
+class CacheRevocations:
+    """
+    Revoked jtis kept in the Flask-Caching backend, so a logout handled by one
+    gunicorn worker is honoured by all of them when REDIS_URL is set.
+    """
+
+    KEY_PREFIX = "revoked:"
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def revoke(self, jti: str, exp: int) -> None:
+        self.cache.set(self.KEY_PREFIX + jti, 1, timeout=max(1, int(exp - time.time())))
+
+    def is_revoked(self, jti: str) -> bool:
+        return self.cache.has(self.KEY_PREFIX + jti)
+
+
+class VerifiedTokens:
+    """
+    Bounded LRU of tokens whose signature was already checked, keyed by the
+    token's sha256 digest. An entry is only returned before the token's exp.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        key = self.digest(token)
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def set(self, token: str, claims: dict) -> None:
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class TokenCache:
+    """
+    Per-app verified-token cache plus a pluggable revocation list.
+
+    - TOKEN_CACHE_MAX_ENTRIES: LRU size (0 = verify every request)
+    - TOKEN_REVOCATION_BACKEND: "memory" (this process) or "cache" (the
+      shared Flask-Caching backend)
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def init_app(self, app) -> None:
+        max_entries = app.config.get("TOKEN_CACHE_MAX_ENTRIES", 0)
+        backend = app.config.get("TOKEN_REVOCATION_BACKEND", "cache")
+
+        if backend == "memory":
+            revocations = MemoryRevocations()
+        elif backend == "cache":
+            revocations = CacheRevocations(self.cache)
+        else:
+            raise ValueError(f"Unknown TOKEN_REVOCATION_BACKEND: {backend!r}")
+
+        app.extensions["token_cache"] = {
+            "verified": VerifiedTokens(max_entries) if max_entries else None,
+            "revocations": revocations,
+        }
+
+    def _state(self) -> dict:
+        return current_app.extensions["token_cache"]
+
+    def get(self, token: str):
+        """
+        Claims of a previously verified, unexpired token, or None.
+        """
+        verified = self._state()["verified"]
+        return verified.get(token) if verified is not None else None
+
+    def set(self, token: str, claims: dict) -> None:
+        verified = self._state()["verified"]
+        if verified is not None:
+            verified.set(token, claims)
+
+    def revoke(self, claims: dict) -> None:
+        """
+        Revoke the token these claims came from until it expires.
+        Tokens issued before jti was added cannot be revoked individually.
+        """
+        if "jti" in claims:
+            self._state()["revocations"].revoke(claims["jti"], claims["exp"])
+
+    def is_revoked(self, claims: dict) -> bool:
+        jti = claims.get("jti")
+        return jti is not None and self._state()["revocations"].is_revoked(jti)
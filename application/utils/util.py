@@ -1,18 +1,27 @@
 # application/utils/util.py
-# Token utilities (JWT encode/decode) + route protection decorator.
+# Token utilities (JWT encode/decode, refresh tokens) + route protection decorator.
 
+import hashlib
+import secrets
+import uuid
 from datetime import datetime, timedelta, timezone
 from functools import wraps
 
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, g
 from jose import jwt
 import jose
 
+from sqlalchemy import select, update
+
+from application.extensions import db, token_cache
+from application.models.refresh_token import RefreshToken
+
 
 def encode_token(customer_id: int) -> str:
     """
     Create a JWT token that "belongs" to a specific customer.
     The 'sub' claim (subject) stores the customer_id as a STRING.
+    The 'jti' claim gives each token an id so it can be revoked on logout.
     """
     payload = {
         "exp": datetime.now(timezone.utc) + timedelta(hours=1),
@@ -20,18 +29,97 @@ def encode_token(customer_id: int) -> str:
         "iat": datetime.now(timezone.utc),
 
         "sub": str(customer_id),
+
+        "jti": uuid.uuid4().hex,
     }
 
     secret_key = current_app.config["SECRET_KEY"]
     token = jwt.encode(payload, secret_key, algorithm="HS256")
     return token
 
+def _utcnow() -> datetime:
+    # Naive UTC, matching how DateTime columns round-trip on SQLite/MySQL.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def issue_refresh_token(customer_id: int, family_id: str = None) -> str:
+    """
+    Create a refresh token for customer_id and add its row to the session
+    (the caller commits). family_id links it to the token it replaces.
+    Returns the plain token; only its hash is stored.
+    """
+    token = secrets.token_urlsafe(32)
+    db.session.add(RefreshToken(
+        customer_id=customer_id,
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=_utcnow() + timedelta(days=current_app.config["REFRESH_TOKEN_DAYS"]),
+    ))
+    return token
+
+def rotate_refresh_token(token: str):
+    """
+    Spend a refresh token: one indexed lookup by hash, then revoke it and issue
+    its replacement. Commits the session.
+
+    Returns (customer_id, new_refresh_token), or None if the token is unknown,
+    expired or already spent. Reusing a spent token revokes its whole family,
+    since either the client or an attacker holds a copy.
+    """
+    now = _utcnow()
+    query = select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))
+    record = db.session.execute(query).scalars().first()
+
+    if record is None or record.expires_at <= now:
+        return None
+
+    # Conditional UPDATE so two concurrent refreshes cannot both spend the token.
+    spent = db.session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == record.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+
+    if spent.rowcount != 1:
+        db.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == record.family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        db.session.commit()
+        return None
+
+    new_token = issue_refresh_token(record.customer_id, record.family_id)
+    db.session.commit()
+    return record.customer_id, new_token
+
+def revoke_refresh_tokens(customer_id: int, token: str = None) -> None:
+    """
+    Revoke the customer's live refresh tokens (the caller commits): only the
+    family `token` belongs to if given, otherwise every family.
+    """
+    criteria = [RefreshToken.customer_id == customer_id, RefreshToken.revoked_at.is_(None)]
+    if token is not None:
+        family = (
+            select(RefreshToken.family_id)
+            .where(RefreshToken.token_hash == hash_refresh_token(token))
+            .scalar_subquery()
+        )
+        criteria.append(RefreshToken.family_id == family)
+
+    db.session.execute(update(RefreshToken).where(*criteria).values(revoked_at=_utcnow()))
+
 def token_required(route_func):
     """
     Decorator that:
     - expects Authorization: Bearer <token>
-    - validates token signature + expiration
+    - validates token signature + expiration (once per token; later requests
+      reuse the verified claims from token_cache until 'exp')
+    - rejects revoked tokens (see /customers/logout)
     - extracts customer_id from token payload ('sub')
+    - stores the claims on g.token_claims
     - passes customer_id into wrapped route function
     """
     @wraps(route_func)
@@ -44,18 +132,27 @@ def token_required(route_func):
 
         token = auth_header.split(" ")[1]
 
-        try:
-            secret_key = current_app.config["SECRET_KEY"]
+        data = token_cache.get(token)
+
+        if data is None:
+            try:
+                secret_key = current_app.config["SECRET_KEY"]
+
+                data = jwt.decode(token, secret_key, algorithms=["HS256"])
+
+            except jose.exceptions.ExpiredSignatureError:
+                return jsonify({"message": "Token has expired."}), 401
 
-            data = jwt.decode(token, secret_key, algorithms=["HS256"])
+            except jose.exceptions.JWTError:
+                return jsonify({"message": "Invalid token."}), 401
 
-            customer_id = int(data["sub"])
+            token_cache.set(token, data)
 
-        except jose.exceptions.ExpiredSignatureError:
-            return jsonify({"message": "Token has expired."}), 401
+        if token_cache.is_revoked(data):
+            return jsonify({"message": "Token has been revoked."}), 401
 
-        except jose.exceptions.JWTError:
-            return jsonify({"message": "Invalid token."}), 401
+        customer_id = int(data["sub"])
+        g.token_claims = data
 
         return route_func(customer_id, *args, **kwargs)
 
@@ -0,0 +1,111 @@
+"""
+Benchmark: marshmallow tickets_schema.jsonify() vs the compiled serializer.
+
+Builds an in-memory SQLite database of tickets (each with mechanics and
+parts), then times serializing one page both ways and checks that the two
+responses are byte-identical.
+
+    python benchmarks/serialize_tickets.py [--tickets 2000] [--page 100] [--rounds 20]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from application import create_app, db  # noqa: E402
+from application.blueprints.tickets.schemas import tickets_compiled, tickets_schema  # noqa: E402
+from application.models.customer import Customer  # noqa: E402
+from application.models.inventory import Inventory  # noqa: E402
+from application.models.mechanic import Mechanic  # noqa: E402
+from application.models.service_ticket import ServiceTicket  # noqa: E402
+from application.utils import serializer  # noqa: E402
+from application.utils.serializer import json_response  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+
+class BenchConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    DEBUG = False  # compact JSON, as in production
+
+
+def seed(tickets: int) -> None:
+    customer = Customer(name="Bench", email="bench@example.com", password_hash="x")
+    mechanics = [Mechanic(name=f"Mechanic {i}", email=f"m{i}@garage.com", salary=50000 + i) for i in range(20)]
+    parts = [Inventory(name=f"Part {i}", price=9.99 + i) for i in range(30)]
+    db.session.add_all([customer, *mechanics, *parts])
+    db.session.flush()
+
+    for i in range(tickets):
+        db.session.add(ServiceTicket(
+            VIN=f"VIN{i:08d}",
+            service_date=date(2026, 1, 1) + timedelta(days=i % 365),
+            service_desc="Routine service",
+            customer_id=customer.id,
+            mechanics=[mechanics[i % 20], mechanics[(i + 7) % 20]],
+            parts=[parts[i % 30], parts[(i + 3) % 30], parts[(i + 11) % 30]],
+        ))
+    db.session.commit()
+
+
+def marshmallow_page(page: int):
+    query = (
+        select(ServiceTicket)
+        .options(selectinload(ServiceTicket.mechanics), selectinload(ServiceTicket.parts))
+        .order_by(ServiceTicket.id)
+        .limit(page)
+    )
+    tickets = db.session.execute(query).scalars().all()
+    response = tickets_schema.jsonify(tickets)
+    db.session.expunge_all()  # like a new request: no identity-map reuse
+    return response
+
+
+def compiled_page(page: int):
+    rows = db.session.execute(tickets_compiled.select().order_by(ServiceTicket.id).limit(page)).all()
+    return json_response(tickets_compiled.dump(rows))
+
+
+def timed(func, page: int, rounds: int) -> float:
+    func(page)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func(page)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app(BenchConfig)
+    with app.test_request_context():
+        db.create_all()
+        seed(args.tickets)
+
+        for page in sorted({args.page, args.tickets}):
+            assert marshmallow_page(page).get_data() == compiled_page(page).get_data(), "outputs differ"
+
+            baseline = timed(marshmallow_page, page, args.rounds)
+            compiled = timed(compiled_page, page, args.rounds)
+            print(f"{page:>6} tickets  marshmallow {baseline:8.2f} ms   compiled {compiled:8.2f} ms   "
+                  f"x{baseline / compiled:.1f}")
+
+            if serializer.orjson is not None:
+                serializer_orjson = serializer.orjson
+                serializer.orjson = None
+                stdlib = timed(compiled_page, page, args.rounds)
+                serializer.orjson = serializer_orjson
+                print(f"{'':>6}          (compiled without orjson {stdlib:8.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
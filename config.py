@@ -15,6 +15,59 @@ class BaseConfig:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = os.environ.get("SECRET_KEY")
 
+    # Page size for cursor-paginated collection endpoints (?limit=), and the hard ceiling.
+    DEFAULT_PAGE_SIZE = int(os.environ.get("DEFAULT_PAGE_SIZE", 10))
+    MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 100))
+    # ?total=true on list endpoints counts at most this many rows (beyond it: total_exact=false).
+    TOTAL_COUNT_LIMIT = int(os.environ.get("TOTAL_COUNT_LIMIT", 10000))
+
+    # Response cache. With REDIS_URL set, all gunicorn workers share one Redis
+    # cache and keep a small local LRU in front of it (CACHE_LOCAL_MAX_ENTRIES);
+    # otherwise each process uses its own in-memory SimpleCache.
+    CACHE_REDIS_URL = os.environ.get("REDIS_URL")
+    CACHE_TYPE = "RedisCache" if CACHE_REDIS_URL else "SimpleCache"
+    CACHE_DEFAULT_TIMEOUT = 60
+    CACHE_KEY_PREFIX = "mechanic_shop:"
+    CACHE_LOCAL_MAX_ENTRIES = int(os.environ.get("CACHE_LOCAL_MAX_ENTRIES", 256 if CACHE_REDIS_URL else 0))
+
+    # Password hashing runs on a per-worker process pool. Beyond MAX_PENDING queued
+    # jobs, login/signup answer 503. Changing METHOD rehashes passwords on next login.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 8))
+    PASSWORD_HASH_TIMEOUT = 10
+
+    # token_required remembers verified JWTs (until their exp) instead of checking
+    # the signature on every request. Revoked jtis live in this process ("memory")
+    # or in the cache backend above ("cache", shared across workers with Redis).
+    TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get("TOKEN_CACHE_MAX_ENTRIES", 1024))
+    TOKEN_REVOCATION_BACKEND = os.environ.get("TOKEN_REVOCATION_BACKEND", "cache")
+
+    # Lifetime of rotating refresh tokens (POST /customers/refresh).
+    REFRESH_TOKEN_DAYS = int(os.environ.get("REFRESH_TOKEN_DAYS", 30))
+
+    # POST /service-tickets/bulk: items per request, and its own rate limit.
+    BULK_TICKETS_MAX = int(os.environ.get("BULK_TICKETS_MAX", 500))
+    BULK_TICKETS_RATE_LIMIT = os.environ.get("BULK_TICKETS_RATE_LIMIT", "30 per hour")
+
+    # GET /search/: "auto" picks pg_trgm / SQLite FTS5 / in-process n-grams by
+    # database; "ngram" forces the in-process index (rebuilt after SEARCH_INDEX_TTL seconds).
+    SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "auto")
+    SEARCH_INDEX_TTL = int(os.environ.get("SEARCH_INDEX_TTL", 60))
+    SEARCH_RATE_LIMIT = os.environ.get("SEARCH_RATE_LIMIT", "120 per minute")
+
+    # In-process snapshots of the mechanics and inventory tables: reloaded when
+    # a write bumps their version, or after SNAPSHOT_MAX_AGE seconds (writes made
+    # outside the app). Tables over SNAPSHOT_MAX_ROWS are read from the database.
+    SNAPSHOT_MAX_AGE = int(os.environ.get("SNAPSHOT_MAX_AGE", 300))
+    SNAPSHOT_MAX_ROWS = int(os.environ.get("SNAPSHOT_MAX_ROWS", 10000))
+
+    # Rows per batch (and transaction) in inventory imports.
+    IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", 1000))
+
+    # Rows per server-side cursor batch in GET /service-tickets/export.
+    EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 1000))
+
 class DevelopmentConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI = (
         os.environ.get("SQLALCHEMY_DATABASE_URI")
@@ -35,8 +88,6 @@ class ProductionConfig(BaseConfig):
         or os.environ.get("DATABASE_URL")
     )
 
-    CACHE_TYPE = "SimpleCache"
-
 
 class TestingConfig(BaseConfig):
     TESTING = True
@@ -47,6 +98,7 @@ class TestingConfig(BaseConfig):
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
     CACHE_TYPE = "SimpleCache"
+    CACHE_LOCAL_MAX_ENTRIES = 0
 
     SECRET_KEY = "test_secret_key"
 
@@ -51,6 +51,23 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Keep autogenerate away from the SQLite FTS5 search tables (and their
+    shadow tables); they are created by migration and by
+    application/models/search.py, not declared as models. Likewise skip
+    indexes declared for another dialect only (Index.ddl_if).
+    """
+    if type_ == "table" and reflected and compare_to is None:
+        from application.models.search import FTS_TABLES
+        return not any(name == fts or name.startswith(fts + "_") for fts in FTS_TABLES)
+    if type_ == "index" and not reflected:
+        ddl_if = getattr(object, "_ddl_if", None)
+        if ddl_if is not None and ddl_if.dialect:
+            return ddl_if.dialect == context.get_context().dialect.name
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -93,10 +110,18 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        if connection.dialect.name == "sqlite":
+            # Batch migrations copy and drop tables; with foreign keys enforced
+            # (see application/extensions.py) the drop would cascade or fail.
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -0,0 +1,64 @@
+"""on delete cascade foreign keys
+
+Revision ID: 5c1e9a7d3b42
+Revises: 24bb36f80501
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e9a7d3b42'
+down_revision = '24bb36f80501'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, referred table) for every foreign key that should cascade on delete.
+CASCADING_FKS = [
+    ("service_tickets", "customer_id", "customers"),
+    ("service_mechanics", "ticket_id", "service_tickets"),
+    ("service_mechanics", "mechanic_id", "mechanics"),
+    ("service_ticket_inventory", "ticket_id", "service_tickets"),
+    ("service_ticket_inventory", "inventory_id", "inventory"),
+]
+
+# Names reflected FKs get when the database never named them (SQLite batch mode).
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def _existing_fk_name(table, column, referred):
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        if fk["constrained_columns"] == [column]:
+            return fk["name"] or NAMING_CONVENTION["fk"] % {
+                "table_name": table,
+                "column_0_name": column,
+                "referred_table_name": referred,
+            }
+    return None
+
+
+def _recreate_fks(ondelete):
+    # Baseline FKs were created unnamed, so look up whatever name the database gave them.
+    for table, column, referred in CASCADING_FKS:
+        existing = _existing_fk_name(table, column, referred)
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            if existing:
+                batch_op.drop_constraint(existing, type_="foreignkey")
+            batch_op.create_foreign_key(
+                f"fk_{table}_{column}_{referred}",
+                referred,
+                [column],
+                ["id"],
+                ondelete=ondelete,
+            )
+
+
+def upgrade():
+    _recreate_fks("CASCADE")
+
+
+def downgrade():
+    _recreate_fks(None)
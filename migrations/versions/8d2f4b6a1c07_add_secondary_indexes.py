@@ -0,0 +1,41 @@
+"""add secondary indexes
+
+Revision ID: 8d2f4b6a1c07
+Revises: 5c1e9a7d3b42
+Create Date: 2026-10-17 10:03:27.540913
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f4b6a1c07'
+down_revision = '5c1e9a7d3b42'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    # FK lookups: a customer's tickets, and the reverse side of both association tables
+    ("ix_service_tickets_customer_id", "service_tickets", ["customer_id"]),
+    ("ix_service_mechanics_mechanic_id", "service_mechanics", ["mechanic_id"]),
+    ("ix_service_ticket_inventory_inventory_id", "service_ticket_inventory", ["inventory_id"]),
+    # search / range filters
+    ("ix_service_tickets_VIN", "service_tickets", ["VIN"]),
+    ("ix_service_tickets_service_date", "service_tickets", ["service_date"]),
+]
+
+
+def upgrade():
+    # CONCURRENTLY on PostgreSQL so the tables stay writable while indexes build;
+    # it cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
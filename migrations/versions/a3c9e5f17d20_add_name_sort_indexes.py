@@ -0,0 +1,35 @@
+"""add name sort indexes
+
+Revision ID: a3c9e5f17d20
+Revises: f2d8a61b4c93
+Create Date: 2026-10-17 16:21:44.183207
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c9e5f17d20'
+down_revision = 'f2d8a61b4c93'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns): ?sort=name and ?name= on the list endpoints.
+# inventory.name and the email columns are already covered by unique constraints.
+INDEXES = [
+    ("ix_customers_name", "customers", ["name"]),
+    ("ix_mechanics_name", "mechanics", ["name"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,144 @@
+"""service_date to date column
+
+Revision ID: b47e0d91f3a5
+Revises: 8d2f4b6a1c07
+Create Date: 2026-10-17 11:26:05.902317
+
+"""
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b47e0d91f3a5'
+down_revision = '8d2f4b6a1c07'
+branch_labels = None
+depends_on = None
+
+
+# Rows converted per committed batch; keeps each UPDATE's row locks short.
+BATCH_SIZE = 1000
+
+INDEX_NAME = "ix_service_tickets_service_date"
+
+TEXT_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d")
+
+
+def _parse_date(value):
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in TEXT_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    # ISO datetimes ("2026-01-01T09:30:00"): keep the day.
+    return datetime.fromisoformat(text).date()
+
+
+def _format_date(value):
+    # Some drivers (SQLite) hand DATE columns back as text.
+    return _parse_date(value).isoformat()
+
+
+def _copy(bind, tickets, convert, stale_only=False):
+    """
+    Write convert(service_date) into service_date_new in id-ordered batches.
+    stale_only: only rows whose shadow value is missing or no longer matches
+    (written to while the backfill ran).
+    """
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(tickets.c.id, tickets.c.service_date, tickets.c.service_date_new)
+            .where(tickets.c.id > last_id)
+            .order_by(tickets.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            try:
+                value = convert(row.service_date)
+            except ValueError:
+                raise RuntimeError(
+                    f"service_tickets.id={row.id}: cannot convert service_date {row.service_date!r}"
+                )
+            if not stale_only or row.service_date_new != value:
+                updates.append({"row_id": row.id, "value": value})
+
+        if updates:
+            bind.execute(
+                tickets.update()
+                .where(tickets.c.id == sa.bindparam("row_id"))
+                .values(service_date_new=sa.bindparam("value")),
+                updates,
+            )
+        last_id = rows[-1].id
+
+
+def _swap_column(new_type, convert):
+    """
+    Online column type change for service_tickets.service_date:
+    1. add a nullable shadow column (no table rewrite)
+    2. backfill it in id-ordered batches, each committed on its own, so writers
+       are never blocked for longer than one batch
+    3. block writes, catch up rows inserted or updated during step 2, then
+       swap the columns, all while writes stay blocked; then rebuild the index
+    Steps 1-2 commit as they go, so a failed run can simply be started again.
+
+    Writes are blocked with LOCK TABLE on PostgreSQL (readers carry on) and
+    LOCK TABLES ... WRITE on MySQL/MariaDB (readers wait too; its DDL is not
+    transactional, so the lock is what keeps the swap atomic). Other databases
+    (SQLite) get no lock: run the migration there with writers stopped.
+    """
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("service_tickets")}
+    if "service_date_new" not in columns:
+        op.add_column("service_tickets", sa.Column("service_date_new", new_type, nullable=True))
+
+    tickets = sa.table(
+        "service_tickets",
+        sa.column("id", sa.Integer),
+        sa.column("service_date"),
+        sa.column("service_date_new", new_type),
+    )
+
+    with op.get_context().autocommit_block():
+        _copy(op.get_bind(), tickets, convert)
+
+    bind = op.get_bind()
+    mysql = bind.dialect.name in ("mysql", "mariadb")
+    if bind.dialect.name == "postgresql":
+        # readers carry on; writers wait until the swap commits
+        op.execute("LOCK TABLE service_tickets IN SHARE ROW EXCLUSIVE MODE")
+    elif mysql:
+        op.execute("LOCK TABLES service_tickets WRITE")
+    _copy(bind, tickets, convert, stale_only=True)
+
+    op.drop_index(INDEX_NAME, table_name="service_tickets")
+    with op.batch_alter_table("service_tickets") as batch_op:
+        batch_op.drop_column("service_date")
+        batch_op.alter_column(
+            "service_date_new",
+            new_column_name="service_date",
+            existing_type=new_type,
+            nullable=False,
+        )
+    if mysql:
+        op.execute("UNLOCK TABLES")
+
+    with op.get_context().autocommit_block():
+        op.create_index(INDEX_NAME, "service_tickets", ["service_date"], postgresql_concurrently=True)
+
+
+def upgrade():
+    _swap_column(sa.Date(), _parse_date)
+
+
+def downgrade():
+    _swap_column(sa.String(length=50), _format_date)
@@ -0,0 +1,87 @@
+"""add search indexes
+
+Revision ID: c7e2f9a41b86
+Revises: a3c9e5f17d20
+Create Date: 2026-10-17 17:05:12.736410
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2f9a41b86'
+down_revision = 'a3c9e5f17d20'
+branch_labels = None
+depends_on = None
+
+
+# (table, searchable columns); mirrors SEARCH_SOURCES in application/models/search.py
+SOURCES = [
+    ("customers", ["name", "phone"]),
+    ("inventory", ["name"]),
+    ("service_tickets", ["VIN"]),
+]
+
+
+def sqlite_statements(table, columns):
+    # Same DDL as application/models/search.py:sqlite_fts_ddl, frozen at this revision.
+    fts = f"{table}_search"
+    cols = ", ".join(f'"{c}"' for c in columns)
+    new = ", ".join(f'new."{c}"' for c in columns)
+    old = ", ".join(f'old."{c}"' for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        # index the rows that already exist
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def sqlite_has_trigram(bind):
+    return bind.dialect.dbapi.sqlite_version_info >= (3, 34, 0)
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        with op.get_context().autocommit_block():
+            for table, columns in SOURCES:
+                for column in columns:
+                    op.create_index(
+                        f"ix_{table}_{column}_trgm", table, [column],
+                        postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+                        postgresql_concurrently=True,
+                    )
+
+    elif bind.dialect.name == "sqlite" and sqlite_has_trigram(bind):
+        # Note: a later batch_alter_table on these tables drops their triggers
+        # (SQLite drops triggers with the table); recreate them afterwards.
+        for table, columns in SOURCES:
+            for statement in sqlite_statements(table, columns):
+                op.execute(statement)
+
+    # Other databases: GET /search/ uses the in-process n-gram index; nothing to create.
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for table, columns in reversed(SOURCES):
+                for column in columns:
+                    op.drop_index(f"ix_{table}_{column}_trgm", table_name=table, postgresql_concurrently=True)
+
+    elif bind.dialect.name == "sqlite":
+        for table, _ in reversed(SOURCES):
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_search")
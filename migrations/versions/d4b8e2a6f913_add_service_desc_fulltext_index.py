@@ -0,0 +1,72 @@
+"""add service_desc full-text index
+
+Revision ID: d4b8e2a6f913
+Revises: c7e2f9a41b86
+Create Date: 2026-10-17 18:20:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4b8e2a6f913'
+down_revision = 'c7e2f9a41b86'
+branch_labels = None
+depends_on = None
+
+
+# Must match TEXT_SEARCH_CONFIG / DESC_FTS_TABLE in application/models/search.py.
+TEXT_SEARCH_CONFIG = "english"
+FTS = "service_desc_search"
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_service_tickets_service_desc_fts", "service_tickets",
+                [sa.text(f"to_tsvector('{TEXT_SEARCH_CONFIG}', service_desc)")],
+                postgresql_using="gin", postgresql_concurrently=True,
+            )
+
+    elif bind.dialect.name == "sqlite":
+        # Same DDL as application/models/search.py:sqlite_fts_ddl, frozen at this revision.
+        op.execute(
+            f"CREATE VIRTUAL TABLE {FTS} USING fts5(\"service_desc\", content='service_tickets', "
+            f"content_rowid='id', tokenize='porter unicode61')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {FTS}_ai AFTER INSERT ON service_tickets BEGIN "
+            f"INSERT INTO {FTS}(rowid, \"service_desc\") VALUES (new.id, new.\"service_desc\"); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {FTS}_ad AFTER DELETE ON service_tickets BEGIN "
+            f"INSERT INTO {FTS}({FTS}, rowid, \"service_desc\") VALUES ('delete', old.id, old.\"service_desc\"); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {FTS}_au AFTER UPDATE ON service_tickets BEGIN "
+            f"INSERT INTO {FTS}({FTS}, rowid, \"service_desc\") VALUES ('delete', old.id, old.\"service_desc\"); "
+            f"INSERT INTO {FTS}(rowid, \"service_desc\") VALUES (new.id, new.\"service_desc\"); END"
+        )
+        # index the tickets that already exist
+        op.execute(f"INSERT INTO {FTS}({FTS}) VALUES ('rebuild')")
+
+    # Other databases: GET /service-tickets/search scans with LIKE; nothing to create.
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                "ix_service_tickets_service_desc_fts", table_name="service_tickets", postgresql_concurrently=True,
+            )
+
+    elif bind.dialect.name == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS}")
@@ -0,0 +1,59 @@
+"""add ticket line items and parts_total
+
+Revision ID: e5c1a9d7b362
+Revises: d4b8e2a6f913
+Create Date: 2026-10-17 19:42:18.306927
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c1a9d7b362'
+down_revision = 'd4b8e2a6f913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Plain ADD COLUMNs (server defaults fill existing rows); SQLite does not
+    # rebuild the tables, so the service_tickets FTS triggers stay in place.
+    op.add_column('service_ticket_inventory',
+                  sa.Column('quantity', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('service_ticket_inventory',
+                  sa.Column('unit_price', sa.Float(), server_default='0', nullable=False))
+    op.add_column('service_tickets',
+                  sa.Column('parts_total', sa.Float(), server_default='0', nullable=False))
+
+    # Existing lines are priced at today's catalogue price (the best record we have).
+    op.execute(
+        "UPDATE service_ticket_inventory SET unit_price = "
+        "(SELECT inventory.price FROM inventory WHERE inventory.id = service_ticket_inventory.inventory_id)"
+    )
+    op.execute(
+        "UPDATE service_tickets SET parts_total = "
+        "(SELECT ROUND(CAST(COALESCE(SUM(l.quantity * l.unit_price), 0) AS DECIMAL(14, 4)), 2) "
+        "FROM service_ticket_inventory l WHERE l.ticket_id = service_tickets.id)"
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index('ix_service_tickets_parts_total', 'service_tickets', ['parts_total'],
+                            unique=False, postgresql_concurrently=True)
+    else:
+        op.create_index('ix_service_tickets_parts_total', 'service_tickets', ['parts_total'], unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_service_tickets_parts_total', table_name='service_tickets',
+                          postgresql_concurrently=True)
+    else:
+        op.drop_index('ix_service_tickets_parts_total', table_name='service_tickets')
+
+    # SQLite 3.35+ drops columns in place (no table rebuild, triggers kept).
+    op.drop_column('service_tickets', 'parts_total')
+    op.drop_column('service_ticket_inventory', 'unit_price')
+    op.drop_column('service_ticket_inventory', 'quantity')
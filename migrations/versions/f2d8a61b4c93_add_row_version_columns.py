@@ -0,0 +1,32 @@
+"""add row version columns
+
+Revision ID: f2d8a61b4c93
+Revises: e61c4a8f0b29
+Create Date: 2026-10-17 12:52:09.604318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2d8a61b4c93'
+down_revision = 'e61c4a8f0b29'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ["customers", "mechanics", "inventory", "service_tickets"]
+
+
+def upgrade():
+    # server_default fills existing rows in the same statement; no backfill needed.
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,196 @@
+import shutil
+import socket
+import subprocess
+import threading
+import time
+import unittest
+
+from cachelib import SimpleCache
+from flask import Flask, jsonify
+from flask_caching import Cache
+
+from application import create_app, db
+from application.extensions import cache
+from application.utils.tagged_cache import TaggedCache
+from config import TestingConfig
+
+
+class TwoTierConfig(TestingConfig):
+    CACHE_LOCAL_MAX_ENTRIES = 8
+
+
+class CacheCoherenceMixin:
+    """
+    Two apps stand in for two gunicorn workers: each has its own local LRU tier,
+    both talk to the same shared cache backend and the same database.
+    """
+
+    def make_workers(self, config):
+        self.worker_a = create_app(config)
+        self.worker_b = create_app(config)
+
+        with self.worker_a.app_context():
+            db.drop_all()
+            db.create_all()
+
+        self.client_a = self.worker_a.test_client()
+        self.client_b = self.worker_b.test_client()
+
+    def tearDown(self):
+        for app in (self.worker_a, self.worker_b):
+            with app.app_context():
+                db.session.remove()
+                db.drop_all()
+                db.engine.dispose()
+
+    def create_ticket(self):
+        customer = self.client_a.post("/customers/", json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "1234567890",
+            "password": "securepassword123"
+        }).get_json()
+
+        response = self.client_a.post("/service-tickets/", json={
+            "VIN": "1HGBH41JXMN109186",
+            "service_date": "2026-01-01",
+            "service_desc": "Oil change",
+            "customer_id": customer["id"],
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.get_json()
+
+    def assert_write_in_one_worker_is_seen_by_the_other(self):
+        ticket = self.create_ticket()
+        url = f"/service-tickets/{ticket['id']}"
+
+        # worker A caches the ticket in both tiers, then serves it locally
+        self.client_a.get(url)
+        before = self.client_a.get("/metrics/cache").get_json()
+        self.client_a.get(url)
+        after = self.client_a.get("/metrics/cache").get_json()
+        self.assertEqual(after["local_hits"], before["local_hits"] + 1)
+
+        # worker B writes
+        response = self.client_b.put(url, json={"service_desc": "Brake job"})
+        self.assertEqual(response.status_code, 200)
+
+        # worker A's local copy is now stale and must not be served
+        self.assertEqual(self.client_a.get(url).get_json()["service_desc"], "Brake job")
+
+
+class TestTwoTierCache(CacheCoherenceMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.make_workers(TwoTierConfig)
+
+        shared = SimpleCache(default_timeout=60)
+        for app in (self.worker_a, self.worker_b):
+            app.extensions["cache"][cache] = shared
+
+    def test_write_in_one_worker_is_seen_by_the_other(self):
+        self.assert_write_in_one_worker_is_seen_by_the_other()
+
+
+@unittest.skipUnless(shutil.which("redis-server"), "redis-server not installed")
+class TestRedisCache(CacheCoherenceMixin, unittest.TestCase):
+
+    def setUp(self):
+        try:
+            import redis  # noqa: F401
+        except ImportError:
+            self.skipTest("redis package not installed")
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        self.redis_server = subprocess.Popen(
+            ["redis-server", "--port", str(port), "--save", "", "--appendonly", "no"],
+            stdout=subprocess.DEVNULL,
+        )
+        self.addCleanup(self.redis_server.wait)
+        self.addCleanup(self.redis_server.terminate)
+
+        for _ in range(50):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        class RedisConfig(TwoTierConfig):
+            CACHE_TYPE = "RedisCache"
+            CACHE_REDIS_URL = f"redis://127.0.0.1:{port}/0"
+
+        self.make_workers(RedisConfig)
+
+    def test_write_in_one_worker_is_seen_by_the_other(self):
+        self.assert_write_in_one_worker_is_seen_by_the_other()
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Exercises TaggedCache.cached() on a bare Flask app with a slow, counting view.
+    """
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.tagged = TaggedCache(Cache(self.app, config={"CACHE_TYPE": "SimpleCache"}))
+        self.tagged.init_app(self.app)
+
+        self.calls = 0
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+
+        @self.app.route("/slow")
+        @self.tagged.cached(tags=["slow"], timeout=1, stale_ttl=30)
+        def slow():
+            self.calls += 1
+            version = self.calls
+            self.entered.set()
+            self.gate.wait(5)
+            time.sleep(0.1)
+            return jsonify({"version": version})
+
+    def get_version(self):
+        return self.app.test_client().get("/slow").get_json()["version"]
+
+    def test_concurrent_misses_run_the_view_once(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.get_version())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [1] * 8)
+        self.assertGreaterEqual(self.tagged.stats()["coalesced"], 1)
+
+    def test_stale_value_served_while_revalidating(self):
+        self.assertEqual(self.get_version(), 1)
+        time.sleep(1.1)  # entry is now expired but inside stale_ttl
+
+        self.entered.clear()
+        self.gate.clear()
+        leader_result = []
+        leader = threading.Thread(target=lambda: leader_result.append(self.get_version()))
+        leader.start()
+        self.assertTrue(self.entered.wait(5))
+
+        # the rebuild is in progress: other requests get the previous value at once
+        self.assertEqual(self.get_version(), 1)
+        self.assertEqual(self.tagged.stats()["stale_served"], 1)
+
+        self.gate.set()
+        leader.join()
+        self.assertEqual(leader_result, [2])
+        self.assertEqual(self.get_version(), 2)
+
+    def test_invalidated_entry_is_not_served_stale(self):
+        self.assertEqual(self.get_version(), 1)
+        with self.app.app_context():
+            self.tagged.invalidate("slow")
+        self.assertEqual(self.get_version(), 2)
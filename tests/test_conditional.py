@@ -0,0 +1,159 @@
+import unittest
+
+from sqlalchemy import event, update
+
+from application import create_app, db
+from application.models.mechanic import Mechanic
+from config import TestingConfig
+
+
+class TestConditionalRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def create_mechanic(self, email="bob@garage.com"):
+        response = self.client.post("/mechanics/", json={
+            "name": "Bob Smith",
+            "email": email,
+            "phone": "1234567890",
+            "salary": 50000
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.get_json()
+
+    def mechanic_payload(self, name):
+        return {"name": name, "email": "bob@garage.com", "phone": "1234567890", "salary": 50000}
+
+    def test_if_none_match_returns_304_until_the_row_changes(self):
+        mechanic = self.create_mechanic()
+        url = f"/mechanics/{mechanic['id']}"
+
+        first = self.client.get(url)
+        etag = first.headers["ETag"]
+        self.assertNotIn("version", first.get_json())
+
+        not_modified = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.get_data(), b"")
+
+        self.client.put(url, json=self.mechanic_payload("Robert Smith"))
+
+        changed = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.get_json()["name"], "Robert Smith")
+
+    def test_if_match_guards_updates(self):
+        mechanic = self.create_mechanic()
+        url = f"/mechanics/{mechanic['id']}"
+        etag = self.client.get(url).headers["ETag"]
+
+        response = self.client.put(url, json=self.mechanic_payload("Robert Smith"), headers={"If-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+        # a second writer still holding the old ETag is refused
+        response = self.client.put(url, json=self.mechanic_payload("Bobby Smith"), headers={"If-Match": etag})
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.client.get(url).get_json()["name"], "Robert Smith")
+
+    def test_write_racing_another_write_gets_412(self):
+        mechanic = self.create_mechanic()
+        url = f"/mechanics/{mechanic['id']}"
+
+        def concurrent_write(session, flush_context, instances):
+            # another worker commits between our read and our UPDATE
+            session.execute(
+                update(Mechanic).where(Mechanic.id == mechanic["id"]).values(version=Mechanic.version + 1),
+                execution_options={"synchronize_session": False},
+            )
+
+        with self.app.app_context():
+            event.listen(db.session, "before_flush", concurrent_write)
+            try:
+                response = self.client.put(url, json=self.mechanic_payload("Robert Smith"))
+            finally:
+                event.remove(db.session, "before_flush", concurrent_write)
+
+        self.assertEqual(response.status_code, 412)
+
+    def test_ticket_etag_covers_nested_mechanics(self):
+        customer = self.client.post("/customers/", json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "1234567890",
+            "password": "securepassword123"
+        }).get_json()
+        ticket = self.client.post("/service-tickets/", json={
+            "VIN": "1HGCM82633A004352",
+            "service_date": "2025-02-18",
+            "service_desc": "Oil change",
+            "customer_id": customer["id"],
+        }).get_json()
+        mechanic = self.create_mechanic()
+        url = f"/service-tickets/{ticket['id']}"
+
+        etag = self.client.get(url).headers["ETag"]
+        self.client.put(f"{url}/assign-mechanic/{mechanic['id']}")
+
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+
+        # renaming the assigned mechanic changes the ticket's payload, so its ETag too
+        self.client.put(f"/mechanics/{mechanic['id']}", json=self.mechanic_payload("Robert Smith"))
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["mechanics"][0]["name"], "Robert Smith")
+
+        response = self.client.put(url, json={"service_desc": "Brakes"}, headers={"If-Match": etag})
+        self.assertEqual(response.status_code, 412)
+
+    def test_collection_etag_changes_when_a_row_is_added(self):
+        self.client.post("/inventory/", json={"name": "Oil Filter", "price": 12.99})
+
+        etag = self.client.get("/inventory/").headers["ETag"]
+        self.assertEqual(self.client.get("/inventory/", headers={"If-None-Match": etag}).status_code, 304)
+
+        self.client.post("/inventory/", json={"name": "Brake Pads", "price": 79.99})
+        response = self.client.get("/inventory/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["parts"]), 2)
+
+    def test_ticket_list_revalidates_from_the_cache(self):
+        customer_id = self.client.post("/customers/", json={
+            "name": "John Doe", "email": "john@example.com", "phone": "1", "password": "securepassword123"
+        }).get_json()["id"]
+        self.client.post("/service-tickets/", json={
+            "VIN": "VIN1", "service_date": "2026-01-02", "service_desc": "Brakes", "customer_id": customer_id
+        })
+
+        etag = self.client.get("/service-tickets/").headers["ETag"]
+
+        statements = []
+        with self.app.app_context():
+            log = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(db.engine, "before_cursor_execute", log)
+            try:
+                response = self.client.get("/service-tickets/", headers={"If-None-Match": etag})
+            finally:
+                event.remove(db.engine, "before_cursor_execute", log)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(statements, [])
+
+        self.client.put("/service-tickets/1", json={"service_desc": "Brakes and rotors"})
+        response = self.client.get("/service-tickets/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["tickets"][0]["service_desc"], "Brakes and rotors")
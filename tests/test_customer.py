@@ -1,5 +1,13 @@
 import unittest
+from time import sleep
+from unittest.mock import patch
+from jose import jwt
+from sqlalchemy import event, select
 from application import create_app, db
+from application.extensions import token_cache
+from application.models.customer import Customer
+from application.models.service_ticket import service_mechanics
+from application.utils.passwords import HashingBusy, hasher
 from config import TestingConfig
 
 class TestCustomers(unittest.TestCase):
@@ -84,6 +92,65 @@ class TestCustomers(unittest.TestCase):
 
         self.assertEqual(response.status_code, 401)
 
+    def test_login_sheds_load_when_hashing_pool_is_full(self):
+        self.client.post("/customers/", json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "1234567890",
+            "password": "securepassword123"
+        })
+
+        self.app.config["PASSWORD_HASH_MAX_PENDING"] = 0
+        response = self.client.post("/customers/login", json={
+            "email": "john@example.com",
+            "password": "securepassword123"
+        })
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+        self.assertGreaterEqual(self.client.get("/metrics/hashing").get_json()["rejected"], 1)
+
+    def test_hashing_timeout_answers_503_and_keeps_the_slot_until_the_job_ends(self):
+        self.app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=1, PASSWORD_HASH_TIMEOUT=0.5)
+        with self.app.app_context():
+            with self.assertRaises(HashingBusy):
+                hasher.run(sleep, 1.5)
+            # the abandoned job still occupies the pool, so the next one is shed
+            with self.assertRaises(HashingBusy):
+                hasher.run(sleep, 0)
+            self.assertEqual(hasher.stats()["pending"], 1)
+            self.assertGreaterEqual(hasher.stats()["timed_out"], 1)
+
+            for _ in range(100):
+                if hasher.stats()["pending"] == 0:
+                    break
+                sleep(0.05)
+            self.assertEqual(hasher.stats()["pending"], 0)
+
+    def test_login_upgrades_outdated_password_hash(self):
+        self.app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+        customer = self.client.post("/customers/", json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "1234567890",
+            "password": "securepassword123"
+        }).get_json()
+
+        with self.app.app_context():
+            old_hash = db.session.get(Customer, customer["id"]).password_hash
+        self.assertTrue(old_hash.startswith("pbkdf2:sha256:1000$"))
+
+        self.app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:2000"
+        response = self.client.post("/customers/login", json={
+            "email": "john@example.com",
+            "password": "securepassword123"
+        })
+        self.assertEqual(response.status_code, 200)
+
+        with self.app.app_context():
+            new_hash = db.session.get(Customer, customer["id"]).password_hash
+        self.assertTrue(new_hash.startswith("pbkdf2:sha256:2000$"))
+
     def test_get_customers_default_pagination(self):
         # create couple customers so list isn't empty
         self.client.post("/customers/", json={
@@ -132,6 +199,137 @@ class TestCustomers(unittest.TestCase):
         response = self.client.get("/customers/my-tickets")
         self.assertEqual(response.status_code, 401)
 
+    def login(self):
+        self.client.post("/customers/", json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "1234567890",
+            "password": "securepassword123"
+        })
+        return self.client.post("/customers/login", json={
+            "email": "john@example.com",
+            "password": "securepassword123"
+        }).get_json()["auth_token"]
+
+    def test_token_signature_is_verified_once(self):
+        headers = {"Authorization": f"Bearer {self.login()}"}
+
+        with patch("application.utils.util.jwt.decode", wraps=jwt.decode) as decode:
+            for _ in range(3):
+                self.assertEqual(self.client.get("/customers/my-tickets", headers=headers).status_code, 200)
+
+        self.assertEqual(decode.call_count, 1)
+
+    def test_logout_revokes_only_that_token(self):
+        token = self.login()
+        other_token = self.client.post("/customers/login", json={
+            "email": "john@example.com",
+            "password": "securepassword123"
+        }).get_json()["auth_token"]
+
+        headers = {"Authorization": f"Bearer {token}"}
+        self.assertEqual(self.client.get("/customers/my-tickets", headers=headers).status_code, 200)
+
+        response = self.client.post("/customers/logout", headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        # the already-verified token is still rejected
+        response = self.client.get("/customers/my-tickets", headers=headers)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json()["message"], "Token has been revoked.")
+
+        response = self.client.get("/customers/my-tickets", headers={"Authorization": f"Bearer {other_token}"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh_fails_after_logout(self):
+        self.login()
+        sessions = [
+            self.client.post("/customers/login", json={
+                "email": "john@example.com",
+                "password": "securepassword123"
+            }).get_json()
+            for _ in range(2)
+        ]
+        phone, laptop = sessions
+
+        # logging out with a refresh token ends that session only
+        headers = {"Authorization": f"Bearer {phone['auth_token']}"}
+        response = self.client.post("/customers/logout", headers=headers, json={"refresh_token": phone["refresh_token"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.post("/customers/refresh", json={"refresh_token": phone["refresh_token"]}).status_code, 401)
+        laptop_refresh = self.client.post("/customers/refresh", json={"refresh_token": laptop["refresh_token"]})
+        self.assertEqual(laptop_refresh.status_code, 200)
+
+        # without one, every refresh token of the customer goes
+        headers = {"Authorization": f"Bearer {laptop['auth_token']}"}
+        self.assertEqual(self.client.post("/customers/logout", headers=headers).status_code, 200)
+        response = self.client.post("/customers/refresh", json={"refresh_token": laptop_refresh.get_json()["refresh_token"]})
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_fails_after_password_change(self):
+        self.login()
+        session = self.client.post("/customers/login", json={
+            "email": "john@example.com",
+            "password": "securepassword123"
+        }).get_json()
+
+        response = self.client.put("/customers/me", headers={"Authorization": f"Bearer {session['auth_token']}"}, json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "password": "a-new-password"
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.post("/customers/refresh", json={"refresh_token": session["refresh_token"]}).status_code, 401)
+
+    def test_refresh_rotates_without_password_check(self):
+        self.login()
+        refresh_token = self.client.post("/customers/login", json={
+            "email": "john@example.com",
+            "password": "securepassword123"
+        }).get_json()["refresh_token"]
+
+        with patch("application.models.customer.verify_password") as verify:
+            response = self.client.post("/customers/refresh", json={"refresh_token": refresh_token})
+        verify.assert_not_called()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertNotEqual(data["refresh_token"], refresh_token)
+
+        headers = {"Authorization": f"Bearer {data['auth_token']}"}
+        self.assertEqual(self.client.get("/customers/my-tickets", headers=headers).status_code, 200)
+
+        # the new refresh token works once
+        response = self.client.post("/customers/refresh", json={"refresh_token": data["refresh_token"]})
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh_token_reuse_revokes_the_family(self):
+        self.login()
+        first = self.client.post("/customers/login", json={
+            "email": "john@example.com",
+            "password": "securepassword123"
+        }).get_json()["refresh_token"]
+
+        second = self.client.post("/customers/refresh", json={"refresh_token": first}).get_json()["refresh_token"]
+
+        # replaying the spent token fails and kills the token it was rotated into
+        response = self.client.post("/customers/refresh", json={"refresh_token": first})
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.post("/customers/refresh", json={"refresh_token": second})
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.post("/customers/refresh", json={"refresh_token": "not-a-token"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_with_in_memory_revocation_list(self):
+        self.app.config["TOKEN_REVOCATION_BACKEND"] = "memory"
+        token_cache.init_app(self.app)
+
+        headers = {"Authorization": f"Bearer {self.login()}"}
+        self.assertEqual(self.client.post("/customers/logout", headers=headers).status_code, 200)
+        self.assertEqual(self.client.get("/customers/my-tickets", headers=headers).status_code, 401)
+
     def test_my_tickets_only_returns_my_tickets(self):
         # ------------------------------------------------------------
         # Customer 1: create + login
@@ -197,7 +395,7 @@ class TestCustomers(unittest.TestCase):
             })
         self.assertEqual(my_tickets_response.status_code, 200)
 
-        tickets = my_tickets_response.get_json()
+        tickets = my_tickets_response.get_json()["tickets"]
         self.assertIsInstance(tickets, list)
         self.assertEqual(len(tickets), 1)
 
@@ -205,6 +403,46 @@ class TestCustomers(unittest.TestCase):
         for t in tickets:
             self.assertEqual(t["customer_id"], customer_1_id)
 
+        # same URL, other customer: the cached page must not leak across customers
+        my_tickets_response = self.client.get("/customers/my-tickets", headers={
+            "Authorization": f"Bearer {token_2}"
+            })
+        tickets = my_tickets_response.get_json()["tickets"]
+        self.assertEqual([t["customer_id"] for t in tickets], [customer_2_id])
+
+    def test_my_tickets_etag_until_my_tickets_change(self):
+        customer_id = self.client.post("/customers/", json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "1234567890",
+            "password": "securepassword123"
+        }).get_json()["id"]
+        token = self.client.post("/customers/login", json={
+            "email": "john@example.com",
+            "password": "securepassword123"
+        }).get_json()["auth_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        first = self.client.get("/customers/my-tickets", headers=headers)
+        self.assertEqual(first.status_code, 200)
+        self.assertIsNotNone(first.headers.get("ETag"))
+
+        not_modified = self.client.get("/customers/my-tickets", headers={**headers, "If-None-Match": first.headers["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.get_data(), b"")
+
+        self.client.post("/service-tickets/", json={
+            "VIN": "1HGCM82633A004352",
+            "service_date": "2025-02-18",
+            "service_desc": "Oil change",
+            "customer_id": customer_id,
+        })
+
+        changed = self.client.get("/customers/my-tickets", headers={**headers, "If-None-Match": first.headers["ETag"]})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.get_json()["count"], 1)
+        self.assertNotEqual(changed.headers["ETag"], first.headers["ETag"])
+
     def test_update_me_requires_auth_and_then_succeeds(self):
         #create customer
         self.client.post("/customers/", json={
@@ -271,4 +509,57 @@ class TestCustomers(unittest.TestCase):
 
         # confirm customer is gone
         get_deleted = self.client.get(f"/customers/{customer_id}")
-        self.assertEqual(get_deleted.status_code, 404)
\ No newline at end of file
+        self.assertEqual(get_deleted.status_code, 404)
+
+    def test_delete_me_cascades_tickets_in_the_database(self):
+        customer_id = self.client.post("/customers/", json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "1234567890",
+            "password": "securepassword123"
+        }).get_json()["id"]
+        token = self.client.post("/customers/login", json={
+            "email": "john@example.com",
+            "password": "securepassword123"
+        }).get_json()["auth_token"]
+
+        mechanic_id = self.client.post("/mechanics/", json={
+            "name": "Bob Smith",
+            "email": "bob@garage.com",
+            "phone": "1234567890",
+            "salary": 50000
+        }).get_json()["id"]
+
+        ticket_ids = []
+        for _ in range(3):
+            ticket_id = self.client.post("/service-tickets/", json={
+                "VIN": "1HGCM82633A004352",
+                "service_date": "2025-02-18",
+                "service_desc": "Cascade test",
+                "customer_id": customer_id,
+            }).get_json()["id"]
+            self.client.put(f"/service-tickets/{ticket_id}/assign-mechanic/{mechanic_id}")
+            ticket_ids.append(ticket_id)
+
+        statements = []
+        with self.app.app_context():
+            engine = db.engine
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = self.client.delete("/customers/me", headers={"Authorization": f"Bearer {token}"})
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        self.assertEqual(response.status_code, 204)
+        # the ORM never touches tickets or assignments; the database cascades
+        deletes = [sql for sql in statements if sql.lstrip().upper().startswith("DELETE")]
+        self.assertEqual(len(deletes), 1)
+        self.assertNotIn("service_tickets", " ".join(statements))
+
+        for ticket_id in ticket_ids:
+            self.assertEqual(self.client.get(f"/service-tickets/{ticket_id}").status_code, 404)
+
+        with self.app.app_context():
+            remaining = db.session.execute(select(service_mechanics)).all()
+        self.assertEqual(remaining, [])
@@ -0,0 +1,69 @@
+"""
+Index audit: every foreign key column must be the leading column of some index
+(plain index, primary key or unique constraint), both in the models and in the
+schema the Alembic migrations actually build. Otherwise reverse lookups and
+cascading deletes fall back to full table scans.
+"""
+import os
+import tempfile
+import unittest
+
+from flask_migrate import upgrade
+from sqlalchemy import inspect
+
+from application import create_app, db
+from config import TestingConfig
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "migrations")
+
+
+def unindexed_foreign_keys(engine) -> list:
+    """
+    Return "table(columns)" for every foreign key with no covering index.
+    """
+    inspector = inspect(engine)
+    missing = []
+
+    for table in inspector.get_table_names():
+        if table == "alembic_version":
+            continue
+
+        leading = [inspector.get_pk_constraint(table)["constrained_columns"]]
+        leading += [ix["column_names"] for ix in inspector.get_indexes(table)]
+        leading += [uq["column_names"] for uq in inspector.get_unique_constraints(table)]
+
+        for fk in inspector.get_foreign_keys(table):
+            columns = fk["constrained_columns"]
+            if not any(cols[:len(columns)] == columns for cols in leading):
+                missing.append(f"{table}({', '.join(columns)})")
+
+    return missing
+
+
+class TestIndexAudit(unittest.TestCase):
+
+    def test_models_index_every_foreign_key(self):
+        app = create_app(TestingConfig)
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            try:
+                self.assertEqual(unindexed_foreign_keys(db.engine), [])
+            finally:
+                db.session.remove()
+                db.drop_all()
+                db.engine.dispose()
+
+    def test_migrations_index_every_foreign_key(self):
+        with tempfile.TemporaryDirectory() as tmp:
+
+            class MigratedConfig(TestingConfig):
+                SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'migrated.db')}"
+
+            app = create_app(MigratedConfig)
+            with app.app_context():
+                try:
+                    upgrade(directory=MIGRATIONS_DIR)
+                    self.assertEqual(unindexed_foreign_keys(db.engine), [])
+                finally:
+                    db.engine.dispose()
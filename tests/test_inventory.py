@@ -1,4 +1,9 @@
+import io
+import json
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
 from application import create_app, db
 from config import TestingConfig
@@ -41,8 +46,8 @@ class TestInventory(unittest.TestCase):
         self.assertEqual(res.status_code, 200)
 
         data = res.get_json()
-        self.assertIsInstance(data, list)
-        self.assertGreaterEqual(len(data), 2)
+        self.assertIsInstance(data["parts"], list)
+        self.assertGreaterEqual(len(data["parts"]), 2)
 
     def test_get_part_by_id(self):
         part = self.create_part(name="Air Filter")
@@ -64,3 +69,65 @@ class TestInventory(unittest.TestCase):
         # confirm gone
         get_res = self.client.get(f"/inventory/{part['id']}")
         self.assertEqual(get_res.status_code, 404)
+
+    def parts_by_name(self):
+        return {part["name"]: part["price"] for part in self.client.get("/inventory/").get_json()["parts"]}
+
+    def test_import_csv_upserts_and_reports_counts(self):
+        self.create_part("Oil Filter", 12.99)
+        self.create_part("Brake Pads", 79.99)
+        self.app.config["IMPORT_CHUNK_SIZE"] = 2  # several transactions
+
+        body = "name,price,sku\nOil Filter,14.50,A1\nBrake Pads,79.99,B2\nSpark Plug,4.25,C3\nWiper,abc,D4\n"
+        res = self.client.post("/inventory/import", data=body, content_type="text/csv")
+        self.assertEqual(res.status_code, 200)
+        report = res.get_json()
+        self.assertEqual(
+            {key: report[key] for key in ("inserted", "updated", "unchanged", "rejected")},
+            {"inserted": 1, "updated": 1, "unchanged": 1, "rejected": 1},
+        )
+        self.assertEqual(report["errors"][0]["row"], 4)
+        self.assertEqual(self.parts_by_name(), {"Oil Filter": 14.5, "Brake Pads": 79.99, "Spark Plug": 4.25})
+
+    def test_import_json_array_and_ndjson(self):
+        parts = [{"name": f"Part {i}", "price": i + 0.5} for i in range(5)]
+
+        with patch("application.blueprints.inventory.importer.READ_SIZE", 7):  # objects split across reads
+            res = self.client.post("/inventory/import", data=json.dumps(parts), content_type="application/json")
+        self.assertEqual(res.get_json()["inserted"], 5)
+
+        ndjson = "\n".join(json.dumps({**part, "price": part["price"] * 2}) for part in parts[:2])
+        res = self.client.post("/inventory/import", data=ndjson, content_type="application/x-ndjson")
+        self.assertEqual(res.get_json()["updated"], 2)
+        self.assertEqual(self.parts_by_name()["Part 1"], 3.0)
+
+        res = self.client.post("/inventory/import", data='[{"name": "Broken", ', content_type="application/json")
+        self.assertEqual(res.status_code, 400)
+
+    def test_import_reports_rows_applied_before_a_malformed_record(self):
+        self.app.config["IMPORT_CHUNK_SIZE"] = 2
+        lines = [json.dumps({"name": f"Part {i}", "price": 1.5}) for i in range(3)] + ['{"name": "Broken", ']
+
+        res = self.client.post("/inventory/import", data="\n".join(lines), content_type="application/x-ndjson")
+        self.assertEqual(res.status_code, 400)
+        report = res.get_json()
+        self.assertEqual(report["failed_at_row"], 4)
+        self.assertEqual(report["inserted"], 3)
+        self.assertIn("Malformed JSON", report["error"])
+        self.assertEqual(sorted(self.parts_by_name()), ["Part 0", "Part 1", "Part 2"])
+
+    def test_import_multipart_upload_and_cli(self):
+        upload = {"file": (io.BytesIO(b"name,price\nOil Filter,12.99\n"), "catalogue.csv")}
+        res = self.client.post("/inventory/import", data=upload, content_type="multipart/form-data")
+        self.assertEqual(res.get_json()["inserted"], 1)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("name,price\nOil Filter,13.99\nBrake Pads,79.99\n")
+        try:
+            result = self.app.test_cli_runner().invoke(args=["inventory", "import", f.name])
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("inserted: 1, updated: 1", result.output)
+        self.assertEqual(self.parts_by_name(), {"Oil Filter": 13.99, "Brake Pads": 79.99})
@@ -113,8 +113,8 @@ class TestMechanics(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
 
         data = response.get_json()
-        self.assertIsInstance(data, list)
-        self.assertGreaterEqual(len(data), 1)
+        self.assertIsInstance(data["mechanics"], list)
+        self.assertGreaterEqual(len(data["mechanics"]), 1)
 
     def test_get_mechanic_by_id_success(self):
         # ------------------------------------------------------------
@@ -147,4 +147,61 @@ class TestMechanics(unittest.TestCase):
     def test_get_mechanic_by_id_404(self):
         # Negative: mechanic doesn't exist
         response = self.client.get("/mechanics/999999")
-        self.assertEqual(response.status_code, 404)
\ No newline at end of file
+        self.assertEqual(response.status_code, 404)
+
+    def test_most_tickets_ranking_limit_and_date_window(self):
+        customer_id = self.client.post("/customers/", json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "1234567890",
+            "password": "securepassword123"
+        }).get_json()["id"]
+
+        mechanic_ids = []
+        for email in ("a@garage.com", "b@garage.com", "c@garage.com"):
+            mechanic_ids.append(self.client.post("/mechanics/", json={
+                "name": "Mechanic",
+                "email": email,
+                "phone": "1234567890",
+                "salary": 50000
+            }).get_json()["id"])
+        a, b, c = mechanic_ids
+
+        ticket_ids = []
+        for service_date in ("2026-01-05", "2026-02-05", "2026-03-05"):
+            ticket_ids.append(self.client.post("/service-tickets/", json={
+                "VIN": "VIN-RANK",
+                "service_date": service_date,
+                "service_desc": "Ranking test",
+                "customer_id": customer_id,
+            }).get_json()["id"])
+
+        # b works every ticket, a only the January one, c none
+        self.client.put(f"/service-tickets/{ticket_ids[0]}/assign-mechanic/{a}")
+        for ticket_id in ticket_ids:
+            self.client.put(f"/service-tickets/{ticket_id}/assign-mechanic/{b}")
+
+        data = self.client.get("/mechanics/most-tickets").get_json()
+        self.assertEqual([(m["id"], m["tickets_count"]) for m in data], [(b, 3), (a, 1), (c, 0)])
+
+        data = self.client.get("/mechanics/most-tickets?limit=1").get_json()
+        self.assertEqual([m["id"] for m in data], [b])
+
+        data = self.client.get("/mechanics/most-tickets?from=2026-02-01&to=2026-12-31").get_json()
+        self.assertEqual([(m["id"], m["tickets_count"]) for m in data], [(b, 2), (a, 0), (c, 0)])
+
+        # cached leaderboard follows assign / remove
+        self.client.put(f"/service-tickets/{ticket_ids[1]}/assign-mechanic/{c}")
+        self.client.put(f"/service-tickets/{ticket_ids[2]}/assign-mechanic/{c}")
+        self.client.put(f"/service-tickets/{ticket_ids[0]}/remove-mechanic/{b}")
+        data = self.client.get("/mechanics/most-tickets").get_json()
+        self.assertEqual([(m["id"], m["tickets_count"]) for m in data], [(b, 2), (c, 2), (a, 1)])
+
+        # windowed counts are cached too, and dropped on the same changes
+        data = self.client.get("/mechanics/most-tickets?from=2026-02-01&to=2026-12-31").get_json()
+        self.assertEqual([(m["id"], m["tickets_count"]) for m in data], [(b, 2), (c, 2), (a, 0)])
+
+    def test_most_tickets_rejects_bad_params(self):
+        self.assertEqual(self.client.get("/mechanics/most-tickets?limit=0").status_code, 400)
+        self.assertEqual(self.client.get("/mechanics/most-tickets?from=yesterday").status_code, 400)
+        self.assertEqual(self.client.get("/mechanics/most-tickets?from=2026-02-01&to=2026-01-01").status_code, 400)
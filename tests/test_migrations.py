@@ -0,0 +1,95 @@
+"""
+Data-carrying migration checks: run the Alembic chain against a scratch SQLite
+database with rows in place and confirm they survive the conversion.
+"""
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+from alembic.runtime.migration import MigrationContext
+from flask_migrate import upgrade, downgrade
+from sqlalchemy import text
+
+from application import create_app, db
+from config import TestingConfig
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "migrations")
+
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+        class MigratedConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(self.tmp.name, 'migrated.db')}"
+
+        self.app = create_app(MigratedConfig)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.engine.dispose()
+        self.tmp.cleanup()
+
+    def insert_tickets(self, conn, tickets):
+        for ticket_id, service_date in tickets:
+            conn.execute(text(
+                "INSERT INTO service_tickets (id, \"VIN\", service_date, service_desc, customer_id) "
+                "VALUES (:id, 'VIN', :service_date, 'desc', 1)"
+            ), {"id": ticket_id, "service_date": service_date})
+
+    def seed(self):
+        upgrade(directory=MIGRATIONS_DIR, revision="8d2f4b6a1c07")
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO customers (id, name, email, phone, password_hash) "
+                "VALUES (1, 'a', 'a@example.com', '1', 'x')"
+            ))
+            self.insert_tickets(conn, [(1, "2026-01-05"), (2, "02/07/2026"), (3, "2026-03-01T10:00:00")])
+
+    def test_service_date_backfill_converts_text_dates(self):
+        with self.app.app_context():
+            self.seed()
+
+            upgrade(directory=MIGRATIONS_DIR, revision="b47e0d91f3a5")
+
+            with db.engine.connect() as conn:
+                rows = conn.execute(text(
+                    "SELECT id FROM service_tickets WHERE service_date BETWEEN '2026-02-01' AND '2026-03-31' ORDER BY id"
+                )).scalars().all()
+            self.assertEqual(rows, [2, 3])
+
+            downgrade(directory=MIGRATIONS_DIR, revision="8d2f4b6a1c07")
+
+            with db.engine.connect() as conn:
+                dates = conn.execute(text("SELECT service_date FROM service_tickets ORDER BY id")).scalars().all()
+            self.assertEqual(dates, ["2026-01-05", "2026-02-07", "2026-03-01"])
+
+    def test_writes_during_backfill_are_caught_up_before_the_swap(self):
+        original = MigrationContext.autocommit_block
+        blocks = []
+
+        @contextmanager
+        def write_after_backfill(context):
+            with original(context):
+                yield
+            blocks.append(context)
+            if len(blocks) == 1:
+                # another client writes between the batched backfill and the swap
+                with db.engine.begin() as conn:
+                    self.insert_tickets(conn, [(4, "04/10/2026")])
+                    conn.execute(text("UPDATE service_tickets SET service_date = '2026-05-20' WHERE id = 1"))
+
+        with self.app.app_context():
+            self.seed()
+            with mock.patch.object(MigrationContext, "autocommit_block", write_after_backfill):
+                upgrade(directory=MIGRATIONS_DIR, revision="b47e0d91f3a5")
+
+            with db.engine.connect() as conn:
+                dates = conn.execute(text("SELECT id, service_date FROM service_tickets ORDER BY id")).all()
+            self.assertEqual(
+                [(ticket_id, str(service_date)) for ticket_id, service_date in dates],
+                [(1, "2026-05-20"), (2, "2026-02-07"), (3, "2026-03-01"), (4, "2026-04-10")],
+            )
@@ -0,0 +1,158 @@
+import unittest
+from unittest.mock import patch
+
+from application import create_app, db
+from application.models.customer import Customer
+from application.models.inventory import Inventory
+from application.models.mechanic import Mechanic
+from application.utils.util import encode_token
+from config import TestingConfig
+
+
+class TestListings(unittest.TestCase):
+    """
+    The shared list toolkit (limit/cursor, sort, prefix filters, total) on every
+    collection endpoint.
+    """
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        db.drop_all()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.ctx.pop()
+
+    def walk(self, url, key):
+        """
+        Follow next_cursor to the end; return every item in order.
+        """
+        items = []
+        separator = "&" if "?" in url else "?"
+        next_url = url
+        while next_url:
+            response = self.client.get(next_url)
+            self.assertEqual(response.status_code, 200, response.get_json())
+            data = response.get_json()
+            items.extend(data[key])
+            next_url = f"{url}{separator}cursor={data['next_cursor']}" if data["next_cursor"] else None
+        return items
+
+    def test_sorted_pages_walk_ties_in_id_order(self):
+        names = ["Carl", "Amy", "Bob", "Amy", "Bob", "Amy"]
+        db.session.add_all([
+            Mechanic(name=name, email=f"m{i}@garage.com", salary=50000) for i, name in enumerate(names)
+        ])
+        db.session.commit()
+        rows = db.session.query(Mechanic.id, Mechanic.name).all()
+
+        walked = self.walk("/mechanics/?sort=name&limit=2", "mechanics")
+        self.assertEqual(
+            [(m["id"], m["name"]) for m in walked],
+            sorted(rows, key=lambda row: (row.name, row.id)),
+        )
+
+        walked = self.walk("/mechanics/?sort=-name&limit=4", "mechanics")
+        self.assertEqual(
+            [(m["id"], m["name"]) for m in walked],
+            sorted(rows, key=lambda row: (row.name, row.id), reverse=True),
+        )
+
+        walked = self.walk("/mechanics/?sort=-id&limit=5", "mechanics")
+        self.assertEqual([m["id"] for m in walked], sorted((row.id for row in rows), reverse=True))
+
+    def test_prefix_filters_escape_wildcards(self):
+        db.session.add_all([
+            Inventory(name="Brake Pads", price=79.99),
+            Inventory(name="Brake_Fluid", price=9.99),
+            Inventory(name="BrakeXFluid", price=9.99),
+            Inventory(name="Oil Filter", price=12.99),
+        ])
+        db.session.commit()
+
+        names = [p["name"] for p in self.client.get("/inventory/?name=Brake").get_json()["parts"]]
+        self.assertEqual(sorted(names), ["Brake Pads", "BrakeXFluid", "Brake_Fluid"])
+
+        names = [p["name"] for p in self.client.get("/inventory/?name=Brake_").get_json()["parts"]]
+        self.assertEqual(names, ["Brake_Fluid"])
+
+    def test_customers_sort_filter_and_total(self):
+        db.session.add_all([
+            Customer(name=f"Customer {i}", email=f"{'vip' if i % 2 else 'c'}{i}@example.com", password_hash="x")
+            for i in range(7)
+        ])
+        db.session.commit()
+
+        data = self.client.get("/customers/?email=vip&sort=-email&limit=2&total=true").get_json()
+        self.assertEqual(data["total_count"], 3)
+        self.assertTrue(data["total_exact"])
+        self.assertEqual([c["email"] for c in data["customers"]], ["vip5@example.com", "vip3@example.com"])
+        self.assertNotIn("total_count", self.client.get("/customers/").get_json())
+
+        self.app.config["TOTAL_COUNT_LIMIT"] = 5
+        data = self.client.get("/customers/?total=1").get_json()
+        self.assertEqual((data["total_count"], data["total_exact"]), (5, False))
+
+    def test_total_estimate_only_for_unfiltered_queries(self):
+        customers = [Customer(name=name, email=f"{name}@example.com", password_hash="x") for name in ("ann", "ben")]
+        db.session.add_all(customers)
+        db.session.commit()
+        for customer, count in zip(customers, (1, 2)):
+            for i in range(count):
+                self.client.post("/service-tickets/", json={
+                    "VIN": f"VIN{i}", "service_date": "2026-01-02",
+                    "service_desc": "Oil change", "customer_id": customer.id,
+                })
+
+        # as if the planner statistics (PostgreSQL/MySQL) said 1000 rows
+        with patch("application.utils.pagination.estimated_rows", return_value=1000):
+            data = self.client.get("/service-tickets/?total=1").get_json()
+            self.assertEqual((data["total_count"], data["total_exact"]), (1000, False))
+
+            data = self.client.get("/service-tickets/?total=1&from=2026-01-01").get_json()
+            self.assertEqual((data["total_count"], data["total_exact"]), (3, True))
+
+            headers = {"Authorization": f"Bearer {encode_token(customers[0].id)}"}
+            data = self.client.get("/customers/my-tickets?total=1", headers=headers).get_json()
+            self.assertEqual((data["total_count"], data["total_exact"]), (1, True))
+
+    def test_tickets_sort_by_unselected_column(self):
+        customer = Customer(name="John Doe", email="john@example.com", password_hash="x")
+        db.session.add(customer)
+        db.session.commit()
+        for day in (3, 1, 2, 1):
+            response = self.client.post("/service-tickets/", json={
+                "VIN": f"VIN{day}", "service_date": f"2026-01-0{day}",
+                "service_desc": "Oil change", "customer_id": customer.id,
+            })
+            self.assertEqual(response.status_code, 201)
+
+        walked = self.walk("/service-tickets/?sort=service_date&fields=VIN&limit=1", "tickets")
+        self.assertEqual([t["VIN"] for t in walked], ["VIN1", "VIN1", "VIN2", "VIN3"])
+        self.assertEqual(set(walked[0]), {"id", "VIN"})
+
+    def test_bad_sort_and_mismatched_cursor(self):
+        db.session.add_all([Mechanic(name=f"M{i}", email=f"m{i}@garage.com", salary=1) for i in range(3)])
+        db.session.commit()
+
+        self.assertEqual(self.client.get("/mechanics/?sort=salary").status_code, 400)
+
+        cursor = self.client.get("/mechanics/?sort=name&limit=1").get_json()["next_cursor"]
+        self.assertEqual(self.client.get(f"/mechanics/?cursor={cursor}").status_code, 400)
+        self.assertEqual(self.client.get(f"/mechanics/?sort=name&cursor={cursor}").status_code, 200)
+
+    def test_lists_are_bounded_by_default(self):
+        db.session.add_all([Inventory(name=f"Part {i}", price=1.0) for i in range(15)])
+        db.session.commit()
+
+        data = self.client.get("/inventory/").get_json()
+        self.assertEqual(data["count"], self.app.config["DEFAULT_PAGE_SIZE"])
+        self.assertIsNotNone(data["next_cursor"])
+        self.assertEqual(self.client.get("/inventory/?limit=1000").status_code, 400)
@@ -0,0 +1,241 @@
+import threading
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from application import create_app, db
+from application.models.customer import Customer
+from application.models.inventory import Inventory
+from application.models.service_ticket import ServiceTicket
+from application.blueprints.search import index as search_index
+from application.blueprints.tickets import fulltext
+from config import TestingConfig
+
+
+class TestSearch(unittest.TestCase):
+    """
+    GET /search/ on SQLite's FTS5 tables (the test database) and on the
+    in-process n-gram index (SEARCH_BACKEND = "ngram").
+    """
+
+    backend = "auto"
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.app.config["SEARCH_BACKEND"] = self.backend
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        db.drop_all()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.john = Customer(name="John Doe", email="john@example.com", phone="555-0142", password_hash="x")
+        self.joanna = Customer(name="Joanna Johnson", email="joanna@example.com", phone="555-9876", password_hash="x")
+        db.session.add_all([
+            self.john, self.joanna,
+            Inventory(name="Brake Pads", price=79.99),
+            Inventory(name="Oil Filter", price=12.99),
+        ])
+        db.session.flush()
+        db.session.add(ServiceTicket(VIN="1HGCM82633A004352", service_date=date(2026, 1, 2),
+                                     service_desc="Oil change", customer_id=self.john.id))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.ctx.pop()
+
+    def search(self, q, **params):
+        response = self.client.get("/search/", query_string={"q": q, **params})
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json()
+
+    def names(self, data, kind="customers"):
+        return [item["name"] for item in data[kind]]
+
+    def test_substring_matches_rank_prefix_first(self):
+        data = self.search("john")
+        self.assertEqual(data["backend"], "sqlite" if self.backend == "auto" else "ngram")
+        self.assertEqual(self.names(data), ["John Doe", "Joanna Johnson"])
+        self.assertEqual(data["parts"], [])
+
+        self.assertEqual(self.names(self.search("0142")), ["John Doe"])
+        self.assertEqual(self.names(self.search("filt", types="parts"), "parts"), ["Oil Filter"])
+        self.assertEqual(self.search("82633A", types="tickets")["tickets"][0]["VIN"], "1HGCM82633A004352")
+
+    def test_short_query_is_a_prefix_lookup(self):
+        data = self.search("Jo", types="customers")
+        self.assertEqual(sorted(self.names(data)), ["Joanna Johnson", "John Doe"])
+        self.assertNotIn("parts", data)
+
+    def test_index_follows_writes(self):
+        self.search("john")  # builds the n-gram index when that backend is used
+
+        self.john.name = "Jonathan Doe"
+        db.session.add(Inventory(name="Johnson Rod", price=5.0))
+        db.session.commit()
+
+        self.assertEqual(self.names(self.search("jonathan")), ["Jonathan Doe"])
+        self.assertEqual(self.names(self.search("johnson", types="parts"), "parts"), ["Johnson Rod"])
+
+        # deleting the customer cascades to their ticket (ON DELETE CASCADE)
+        db.session.execute(Customer.__table__.delete().where(Customer.id == self.john.id))
+        db.session.commit()
+        self.assertEqual(self.search("82633A", types="tickets")["tickets"], [])
+
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get("/search/").status_code, 400)
+        self.assertEqual(self.client.get("/search/?q=john&types=mechanics").status_code, 400)
+        self.assertEqual(self.client.get(f"/search/?q={'x' * 101}").status_code, 400)
+        self.assertEqual(self.client.get("/search/?q=john&limit=0").status_code, 400)
+
+
+class TestNgramSearch(TestSearch):
+
+    backend = "ngram"
+
+    def test_fuzzy_match_tolerates_typos(self):
+        self.assertEqual(self.names(self.search("Jonh"))[0], "John Doe")
+        self.assertEqual(self.names(self.search("Brkae Pads", types="parts"), "parts"), ["Brake Pads"])
+
+
+    def test_rebuilds_do_not_disturb_concurrent_searches(self):
+        db.session.add_all([
+            Customer(name=f"Johnny {i}", email=f"johnny{i}@example.com", password_hash="x") for i in range(300)
+        ])
+        db.session.commit()
+        search_index.ngram_index("customers")
+
+        errors = []
+        done = threading.Event()
+
+        def in_app(work):
+            def run():
+                with self.app.app_context():
+                    try:
+                        work()
+                    except Exception as e:
+                        errors.append(e)
+                    finally:
+                        db.session.remove()
+            return threading.Thread(target=run)
+
+        def search():
+            while not done.is_set():
+                search_index.ngram_index("customers").search("johnny 1", 10)
+
+        def rebuild():
+            try:
+                for _ in range(30):
+                    search_index.mark_stale("customers")
+                    search_index.ngram_index("customers")
+            finally:
+                done.set()
+
+        threads = [in_app(search) for _ in range(4)] + [in_app(rebuild)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        johnny = db.session.query(Customer.id).filter_by(name="Johnny 150").scalar()
+        self.assertEqual(search_index.ngram_index("customers").search("johnny 150", 1), [johnny])
+
+
+class TestTicketSearch(unittest.TestCase):
+    """
+    GET /service-tickets/search: full-text search over service_desc (FTS5 on
+    the SQLite test database; the LIKE fallback with the backend patched).
+    """
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        db.drop_all()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        customer = Customer(name="John Doe", email="john@example.com", password_hash="x")
+        db.session.add(customer)
+        db.session.flush()
+        descriptions = [
+            ("VIN1", 1, "Replaced front brake pads and rotors"),
+            ("VIN2", 2, "Oil change and filter"),
+            ("VIN3", 3, "Brakes squealing; bled brake lines, new brake fluid"),
+            ("XYZ4", 4, "Tire rotation, checked brakes"),
+        ]
+        self.tickets = [
+            ServiceTicket(VIN=vin, service_date=date(2026, 1, day), service_desc=desc, customer_id=customer.id)
+            for vin, day, desc in descriptions
+        ]
+        db.session.add_all(self.tickets)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.ctx.pop()
+
+    def search(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json()
+
+    def walk(self, url):
+        items, next_url = [], url
+        while next_url:
+            data = self.search(next_url)
+            items.extend(data["tickets"])
+            next_url = f"{url}&cursor={data['next_cursor']}" if data["next_cursor"] else None
+        return items
+
+    def test_ranked_stemmed_matches_with_snippets(self):
+        data = self.search("/service-tickets/search?q=brake")
+        self.assertEqual(data["backend"], "sqlite")
+        vins = [t["VIN"] for t in data["tickets"]]
+        self.assertEqual(vins[0], "VIN3")  # most occurrences
+        self.assertEqual(sorted(vins), ["VIN1", "VIN3", "XYZ4"])  # "brakes" stems to "brake"
+        self.assertIn("**brake**", data["tickets"][0]["snippet"])
+
+        self.assertEqual(self.search("/service-tickets/search?q=brake fluid")["count"], 1)
+        self.assertEqual(self.search("/service-tickets/search?q=transmission")["tickets"], [])
+
+    def test_filters_pagination_and_fields(self):
+        walked = self.walk("/service-tickets/search?q=brakes&limit=1")
+        self.assertEqual(walked, self.search("/service-tickets/search?q=brakes")["tickets"])
+
+        data = self.search("/service-tickets/search?q=brake&VIN=VIN&from=2026-01-02&fields=VIN")
+        self.assertEqual([t["VIN"] for t in data["tickets"]], ["VIN3"])
+        self.assertEqual(set(data["tickets"][0]), {"id", "VIN", "snippet"})
+
+    def test_index_follows_writes(self):
+        self.tickets[1].service_desc = "Oil change; brake inspection"
+        db.session.delete(self.tickets[0])
+        db.session.commit()
+
+        vins = {t["VIN"] for t in self.search("/service-tickets/search?q=brake")["tickets"]}
+        self.assertEqual(vins, {"VIN2", "VIN3", "XYZ4"})
+        self.assertEqual(self.search("/service-tickets/search?q=rotors")["tickets"], [])
+
+    def test_like_fallback(self):
+        with patch.object(fulltext, "backend", return_value="like"):
+            data = self.search("/service-tickets/search?q=BRAKE lines")
+        self.assertEqual(data["backend"], "like")
+        self.assertEqual([t["VIN"] for t in data["tickets"]], ["VIN3"])
+        self.assertIn("**lines,**", data["tickets"][0]["snippet"])
+
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get("/service-tickets/search").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/search?q=%20;").status_code, 400)
+        self.assertEqual(self.client.get(f"/service-tickets/search?q={'x' * 201}").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/search?q=oil&from=nope").status_code, 400)
+
+        cursor = self.client.get("/service-tickets/?limit=1").get_json()["next_cursor"]
+        self.assertEqual(self.client.get(f"/service-tickets/search?q=oil&cursor={cursor}").status_code, 400)
@@ -0,0 +1,112 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from flask import jsonify
+from sqlalchemy import select
+
+from application import create_app, db
+from application.blueprints.mechanics.schemas import mechanics_compiled, mechanics_schema
+from application.blueprints.tickets.schemas import tickets_compiled, tickets_schema
+from application.models.customer import Customer
+from application.models.inventory import Inventory
+from application.models.mechanic import Mechanic
+from application.models.service_ticket import ServiceTicket
+from application.utils import serializer
+from application.utils.serializer import json_response
+from config import TestingConfig
+
+
+class TestCompiledSerializer(unittest.TestCase):
+    """
+    The compiled path must produce byte-for-byte what schema.jsonify() did.
+    """
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.app.debug = False  # compact JSON, as in production (the orjson path)
+        self.ctx = self.app.test_request_context()
+        self.ctx.push()
+
+        db.drop_all()
+        db.create_all()
+
+        customer = Customer(name="John Doe", email="john@example.com", phone=None, password_hash="x")
+        mechanics = [
+            Mechanic(name="Bob", email="bob@garage.com", phone="1", salary=50000.5),
+            Mechanic(name="Zoë", email="zoe@garage.com", phone="2", salary=1e20),
+        ]
+        parts = [Inventory(name="Oil Filter", price=12.99), Inventory(name="Brake Pads", price=0.0)]
+        db.session.add_all([customer, *mechanics, *parts])
+        db.session.flush()
+
+        self.tickets = [
+            ServiceTicket(VIN="VIN1", service_date=date(2026, 1, 2), service_desc="Oil change",
+                          customer_id=customer.id, mechanics=[mechanics[0]], parts=parts),
+            ServiceTicket(VIN="VIN2", service_date=date(2026, 1, 3), service_desc="Brakes",
+                          customer_id=customer.id, mechanics=mechanics),
+            ServiceTicket(VIN="VIN3", service_date=date(2026, 1, 4), service_desc="Idle",
+                          customer_id=customer.id),
+        ]
+        db.session.add_all(self.tickets)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.ctx.pop()
+
+    def assert_same_bytes(self, expected, actual):
+        self.assertEqual(actual.get_data(), expected.get_data())
+        self.assertEqual(actual.mimetype, expected.mimetype)
+
+    def test_tickets_match_marshmallow(self):
+        expected = jsonify({"tickets": tickets_schema.dump(db.session.execute(
+            select(ServiceTicket).order_by(ServiceTicket.id)).scalars().all())})
+
+        rows = db.session.execute(tickets_compiled.select().order_by(ServiceTicket.id)).all()
+        actual = json_response({"tickets": tickets_compiled.dump(rows)})
+
+        self.assert_same_bytes(expected, actual)
+
+    def test_orjson_and_stdlib_paths_agree(self):
+        rows = db.session.execute(mechanics_compiled.select().where(Mechanic.name == "Bob")).all()
+        payload = mechanics_compiled.dump(rows)
+        expected = mechanics_schema.jsonify(db.session.execute(
+            select(Mechanic).where(Mechanic.name == "Bob")).scalars().all())
+
+        self.assert_same_bytes(expected, json_response(payload))
+        with patch.object(serializer, "orjson", None):
+            self.assert_same_bytes(expected, json_response(payload))
+
+    def test_non_ascii_and_exponent_floats_fall_back(self):
+        # "Zoë" must be \u-escaped and 1e20 spelled 1e+20, as the stdlib encoder does
+        rows = db.session.execute(mechanics_compiled.select().order_by(Mechanic.id)).all()
+        response = json_response(mechanics_compiled.dump(rows))
+
+        self.assertIn(b"Zo\\u00eb", response.get_data())
+        self.assertIn(b"1e+20", response.get_data())
+
+    def test_delete_character_falls_back(self):
+        payload = {"notes": "a\x7fb"}
+        self.assert_same_bytes(jsonify(payload), json_response(payload))
+
+    def test_debug_mode_keeps_indentation(self):
+        self.app.debug = True
+        expected = jsonify({"a": [1, 2]})
+        self.assert_same_bytes(expected, json_response({"a": [1, 2]}))
+
+    def test_view_selects_only_requested_columns(self):
+        view = tickets_compiled.view(fields=["VIN", "mechanic_ids"])
+        self.assertEqual({column.key for column in view.select().selected_columns}, {"id", "VIN"})
+        self.assertIs(tickets_compiled.view(fields=["VIN", "mechanic_ids"]), view)
+
+        rows = db.session.execute(view.select().order_by(ServiceTicket.id)).all()
+        self.assertEqual(
+            [item["mechanic_ids"] for item in view.dump(rows)],
+            [[self.tickets[0].mechanics[0].id], sorted(m.id for m in self.tickets[1].mechanics), []],
+        )
+
+        with self.assertRaises(ValueError):
+            tickets_compiled.view(fields=["salary"])
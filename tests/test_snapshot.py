@@ -0,0 +1,175 @@
+import unittest
+from datetime import date
+
+from sqlalchemy import event, insert, select, update
+from werkzeug.datastructures import MultiDict
+
+from application import create_app, db
+from application.blueprints.inventory.routes import parts_listing
+from application.models.customer import Customer
+from application.models.inventory import Inventory
+from application.models.mechanic import Mechanic
+from application.models.service_ticket import ServiceTicket
+from application.models.snapshots import mechanics_snapshot, parts_snapshot
+from application.utils.conditional import aggregate_version, table_versions
+from config import TestingConfig
+
+
+class TestSnapshots(unittest.TestCase):
+    """
+    In-process snapshots of mechanics and inventory: lookups from memory,
+    reloads after committed writes (or SNAPSHOT_MAX_AGE), list pages and ETags.
+    """
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        db.drop_all()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.amy = Mechanic(name="Amy", email="amy@garage.com", salary=50000)
+        self.bob = Mechanic(name="Bob", email="bob@garage.com", salary=52000)
+        customer = Customer(name="John Doe", email="john@example.com", password_hash="x")
+        db.session.add_all([self.amy, self.bob, customer, Inventory(name="Brake Pads", price=79.99)])
+        db.session.flush()
+        self.ticket = ServiceTicket(VIN="VIN1", service_date=date(2026, 1, 2),
+                                    service_desc="Brakes", customer_id=customer.id)
+        db.session.add(self.ticket)
+        db.session.commit()
+        self.amy_id, self.bob_id = self.amy.id, self.bob.id
+
+        self.statements = []
+        event.listen(db.engine, "before_cursor_execute", self._log)
+
+    def tearDown(self):
+        event.remove(db.engine, "before_cursor_execute", self._log)
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.ctx.pop()
+
+    def _log(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def queries_on(self, table):
+        return [s for s in self.statements if f"FROM {table}" in s]
+
+    def test_lookups_are_served_from_memory(self):
+        amy = mechanics_snapshot.get(self.amy_id)
+        self.assertEqual((amy.name, amy.email), ("Amy", "amy@garage.com"))
+        self.assertIs(mechanics_snapshot.find("email", "bob@garage.com"), mechanics_snapshot.get(self.bob_id))
+        self.assertEqual(parts_snapshot.find("name", "Brake Pads").price, 79.99)
+        self.assertIsNone(mechanics_snapshot.get(999))
+        with self.assertRaises(AttributeError):
+            amy.name = "Changed"
+
+        self.statements.clear()
+        for _ in range(3):
+            mechanics_snapshot.get(self.amy_id)
+            response = self.client.put(f"/service-tickets/{self.ticket.id}/assign-mechanic/999")
+            self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.queries_on("mechanics"), [])
+
+    def test_get_many_uses_one_lookup(self):
+        amy = mechanics_snapshot.get(self.amy_id)
+        self.assertEqual(mechanics_snapshot.get_many([self.amy_id, 999]), {self.amy_id: amy})
+
+        # tables over SNAPSHOT_MAX_ROWS fall back to a single IN query
+        self.app.config["SNAPSHOT_MAX_ROWS"] = 1
+        mechanics_snapshot.bump()
+        mechanics_snapshot.records()
+        self.statements.clear()
+        found = mechanics_snapshot.get_many([self.amy_id, self.bob_id, 999])
+        self.assertEqual({mechanic_id: m.name for mechanic_id, m in found.items()},
+                         {self.amy_id: "Amy", self.bob_id: "Bob"})
+        self.assertEqual(len(self.queries_on("mechanics")), 1)
+
+        # the edit route resolves all of its ids with one lookup
+        self.statements.clear()
+        response = self.client.put(f"/service-tickets/{self.ticket.id}/edit",
+                                   json={"add_ids": [self.amy_id, self.bob_id], "remove_ids": []})
+        self.assertEqual(response.status_code, 200)
+        lookups = [s for s in self.queries_on("mechanics") if s.startswith("SELECT mechanics.id")]
+        self.assertEqual(len(lookups), 1)
+
+    def test_committed_writes_reload_the_snapshot(self):
+        mechanics_snapshot.get(self.amy_id)
+
+        self.amy.name = "Amy Pond"
+        db.session.commit()
+        self.assertEqual(mechanics_snapshot.get(self.amy_id).name, "Amy Pond")
+
+        # Core DML through the session (e.g. the inventory importer) counts too
+        db.session.execute(insert(Inventory.__table__), [{"name": "Oil Filter", "price": 12.99}])
+        db.session.commit()
+        self.assertIsNotNone(parts_snapshot.find("name", "Oil Filter"))
+
+        # rolled back writes do not
+        db.session.execute(update(Mechanic).where(Mechanic.id == self.bob_id).values(name="Robert"))
+        db.session.rollback()
+        self.statements.clear()
+        self.assertEqual(mechanics_snapshot.get(self.bob_id).name, "Bob")
+        self.assertEqual(self.queries_on("mechanics"), [])
+
+    def test_writes_outside_the_app_show_after_max_age(self):
+        mechanics_snapshot.get(self.amy_id)
+        with db.engine.begin() as connection:
+            connection.execute(Mechanic.__table__.delete().where(Mechanic.__table__.c.id == self.bob_id))
+
+        self.assertIsNotNone(mechanics_snapshot.get(self.bob_id))
+        self.app.config["SNAPSHOT_MAX_AGE"] = 0
+        self.assertIsNone(mechanics_snapshot.get(self.bob_id))
+
+    def test_list_pages_match_the_database_path(self):
+        db.session.add_all([Mechanic(name=name, email=f"{name.lower()}2@garage.com", salary=1)
+                            for name in ("Amy", "Cal", "Bea")])
+        db.session.commit()
+        urls = ["/mechanics/?sort=-name&limit=2&total=1", "/mechanics/?email=amy", "/inventory/?name=Brake"]
+        mechanics_snapshot.records(), parts_snapshot.records()
+
+        self.statements.clear()
+        from_memory = [self.client.get(url) for url in urls]
+        self.assertEqual(self.queries_on("mechanics") + self.queries_on("inventory"), [])
+
+        cursor = from_memory[0].get_json()["next_cursor"]
+        second = self.client.get(f"/mechanics/?sort=-name&limit=2&total=1&cursor={cursor}").get_json()
+        self.assertEqual([m["name"] for m in from_memory[0].get_json()["mechanics"]], ["Cal", "Bob"])
+        self.assertEqual([m["name"] for m in second["mechanics"]], ["Bea", "Amy"])
+        self.assertEqual(second["total_count"], 5)
+
+        # tables over SNAPSHOT_MAX_ROWS are paged in SQL, with the same results and ETags
+        self.app.config["SNAPSHOT_MAX_ROWS"] = 1
+        self.app.config["SNAPSHOT_MAX_AGE"] = 0
+        for url, cached in zip(urls, from_memory):
+            response = self.client.get(url)
+            self.assertEqual(response.get_json(), cached.get_json())
+            self.assertEqual(response.headers["ETag"], cached.headers["ETag"])
+
+        self.assertEqual(mechanics_snapshot.fingerprint(), None)
+        self.app.config["SNAPSHOT_MAX_ROWS"] = 100
+        self.assertEqual(mechanics_snapshot.fingerprint(), table_versions(aggregate_version(Mechanic)))
+
+    def test_text_matching_is_the_same_on_both_paths(self):
+        for name in ("oil pan", "Oil Filter", "OIL cap", "air hose", "Air filter", "Ölwanne"):
+            db.session.add(Inventory(name=name, price=1))
+        db.session.commit()
+
+        def walk(page, args):
+            # every page's names, following next_cursor
+            pages, cursor = [], None
+            while True:
+                result = page(MultiDict({**args, **({"cursor": cursor} if cursor else {})}))
+                pages.append([row.name for row in result.rows])
+                cursor = result.next_cursor
+                if cursor is None:
+                    return pages
+
+        in_memory = lambda args: parts_listing.page_records(parts_snapshot.records(), args)
+        in_sql = lambda args: parts_listing.page(select(Inventory.id, Inventory.name), args, scalars=False)
+        for args in ({"name": "oil", "limit": "2"}, {"sort": "name", "limit": "2"}, {"sort": "-name", "limit": "3"}):
+            self.assertEqual(walk(in_memory, args), walk(in_sql, args), args)
+
+        self.assertEqual(sum(walk(in_memory, {"name": "oil"}), []), ["oil pan", "Oil Filter", "OIL cap"])
@@ -1,5 +1,10 @@
+import csv
+import io
+import json
 import unittest
+from sqlalchemy import event
 from application import create_app, db
+from application.utils.pagination import encode_cursor
 from config import TestingConfig
 
 class TestTickets(unittest.TestCase):
@@ -154,6 +159,9 @@ class TestTickets(unittest.TestCase):
             f"/service-tickets/{ticket_id}/assign-mechanic/{mechanic_id}"
         )
         self.assertEqual(assign_res.status_code, 200)
+        # same shape as GET: mechanics and parts expanded
+        self.assertEqual([m["id"] for m in assign_res.get_json()["mechanics"]], [mechanic_id])
+        self.assertEqual(assign_res.get_json()["parts"], [])
 
         get_res = self.client.get(f"/service-tickets/{ticket_id}")
         data = get_res.get_json()
@@ -219,6 +227,7 @@ class TestTickets(unittest.TestCase):
             f"/service-tickets/{ticket_id}/add-part/{part_id}"
         )
         self.assertEqual(add_response.status_code, 200)
+        self.assertEqual([p["id"] for p in add_response.get_json()["parts"]], [part_id])
 
         get_response = self.client.get(f"/service-tickets/{ticket_id}")
         self.assertEqual(get_response.status_code, 200)
@@ -249,8 +258,36 @@ class TestTickets(unittest.TestCase):
         response = self.client.get("/service-tickets/")
         self.assertEqual(response.status_code, 200)
         data = response.get_json()
-        self.assertIsInstance(data, list)
-        self.assertGreaterEqual(len(data), 1)
+        self.assertIsInstance(data["tickets"], list)
+        self.assertGreaterEqual(len(data["tickets"]), 1)
+        self.assertIsNone(data["next_cursor"])
+
+    def test_list_tickets_cursor_pagination(self):
+        customer = self.create_customer()
+        created_ids = [
+            self.create_ticket(customer["id"], service_desc=f"Ticket {i}")["id"]
+            for i in range(5)
+        ]
+
+        seen_ids = []
+        url = "/service-tickets/?limit=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            self.assertLessEqual(data["count"], 2)
+            seen_ids.extend(t["id"] for t in data["tickets"])
+            url = f"/service-tickets/?limit=2&cursor={data['next_cursor']}" if data["next_cursor"] else None
+
+        self.assertEqual(seen_ids, created_ids)
+
+    def test_list_tickets_rejects_bad_limit_and_cursor(self):
+        self.assertEqual(self.client.get("/service-tickets/?limit=0").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/?limit=1000").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/?cursor=not-a-cursor").status_code, 400)
+        for sort, value in [("VIN", {"a": 1}), ("service_date", "yesterday"), ("parts_total", "1")]:
+            cursor = encode_cursor({"id": 1, "sort": sort, "value": value})
+            self.assertEqual(self.client.get(f"/service-tickets/?sort={sort}&cursor={cursor}").status_code, 400)
 
     def test_delete_ticket(self):
         customer = self.create_customer()
@@ -262,3 +299,369 @@ class TestTickets(unittest.TestCase):
 
         get_response = self.client.get(f"/service-tickets/{ticket_id}")
         self.assertEqual(get_response.status_code, 404)
+
+    def test_ticket_write_only_invalidates_that_ticket(self):
+        customer = self.create_customer()
+        t1 = self.create_ticket(customer["id"], service_desc="First")
+        t2 = self.create_ticket(customer["id"], service_desc="Second")
+
+        # warm the cache
+        self.client.get(f"/service-tickets/{t1['id']}")
+        self.client.get(f"/service-tickets/{t2['id']}")
+
+        before = self.client.get("/metrics/cache").get_json()
+
+        self.client.put(f"/service-tickets/{t1['id']}", json={"service_desc": "First (updated)"})
+
+        # untouched ticket is still served from cache
+        self.client.get(f"/service-tickets/{t2['id']}")
+        after_t2 = self.client.get("/metrics/cache").get_json()
+        self.assertEqual(after_t2["hits"], before["hits"] + 1)
+        self.assertGreater(after_t2["invalidations"], before["invalidations"])
+
+        # updated ticket is rebuilt
+        response = self.client.get(f"/service-tickets/{t1['id']}")
+        self.assertEqual(response.get_json()["service_desc"], "First (updated)")
+        after_t1 = self.client.get("/metrics/cache").get_json()
+        self.assertEqual(after_t1["misses"], after_t2["misses"] + 1)
+
+    def test_mechanic_update_refreshes_cached_ticket(self):
+        customer = self.create_customer()
+        ticket = self.create_ticket(customer["id"])
+        mechanic = self.create_mechanic()
+        self.client.put(f"/service-tickets/{ticket['id']}/assign-mechanic/{mechanic['id']}")
+
+        # cache the ticket with the mechanic nested in it
+        self.client.get(f"/service-tickets/{ticket['id']}")
+
+        self.client.put(f"/mechanics/{mechanic['id']}", json={
+            "name": "Robert Smith",
+            "email": "bob@example.com",
+            "phone": "1234567890",
+            "salary": 50000
+        })
+
+        data = self.client.get(f"/service-tickets/{ticket['id']}").get_json()
+        self.assertEqual(data["mechanics"][0]["name"], "Robert Smith")
+
+    def test_mechanic_delete_refreshes_cached_ticket_list(self):
+        customer = self.create_customer()
+        ticket = self.create_ticket(customer["id"])
+        mechanic = self.create_mechanic()
+        self.client.put(f"/service-tickets/{ticket['id']}/assign-mechanic/{mechanic['id']}")
+
+        # cache a page that lists the mechanic by id only
+        listed = self.client.get("/service-tickets/?fields=mechanic_ids").get_json()["tickets"]
+        self.assertEqual(listed[0]["mechanic_ids"], [mechanic["id"]])
+
+        self.assertEqual(self.client.delete(f"/mechanics/{mechanic['id']}").status_code, 204)
+
+        listed = self.client.get("/service-tickets/?fields=mechanic_ids").get_json()["tickets"]
+        self.assertEqual(listed[0]["mechanic_ids"], [])
+
+    def test_edit_ticket_mechanics_validation_and_constant_round_trips(self):
+        customer = self.create_customer()
+        ticket_id = self.create_ticket(customer["id"])["id"]
+        mechanic_ids = [self.create_mechanic(email=f"m{i}@garage.com")["id"] for i in range(4)]
+
+        missing = self.client.put(f"/service-tickets/{ticket_id}/edit", json={"add_ids": [999999]})
+        self.assertEqual(missing.status_code, 404)
+
+        not_assigned = self.client.put(f"/service-tickets/{ticket_id}/edit", json={"remove_ids": [mechanic_ids[0]]})
+        self.assertEqual(not_assigned.status_code, 400)
+
+        statements = []
+        with self.app.app_context():
+            engine = db.engine
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            one = self.client.put(f"/service-tickets/{ticket_id}/edit", json={"add_ids": mechanic_ids[:1]})
+            one_count = len(statements)
+            statements.clear()
+            many = self.client.put(f"/service-tickets/{ticket_id}/edit", json={
+                "add_ids": mechanic_ids[1:] + mechanic_ids[1:],
+                "remove_ids": mechanic_ids[:1],
+            })
+            many_count = len(statements)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        self.assertEqual(one.status_code, 200)
+        self.assertEqual(many.status_code, 200)
+        self.assertEqual(many.get_json()["mechanic_ids"], sorted(mechanic_ids[1:]))
+        # the three-mechanic edit costs no more round trips than the one-mechanic edit
+        self.assertLessEqual(many_count, one_count + 1)
+
+    def test_assign_remove_and_add_part_are_idempotent(self):
+        customer = self.create_customer()
+        ticket_id = self.create_ticket(customer["id"])["id"]
+        mechanic_id = self.create_mechanic()["id"]
+        part_id = self.create_part()["id"]
+
+        first = self.client.put(f"/service-tickets/{ticket_id}/assign-mechanic/{mechanic_id}")
+        again = self.client.put(f"/service-tickets/{ticket_id}/assign-mechanic/{mechanic_id}")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.get_json()["message"], "Mechanic already assigned.")
+
+        self.client.put(f"/service-tickets/{ticket_id}/add-part/{part_id}")
+        again = self.client.put(f"/service-tickets/{ticket_id}/add-part/{part_id}")
+        self.assertEqual(again.get_json()["message"], "Part already added to ticket.")
+
+        data = self.client.get(f"/service-tickets/{ticket_id}").get_json()
+        self.assertEqual([m["id"] for m in data["mechanics"]], [mechanic_id])
+        self.assertEqual([p["id"] for p in data["parts"]], [part_id])
+
+        removed = self.client.put(f"/service-tickets/{ticket_id}/remove-mechanic/{mechanic_id}")
+        self.assertEqual(removed.status_code, 200)
+        self.assertEqual(removed.get_json()["remaining_mechanic_ids"], [])
+
+        removed_again = self.client.put(f"/service-tickets/{ticket_id}/remove-mechanic/{mechanic_id}")
+        self.assertEqual(removed_again.status_code, 400)
+
+    def test_list_tickets_date_window(self):
+        customer = self.create_customer()
+        self.create_ticket(customer["id"], service_date="2026-01-05")
+        feb = self.create_ticket(customer["id"], service_date="2026-02-05")
+        self.create_ticket(customer["id"], service_date="2026-03-05")
+
+        response = self.client.get("/service-tickets/?from=2026-02-01&to=2026-02-28")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t["id"] for t in response.get_json()["tickets"]], [feb["id"]])
+
+        response = self.client.get("/service-tickets/?from=2026-02-01")
+        self.assertEqual(len(response.get_json()["tickets"]), 2)
+
+        self.assertEqual(self.client.get("/service-tickets/?to=March").status_code, 400)
+
+    def test_create_ticket_rejects_invalid_service_date(self):
+        customer = self.create_customer()
+        response = self.client.post("/service-tickets/", json={
+            "VIN": "1HGBH41JXMN109186",
+            "service_date": "next tuesday",
+            "service_desc": "Oil change",
+            "customer_id": customer["id"],
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_tickets_ndjson(self):
+        customer = self.create_customer()
+        first = self.create_ticket(customer["id"], service_date="2026-01-05")
+        second = self.create_ticket(customer["id"], service_date="2026-02-05", service_desc="Brakes")
+        mechanic = self.create_mechanic()
+        part = self.create_part()
+        self.client.put(f"/service-tickets/{second['id']}/assign-mechanic/{mechanic['id']}")
+        self.client.put(f"/service-tickets/{second['id']}/add-part/{part['id']}")
+
+        response = self.client.get("/service-tickets/export")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([line["id"] for line in lines], [first["id"], second["id"]])
+        self.assertEqual(lines[1]["service_date"], "2026-02-05")
+        self.assertNotIn("mechanic_ids", lines[0])
+
+        response = self.client.get(f"/service-tickets/export?include=mechanic_ids,part_ids&since_id={first['id']}")
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["mechanic_ids"], [mechanic["id"]])
+        self.assertEqual(lines[0]["part_ids"], [part["id"]])
+
+        response = self.client.get("/service-tickets/export?from=2026-02-01&to=2026-02-28")
+        self.assertEqual(len(response.get_data(as_text=True).splitlines()), 1)
+
+    def test_export_tickets_csv(self):
+        customer = self.create_customer()
+        ticket = self.create_ticket(customer["id"], service_desc="Oil, filter")
+        mechanic = self.create_mechanic()
+        other = self.create_mechanic(email="amy@example.com")
+        self.client.put(f"/service-tickets/{ticket['id']}/assign-mechanic/{mechanic['id']}")
+        self.client.put(f"/service-tickets/{ticket['id']}/assign-mechanic/{other['id']}")
+
+        response = self.client.get("/service-tickets/export?format=csv&include=mechanic_ids")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/csv")
+        self.assertIn("attachment", response.headers["Content-Disposition"])
+
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual(rows[0], ["id", "VIN", "service_date", "service_desc", "customer_id", "mechanic_ids"])
+        self.assertEqual(rows[1][3], "Oil, filter")
+        self.assertEqual(rows[1][5], f"{mechanic['id']} {other['id']}")
+
+    def test_export_tickets_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get("/service-tickets/export?format=xml").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/export?include=notes").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/export?since_id=-1").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/export?since_id=%C2%B2").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/export?from=yesterday").status_code, 400)
+
+    def test_list_tickets_sparse_fields_and_expand(self):
+        customer = self.create_customer()
+        ticket = self.create_ticket(customer["id"])
+        mechanic = self.create_mechanic()
+        part = self.create_part()
+        self.client.put(f"/service-tickets/{ticket['id']}/assign-mechanic/{mechanic['id']}")
+        self.client.put(f"/service-tickets/{ticket['id']}/add-part/{part['id']}")
+
+        # default: id lists instead of nested objects
+        item = self.client.get("/service-tickets/").get_json()["tickets"][0]
+        self.assertEqual(item["mechanic_ids"], [mechanic["id"]])
+        self.assertEqual(item["part_ids"], [part["id"]])
+        self.assertNotIn("mechanics", item)
+
+        item = self.client.get("/service-tickets/?fields=VIN,part_ids").get_json()["tickets"][0]
+        self.assertEqual(item, {"id": ticket["id"], "VIN": ticket["VIN"], "part_ids": [part["id"]]})
+
+        item = self.client.get("/service-tickets/?expand=mechanics").get_json()["tickets"][0]
+        self.assertEqual(item["mechanics"][0]["name"], "Bob Smith")
+        self.assertNotIn("mechanic_ids", item)
+        self.assertEqual(item["part_ids"], [part["id"]])
+
+        self.assertEqual(self.client.get("/service-tickets/?fields=VIN,salary").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/?expand=customer").status_code, 400)
+
+    def test_get_ticket_expands_by_default_and_accepts_fields(self):
+        customer = self.create_customer()
+        ticket = self.create_ticket(customer["id"])
+        mechanic = self.create_mechanic()
+        self.client.put(f"/service-tickets/{ticket['id']}/assign-mechanic/{mechanic['id']}")
+
+        data = self.client.get(f"/service-tickets/{ticket['id']}").get_json()
+        self.assertEqual(data["mechanics"][0]["id"], mechanic["id"])
+        self.assertEqual(data["parts"], [])
+
+        data = self.client.get(f"/service-tickets/{ticket['id']}?fields=service_desc,mechanic_ids&expand=").get_json()
+        self.assertEqual(data, {"id": ticket["id"], "service_desc": "Oil change", "mechanic_ids": [mechanic["id"]]})
+
+    def test_bulk_create_tickets(self):
+        customer = self.create_customer()
+        tickets = [
+            {"VIN": f"VIN-{i}", "service_date": "2026-01-01", "service_desc": "Feed import", "customer_id": customer["id"]}
+            for i in range(3)
+        ]
+
+        response = self.client.post("/service-tickets/bulk", json={"tickets": tickets})
+        self.assertEqual(response.status_code, 201)
+        data = response.get_json()
+        self.assertEqual(data["errors"], {})
+        self.assertEqual([item["index"] for item in data["created"]], [0, 1, 2])
+
+        listed = self.client.get("/service-tickets/?fields=VIN").get_json()["tickets"]
+        self.assertEqual([t["VIN"] for t in listed], ["VIN-0", "VIN-1", "VIN-2"])
+        self.assertEqual([t["id"] for t in listed], [item["id"] for item in data["created"]])
+
+    def test_bulk_create_tickets_reports_per_item_errors(self):
+        customer = self.create_customer()
+        good = {"VIN": "VIN-OK", "service_date": "2026-01-01", "service_desc": "Brakes", "customer_id": customer["id"]}
+
+        response = self.client.post("/service-tickets/bulk", json={"tickets": [
+            good,
+            {**good, "service_date": "someday"},
+            {**good, "customer_id": 9999},
+            "not a ticket",
+        ]})
+        self.assertEqual(response.status_code, 207)
+        data = response.get_json()
+        self.assertEqual(len(data["created"]), 1)
+        self.assertEqual(sorted(data["errors"]), ["1", "2", "3"])
+        self.assertEqual(data["errors"]["2"], {"customer_id": ["Customer not found."]})
+
+        response = self.client.post("/service-tickets/bulk", json={"tickets": [{**good, "customer_id": 9999}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["created"], [])
+
+        self.assertEqual(self.client.post("/service-tickets/bulk", json={"tickets": []}).status_code, 400)
+        self.app.config["BULK_TICKETS_MAX"] = 2
+        self.assertEqual(self.client.post("/service-tickets/bulk", json={"tickets": [good] * 3}).status_code, 400)
+
+    def test_bulk_create_rejects_client_ids_per_item(self):
+        customer = self.create_customer()
+        existing = self.create_ticket(customer["id"])
+        good = {"VIN": "VIN-OK", "service_date": "2026-01-01", "service_desc": "Brakes", "customer_id": customer["id"]}
+
+        # duplicate and already-taken ids used to fail the whole batch at the INSERT
+        response = self.client.post("/service-tickets/bulk", json={"tickets": [
+            {**good, "id": 500},
+            {**good, "id": 500},
+            {**good, "id": existing["id"]},
+            good,
+        ]})
+        self.assertEqual(response.status_code, 207)
+        data = response.get_json()
+        self.assertEqual([item["index"] for item in data["created"]], [3])
+        self.assertEqual(sorted(data["errors"]), ["0", "1", "2"])
+        self.assertEqual(data["errors"]["0"], {"id": ["Unknown field."]})
+
+    def test_line_items_keep_parts_total_current(self):
+        customer = self.create_customer()
+        first = self.create_ticket(customer["id"], VIN="VIN-A")
+        second = self.create_ticket(customer["id"], VIN="VIN-B")
+        pads = self.create_part(name="Brake Pad")
+        oil = self.create_part(name="Oil")
+
+        response = self.client.put(f"/service-tickets/{first['id']}/add-part/{pads['id']}", json={"quantity": 2})
+        self.assertEqual(response.get_json()["parts_total"], 25.98)
+        self.client.put(f"/service-tickets/{first['id']}/add-part/{oil['id']}", json={"unit_price": 5})
+        self.assertEqual(
+            self.client.put(f"/service-tickets/{first['id']}/add-part/{oil['id']}", json={"quantity": 0}).status_code,
+            400,
+        )
+
+        # line prices are snapshots: a catalogue change leaves the ticket alone
+        self.client.put(f"/inventory/{pads['id']}", json={"name": "Brake Pad", "price": 20})
+        invoice = self.client.get(f"/service-tickets/{first['id']}/invoice").get_json()
+        self.assertEqual(invoice["parts_total"], 30.98)
+        self.assertEqual(
+            [(line["name"], line["quantity"], line["unit_price"], line["line_total"]) for line in invoice["lines"]],
+            [("Brake Pad", 2, 12.99, 25.98), ("Oil", 1, 5.0, 5.0)],
+        )
+
+        response = self.client.put(f"/service-tickets/{first['id']}/parts/{oil['id']}", json={"quantity": 3})
+        self.assertEqual(response.get_json()["parts_total"], 40.98)
+        response = self.client.put(f"/service-tickets/{second['id']}/parts/{oil['id']}", json={"quantity": 3})
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.put(f"/service-tickets/{first['id']}/remove-part/{oil['id']}")
+        self.assertEqual(response.get_json()["parts_total"], 25.98)
+        self.assertEqual(self.client.put(f"/service-tickets/{first['id']}/remove-part/{oil['id']}").status_code, 400)
+
+        self.client.put(f"/service-tickets/{second['id']}/add-part/{pads['id']}")  # at today's price
+        listed = self.client.get("/service-tickets/?sort=-parts_total&fields=parts_total").get_json()["tickets"]
+        self.assertEqual([t["parts_total"] for t in listed], [25.98, 20.0])
+
+        # deleting the part drops its lines and recomputes both totals
+        self.assertEqual(self.client.delete(f"/inventory/{pads['id']}").status_code, 200)
+        listed = self.client.get("/service-tickets/?fields=parts_total").get_json()["tickets"]
+        self.assertEqual([t["parts_total"] for t in listed], [0.0, 0.0])
+        self.assertEqual(self.client.get(f"/service-tickets/{first['id']}/invoice").get_json()["lines"], [])
+
+    def test_revenue_report(self):
+        customer = self.create_customer()
+        other = self.create_customer(email="amy@example.com")
+        part = self.create_part(name="Brake Pad")
+        tickets = [
+            self.create_ticket(customer["id"], service_date="2026-01-05"),
+            self.create_ticket(customer["id"], service_date="2026-01-20"),
+            self.create_ticket(other["id"], service_date="2026-02-03"),
+        ]
+        for ticket, quantity in zip(tickets, (1, 2, 4)):
+            self.client.put(f"/service-tickets/{ticket['id']}/add-part/{part['id']}",
+                            json={"quantity": quantity, "unit_price": 10})
+
+        data = self.client.get("/service-tickets/revenue").get_json()
+        self.assertEqual(data, {"tickets": 3, "revenue": 70.0})
+
+        data = self.client.get("/service-tickets/revenue?group_by=month").get_json()
+        self.assertEqual(data["groups"], [
+            {"month": "2026-01", "tickets": 2, "revenue": 30.0},
+            {"month": "2026-02", "tickets": 1, "revenue": 40.0},
+        ])
+
+        data = self.client.get("/service-tickets/revenue?group_by=customer&from=2026-01-10").get_json()
+        self.assertEqual((data["tickets"], data["revenue"]), (2, 60.0))
+        self.assertEqual([(g["customer_id"], g["revenue"]) for g in data["groups"]],
+                         [(other["id"], 40.0), (customer["id"], 20.0)])
+
+        self.assertEqual(self.client.get("/service-tickets/revenue?group_by=week").status_code, 400)
+        self.assertEqual(self.client.get("/service-tickets/revenue?from=nope").status_code, 400)